@@ -0,0 +1,121 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QFormLayout,
+    QDateEdit, QDialogButtonBox, QLabel,
+    QLineEdit, QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt6.QtCore import QDate
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BatchReturnForm(QDialog):
+    """
+    Клас, що відповідає за форму повернення кількох предметів з оренди одночасно.
+
+    Дата повернення та примітки спільні для всіх предметів, а цілісність вказується
+    для кожного предмета окремо.
+    """
+    def __init__(self, rentals):
+        """
+        Метод для ініціалізації форми групового повернення.
+
+        :param rentals: Записи оренди: словники з ключами history_id, inventory_number,
+            item_name, user_name та integrity_percentage (поточна цілісність предмета).
+        :type rentals: list[dict]
+        """
+        super().__init__()
+        self.rentals = rentals
+
+        logger.info(f"Ініціалізація форми групового повернення для {len(rentals)} оренд")
+
+        self.setWindowTitle("Повернення предметів")
+        self.setMinimumWidth(550)
+
+        self.init_ui()
+
+    def init_ui(self):
+        """
+        Метод для ініціалізації UI форми.
+        Створює таблицю предметів з полями цілісності, поле дати повернення та приміток.
+        """
+        logger.debug("Створення UI форми групового повернення")
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        layout.addWidget(QLabel(f"Предметів для повернення: {len(self.rentals)}"))
+
+        # Таблиця предметів
+        self.items_table = QTableWidget(len(self.rentals), 4)
+        self.items_table.setHorizontalHeaderLabels(["Номер предмету", "Предмет", "Орендар", "Цілісність"])
+        self.items_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.items_table.verticalHeader().setVisible(False)
+
+        self.integrity_spins = []
+        for row, rental in enumerate(self.rentals):
+            for col, key in enumerate(("inventory_number", "item_name", "user_name")):
+                self.items_table.setItem(row, col, QTableWidgetItem(str(rental[key])))
+
+            spin = QSpinBox()
+            spin.setRange(0, 100)
+            spin.setValue(int(rental["integrity_percentage"]))
+            spin.setSuffix("%")
+            self.items_table.setCellWidget(row, 3, spin)
+            self.integrity_spins.append(spin)
+
+        layout.addWidget(self.items_table)
+        logger.debug(f"Таблицю з {len(self.rentals)} предметів створено")
+
+        # Спільні дані повернення
+        form_layout = QFormLayout()
+
+        self.return_date_edit = QDateEdit()
+        self.return_date_edit.setDisplayFormat("dd.MM.yyyy")
+        self.return_date_edit.setDate(QDate.currentDate())
+        self.return_date_edit.setCalendarPopup(True)
+        form_layout.addRow("Дата повернення:", self.return_date_edit)
+
+        self.notes_edit = QLineEdit()
+        form_layout.addRow("Примітки:", self.notes_edit)
+
+        layout.addLayout(form_layout)
+
+        # Кнопки
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        logger.debug("Кнопки OK та Cancel створено")
+
+    def get_data(self):
+        """
+        Метод для отримання даних у вигляді словника.
+
+        :return: Словник з ключами returns ({ID запису оренди: цілісність}), returned_date та notes.
+        :rtype: dict
+        """
+        data = {
+            "returns": {
+                int(rental["history_id"]): spin.value()
+                for rental, spin in zip(self.rentals, self.integrity_spins)
+            },
+            "returned_date": self.return_date_edit.date().toPyDate(),
+            "notes": self.notes_edit.text().strip()
+        }
+
+        logger.debug(f"Зібрані дані групового повернення: дата={data['returned_date']}, "
+                     f"цілісність={data['returns']}, "
+                     f"примітки='{data['notes'] if data['notes'] else 'порожньо'}'")
+
+        return data
+
+    def accept(self):
+        """Перевизначення методу accept для логування"""
+        logger.info(f"Форму групового повернення {len(self.rentals)} оренд прийнято")
+        super().accept()
+
+    def reject(self):
+        """Перевизначення методу reject для логування"""
+        logger.info("Форму групового повернення скасовано")
+        super().reject()
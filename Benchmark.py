@@ -0,0 +1,685 @@
+"""
+Вимірювання продуктивності методів DBConnection та завантажувачів інтерфейсу.
+
+Заповнює окрему базу даних синтетичними даними (модуль SyntheticData.py), після чого
+вимірює кожен метод DBConnection, а також завантаження та фільтрацію вкладок
+InventoryApp і графіки StatsWindow у Qt без вікон (offscreen). Для кожного вимірювання
+записуються p50/p95 часу виконання та пік пам'яті Python. Результати зберігаються у JSON,
+тож запуски для різних комітів можна порівняти параметром --compare.
+
+Приклад використання:
+    python Benchmark.py --items 100000 --history 5000000 --repeat 5
+    python Benchmark.py --items 1000 --history 20000 --compare benchmark_results/попередній.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+import logging
+from datetime import date, datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Тексти пошуку, що використовуються для вимірювання фільтрації
+SEARCH_TEXT = "намет"
+USER_SEARCH_TEXT = "коваленко"
+
+# Кількість рядків для методів, що оновлюють окремі рядки таблиць
+ROW_BATCH_SIZE = 100
+
+# Кількість предметів для групової оренди та повернення
+RENTAL_BATCH_SIZE = 50
+
+# Кількість рядків масового імпорту
+IMPORT_ROWS = 1000
+
+# Максимальний час очікування фонового завантаження інтерфейсу (у секундах)
+WAIT_TIMEOUT_S = 600
+
+RESULTS_DIR = "benchmark_results"
+
+
+class BenchmarkCase:
+    """
+    Клас, що відповідає за одне вимірювання.
+
+    Attributes:
+        name: Назва вимірювання
+        run: Функція, час виконання якої вимірюється
+        setup: Функція, що готує дані перед кожним запуском (не входить у вимірювання)
+        teardown: Функція, що прибирає зміни після кожного запуску (не входить у вимірювання)
+        repeat: Кількість запусків (None — значення з командного рядка)
+    """
+    def __init__(self, name, run, setup=None, teardown=None, repeat=None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.teardown = teardown
+        self.repeat = repeat
+
+
+def percentile(values, q):
+    """
+    Функція для обчислення перцентиля з лінійною інтерполяцією.
+
+    :param values: Виміряні значення.
+    :type values: list[float]
+
+    :param q: Перцентиль від 0 до 100.
+    :type q: float
+
+    :rtype: float
+    """
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def measure(case, repeat, warmup):
+    """
+    Функція для вимірювання одного випадку.
+
+    Спершу виконуються розігрівальні запуски, далі repeat запусків без трасування пам'яті
+    для вимірювання часу, і ще один запуск з tracemalloc для піку пам'яті.
+
+    :param case: Вимірювання.
+    :type case: BenchmarkCase
+
+    :param repeat: Кількість запусків для вимірювання часу.
+    :type repeat: int
+
+    :param warmup: Кількість розігрівальних запусків.
+    :type warmup: int
+
+    :return: Словник з p50_ms, p95_ms, min_ms, max_ms, runs та peak_memory_kb.
+    :rtype: dict
+    """
+    def run_once(trace=False):
+        if case.setup is not None:
+            case.setup()
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            case.run()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            peak = tracemalloc.get_traced_memory()[1] if trace else None
+        finally:
+            if trace:
+                tracemalloc.stop()
+            if case.teardown is not None:
+                case.teardown()
+        return elapsed_ms, peak
+
+    repeat = case.repeat or repeat
+    for _ in range(warmup):
+        run_once()
+    timings = [run_once()[0] for _ in range(repeat)]
+    peak = run_once(trace=True)[1]
+
+    return {
+        "runs": repeat,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def max_rss_kb():
+    """
+    Функція для отримання максимального обсягу пам'яті процесу.
+
+    :return: Пік резидентної пам'яті в КБ або None, якщо платформа цього не підтримує.
+    :rtype: int, optional
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # На macOS значення у байтах, на Linux — у кілобайтах
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def git_commit():
+    """
+    Функція для отримання поточного коміту репозиторію.
+
+    :return: Скорочений хеш коміту або None поза репозиторієм git.
+    :rtype: str, optional
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def sample_ids(db):
+    """
+    Функція для вибору ID записів, з якими працюють вимірювання.
+
+    :param db: Підключення до бази даних.
+    :type db: DBConnection
+
+    :return: Словник з ключами item_ids, free_item_ids (доступні предмети без відкритої оренди),
+        open_history_ids, history_ids, last_item_id та category_id.
+    :rtype: dict
+    """
+    free = db.execute_query("""
+        SELECT i.item_id
+        FROM inventory i
+        JOIN availability_statues s ON s.status_id = i.status_id AND s.status_name = %s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM usage_history uh
+            WHERE uh.item_id = i.item_id AND uh.is_rental = true AND uh.returned_date IS NULL
+        )
+        ORDER BY i.item_id
+        LIMIT %s
+    """, (db.STATUS_AVAILABLE, RENTAL_BATCH_SIZE + 1), fetch=True)
+    open_rentals = db.execute_query(
+        "SELECT history_id FROM usage_history WHERE is_rental = true AND returned_date IS NULL LIMIT %s",
+        (ROW_BATCH_SIZE,), fetch=True)
+    history = db.execute_query(
+        "SELECT history_id FROM usage_history ORDER BY history_id DESC LIMIT %s", (ROW_BATCH_SIZE,), fetch=True)
+    items = db.execute_query("SELECT item_id FROM inventory ORDER BY item_id LIMIT %s", (ROW_BATCH_SIZE,), fetch=True)
+    last_item_id = db.execute_query("SELECT max(item_id) FROM inventory", fetch=True)[0][0] or 0
+    category_id = db.execute_query("SELECT min(category_id) FROM categories", fetch=True)[0][0]
+
+    return {
+        "item_ids": [row[0] for row in items],
+        "free_item_ids": [row[0] for row in free],
+        "open_history_ids": [row[0] for row in open_rentals],
+        "history_ids": [row[0] for row in history],
+        "last_item_id": last_item_id,
+        "category_id": category_id,
+    }
+
+
+def db_cases(db, ids):
+    """
+    Функція для створення вимірювань усіх методів DBConnection.
+
+    Методи, що змінюють дані, прибирають свої зміни в teardown, тому обсяги бази
+    після вимірювань не змінюються.
+
+    :param db: Підключення до бази даних (без кешу результатів).
+    :type db: DBConnection
+
+    :param ids: Вибрані ID записів (результат sample_ids).
+    :type ids: dict
+
+    :rtype: list[BenchmarkCase]
+    """
+    today = date.today()
+    free_item_id, batch_item_ids = ids["free_item_ids"][0], ids["free_item_ids"][1:]
+    item_data = {
+        "item_name": "Бенчмарк предмет",
+        "category_id": ids["category_id"],
+        "status_id": db.execute_query(
+            "SELECT status_id FROM availability_statues WHERE status_name = %s", (db.STATUS_AVAILABLE,), fetch=True
+        )[0][0],
+        "integrity_percentage": 100,
+        "purchase_date": today,
+        "item_notes": "",
+    }
+    import_rows = [
+        {
+            "line": line, "item_name": f"Імпорт {line}", "category_name": "Бенчмарк",
+            "status_name": db.STATUS_AVAILABLE, "integrity_percentage": 100,
+            "purchase_date": today, "item_notes": "",
+        }
+        for line in range(2, IMPORT_ROWS + 2)
+    ]
+    state = {}
+
+    def delete_history(history_ids, item_ids):
+        # Видалення оренд, створених вимірюванням, та повернення предметам статусу "Доступний"
+        db.execute_query("DELETE FROM usage_history WHERE history_id = ANY(%s)", (list(history_ids),))
+        db.execute_query(
+            "UPDATE inventory SET status_id = %s WHERE item_id = ANY(%s)",
+            (item_data["status_id"], list(item_ids))
+        )
+
+    def delete_items(item_ids):
+        db.execute_query("DELETE FROM inventory WHERE item_id = ANY(%s)", (list(item_ids),))
+
+    def rent_one():
+        state["history_id"] = db.rent_item(free_item_id, "Бенчмарк", today, today + timedelta(days=7), "")
+
+    def rent_batch():
+        state["rentals"] = db.rent_items(batch_item_ids, "Бенчмарк", today, today + timedelta(days=7), "")
+
+    def add_item():
+        state["item_id"] = db.add_inventory_item(item_data)
+
+    def import_items():
+        state["item_ids"] = db.bulk_import_inventory(import_rows)["item_ids"]
+
+    def copy_history():
+        with open(os.devnull, "w", encoding="utf-8") as file:
+            return db.copy_to_csv(history_query, history_params, file)
+
+    # Предмет, який оновлюється вимірюванням, після кожного запуску отримує початкові дані
+    updated_item_id = ids["item_ids"][0]
+    original_item = dict(zip(
+        ("item_name", "category_id", "status_id", "integrity_percentage", "purchase_date", "item_notes"),
+        db.execute_query("""
+            SELECT item_name, category_id, status_id, integrity_percentage, purchase_date, item_notes
+            FROM inventory WHERE item_id = %s
+        """, (updated_item_id,), fetch=True)[0]
+    ))
+
+    history_query, history_params = db.export_query("history")
+    deep_after_id = max(ids["last_item_id"] - 200, 0)
+
+    last_year = date.today() - timedelta(days=365)
+
+    return [
+        BenchmarkCase("DBConnection.get_categories", db.get_categories),
+        BenchmarkCase("DBConnection.get_statuses", db.get_statuses),
+        BenchmarkCase("DBConnection.get_inventory_details", db.get_inventory_details),
+        BenchmarkCase("DBConnection.get_inventory_page", db.get_inventory_page),
+        BenchmarkCase("DBConnection.get_inventory_page[пошук]", lambda: db.get_inventory_page(search_text=SEARCH_TEXT)),
+        BenchmarkCase("DBConnection.get_inventory_page[категорія]",
+                      lambda: db.get_inventory_page(category_id=ids["category_id"])),
+        BenchmarkCase("DBConnection.get_inventory_page[остання сторінка]",
+                      lambda: db.get_inventory_page(after_id=deep_after_id)),
+        BenchmarkCase("DBConnection.get_popular_items", db.get_popular_items),
+        BenchmarkCase("DBConnection.get_most_worn_items", db.get_most_worn_items),
+        BenchmarkCase("DBConnection.get_monthly_rental_stats", db.get_monthly_rental_stats),
+        BenchmarkCase("DBConnection.get_popular_items[рік]",
+                      lambda: db.get_popular_items(date_from=last_year, date_to=date.today())),
+        BenchmarkCase("DBConnection.get_rental_series[місяць]", db.get_rental_series),
+        BenchmarkCase("DBConnection.get_rental_series[рік, категорія]",
+                      lambda: db.get_rental_series(category_id=ids["category_id"], granularity="year")),
+        BenchmarkCase("DBConnection.get_rental_series[день, рік]",
+                      lambda: db.get_rental_series(last_year, date.today(), granularity="day")),
+        BenchmarkCase("DBConnection.refresh_rollups", db.refresh_rollups, repeat=1),
+        BenchmarkCase("DBConnection.get_rental_history", db.get_rental_history),
+        BenchmarkCase("DBConnection.get_usage_history", db.get_usage_history),
+        BenchmarkCase("DBConnection.stream_usage_history",
+                      lambda: sum(len(chunk) for chunk in db.stream_usage_history())),
+        BenchmarkCase("DBConnection.copy_to_csv", copy_history),
+        BenchmarkCase("DBConnection.get_query_columns", lambda: db.get_query_columns(history_query, history_params)),
+        BenchmarkCase("DBConnection.get_inventory_rows", lambda: db.get_inventory_rows(ids["item_ids"])),
+        BenchmarkCase("DBConnection.get_rental_rows", lambda: db.get_rental_rows(ids["open_history_ids"])),
+        BenchmarkCase("DBConnection.get_usage_history_rows", lambda: db.get_usage_history_rows(ids["history_ids"])),
+        BenchmarkCase("DBConnection.get_or_create_category", lambda: db.get_or_create_category("Намети")),
+        BenchmarkCase("DBConnection.add_inventory_item", add_item,
+                      teardown=lambda: delete_items([state["item_id"]])),
+        BenchmarkCase("DBConnection.update_inventory_item",
+                      lambda: db.update_inventory_item(updated_item_id, dict(item_data, item_name="Оновлений предмет")),
+                      teardown=lambda: db.update_inventory_item(updated_item_id, original_item)),
+        BenchmarkCase("DBConnection.delete_inventory_item", lambda: db.delete_inventory_item(state["item_id"]),
+                      setup=add_item),
+        BenchmarkCase("DBConnection.bulk_import_inventory", import_items,
+                      teardown=lambda: delete_items(state["item_ids"])),
+        BenchmarkCase("DBConnection.rent_item", rent_one,
+                      teardown=lambda: delete_history([state["history_id"]], [free_item_id])),
+        BenchmarkCase("DBConnection.return_item",
+                      lambda: db.return_item(state["history_id"], today, 100, ""),
+                      setup=rent_one, teardown=lambda: delete_history([state["history_id"]], [free_item_id])),
+        BenchmarkCase(f"DBConnection.rent_items[{len(batch_item_ids)}]", rent_batch,
+                      teardown=lambda: delete_history(state["rentals"].values(), batch_item_ids)),
+        BenchmarkCase(f"DBConnection.return_items[{len(batch_item_ids)}]",
+                      lambda: db.return_items({history_id: 100 for history_id in state["rentals"].values()}, today, ""),
+                      setup=rent_batch, teardown=lambda: delete_history(state["rentals"].values(), batch_item_ids)),
+    ]
+
+
+def wait_for(signal, start, accept=lambda *args: True, timeout_s=WAIT_TIMEOUT_S):
+    """
+    Функція для запуску дії та очікування сигналу в циклі подій Qt.
+
+    :param signal: Сигнал, що означає завершення дії.
+    :type signal: pyqtBoundSignal
+
+    :param start: Функція, що запускає дію.
+    :type start: callable
+
+    :param accept: Функція, що перевіряє аргументи сигналу (наприклад, ключ завантаження).
+    :type accept: callable
+
+    :param timeout_s: Максимальний час очікування.
+    :type timeout_s: float
+
+    :raise: TimeoutError, якщо сигнал не надійшов вчасно.
+    """
+    from PyQt6.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    done = []
+
+    def on_signal(*args):
+        if accept(*args):
+            done.append(True)
+            loop.quit()
+
+    timer = QTimer()
+    timer.setSingleShot(True)
+    timer.timeout.connect(loop.quit)
+    signal.connect(on_signal)
+    try:
+        timer.start(int(timeout_s * 1000))
+        start()
+        if not done:
+            loop.exec()
+    finally:
+        timer.stop()
+        signal.disconnect(on_signal)
+    if not done:
+        raise TimeoutError(f"Дію не завершено за {timeout_s} с")
+
+
+def wait_until(condition, timeout_s=WAIT_TIMEOUT_S):
+    """
+    Функція для обробки подій Qt, доки умова не стане істинною.
+
+    :param condition: Функція без аргументів, що повертає bool.
+    :type condition: callable
+
+    :raise: TimeoutError, якщо умова не виконалася вчасно.
+    """
+    from PyQt6.QtWidgets import QApplication
+
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Умову не виконано за {timeout_s} с")
+        QApplication.processEvents()
+        time.sleep(0.005)
+
+
+def loaded(executor, key):
+    """
+    Функція для створення дії, що очікує завершення фонового завантаження з ключем key.
+
+    :param executor: Виконавець запитів вікна.
+    :type executor: QueryExecutor
+
+    :param key: Ключ завантаження.
+    :type key: str
+
+    :return: Функція, що запускає завантаження та чекає на нього.
+    :rtype: callable
+    """
+    def run(start):
+        return lambda: wait_for(executor.idle, start, accept=lambda finished_key: finished_key == key)
+    return run
+
+
+def set_search_text(line_edit, text):
+    """
+    Функція для заповнення поля пошуку без запуску відкладеної фільтрації.
+    """
+    line_edit.blockSignals(True)
+    line_edit.setText(text)
+    line_edit.blockSignals(False)
+
+
+def ui_cases(app_window, stats_window):
+    """
+    Функція для створення вимірювань завантаження та фільтрації InventoryApp і StatsWindow.
+
+    Вимірюється повний шлях: запит у фоновому потоці та заповнення таблиці чи графіка
+    в потоці інтерфейсу.
+
+    :param app_window: Головне вікно з завантаженою першою сторінкою інвентарю.
+    :type app_window: InventoryApp
+
+    :param stats_window: Вікно статистики.
+    :type stats_window: StatsWindow
+
+    :rtype: list[BenchmarkCase]
+    """
+    from ChartRenderer import chart_cache
+
+    app_loaded = loaded(app_window.executor, "inventory")
+    history_loaded = loaded(app_window.executor, "history")
+    rentals_loaded = loaded(app_window.executor, "rentals")
+
+    def filtered(engine, filter_method):
+        return lambda: wait_for(engine.filtered, filter_method)
+
+    def search(line_edit, text, engine=None, filter_method=None):
+        def apply():
+            set_search_text(line_edit, text)
+            if engine is not None:
+                # Очищений пошук скидає звужений результат, тому кожен запуск шукає серед усіх рядків
+                wait_for(engine.filtered, filter_method)
+        return apply
+
+    return [
+        BenchmarkCase("InventoryApp.load_inventory_data", app_loaded(app_window.load_inventory_data)),
+        BenchmarkCase("InventoryApp.filter_inventory[пошук]", app_loaded(app_window.filter_inventory),
+                      setup=search(app_window.search_input, SEARCH_TEXT),
+                      teardown=search(app_window.search_input, "")),
+        BenchmarkCase("InventoryApp.next_inventory_page", app_loaded(app_window.next_inventory_page),
+                      teardown=app_loaded(app_window.filter_inventory)),
+        BenchmarkCase("InventoryApp.load_history_data", history_loaded(app_window.load_history_data)),
+        BenchmarkCase("InventoryApp.filter_history[пошук]",
+                      filtered(app_window.history_filter, app_window.filter_history),
+                      setup=search(app_window.history_search, USER_SEARCH_TEXT),
+                      teardown=search(app_window.history_search, "", app_window.history_filter,
+                                      app_window.filter_history)),
+        BenchmarkCase("InventoryApp.load_rental_data", rentals_loaded(app_window.load_rental_data)),
+        BenchmarkCase("InventoryApp.filter_rentals[пошук]",
+                      filtered(app_window.rental_filter, app_window.filter_rentals),
+                      setup=search(app_window.rental_search, USER_SEARCH_TEXT),
+                      teardown=search(app_window.rental_search, "", app_window.rental_filter,
+                                      app_window.filter_rentals)),
+        BenchmarkCase("StatsWindow.load_popularity_data",
+                      loaded(stats_window.executor, "popularity")(stats_window.load_popularity_data)),
+        BenchmarkCase("StatsWindow.load_wear_data",
+                      loaded(stats_window.executor, "wear")(stats_window.load_wear_data)),
+        BenchmarkCase("StatsWindow.load_rental_stats",
+                      loaded(stats_window.executor, "rental_stats")(stats_window.load_rental_stats)),
+        # Без кешу графік малюється заново; вимірювання вище показують зображення з кешу
+        BenchmarkCase("StatsWindow.load_popularity_data[без кешу]",
+                      loaded(stats_window.executor, "popularity")(stats_window.load_popularity_data),
+                      setup=chart_cache.clear),
+        BenchmarkCase("StatsWindow.load_wear_data[без кешу]",
+                      loaded(stats_window.executor, "wear")(stats_window.load_wear_data),
+                      setup=chart_cache.clear),
+        BenchmarkCase("StatsWindow.load_rental_stats[без кешу]",
+                      loaded(stats_window.executor, "rental_stats")(stats_window.load_rental_stats),
+                      setup=chart_cache.clear),
+    ]
+
+
+def run_cases(cases, results, repeat, warmup, only):
+    """
+    Функція для виконання вимірювань та друку результатів.
+
+    :param cases: Вимірювання.
+    :type cases: list[BenchmarkCase]
+
+    :param results: Словник результатів, що доповнюється.
+    :type results: dict
+
+    :param only: Регулярний вираз для вибору вимірювань за назвою (None — усі).
+    :type only: str, optional
+    """
+    for case in cases:
+        if only and not re.search(only, case.name):
+            continue
+        try:
+            result = measure(case, repeat, warmup)
+        except Exception as e:
+            logger.error(f"Помилка вимірювання {case.name}: {e}")
+            result = {"error": str(e)}
+        results[case.name] = result
+        print(format_result(case.name, result))
+
+
+def format_result(name, result):
+    """
+    Функція для форматування рядка результату вимірювання.
+
+    :rtype: str
+    """
+    if "error" in result:
+        return f"{name:<60} ПОМИЛКА: {result['error']}"
+    return (f"{name:<60} p50 {result['p50_ms']:>10.1f} мс   p95 {result['p95_ms']:>10.1f} мс   "
+            f"пам'ять {result['peak_memory_kb']:>10.0f} КБ")
+
+
+def compare(results, baseline_path):
+    """
+    Функція для друку порівняння з попереднім запуском.
+
+    :param results: Результати поточного запуску.
+    :type results: dict
+
+    :param baseline_path: Шлях до JSON попереднього запуску.
+    :type baseline_path: str
+    """
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = json.load(file)
+    print(f"\nПорівняння з {baseline_path} (коміт {baseline.get('commit')}):")
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if not previous or "error" in previous or "error" in result or not previous["p50_ms"]:
+            continue
+        ratio = result["p50_ms"] / previous["p50_ms"]
+        print(f"{name:<60} p50 {previous['p50_ms']:>10.1f} → {result['p50_ms']:>10.1f} мс  ({ratio:.2f}×)")
+
+
+def main(argv=None):
+    """
+    Функція для запуску вимірювань з командного рядка.
+
+    :param argv: Аргументи командного рядка.
+    :type argv: list[str], optional
+
+    :return: Код завершення: 0 — усі вимірювання виконано, 1 — були помилки.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description="Вимірювання продуктивності методів DBConnection та інтерфейсу")
+    parser.add_argument("--dbname", default="gradesystem_bench", help="База даних для вимірювань (буде перезаписана)")
+    parser.add_argument("--items", type=int, default=100000, help="Кількість предметів")
+    parser.add_argument("--history", type=int, default=5000000, help="Кількість записів історії оренд")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора синтетичних даних")
+    parser.add_argument("--repeat", type=int, default=5, help="Кількість запусків кожного вимірювання")
+    parser.add_argument("--warmup", type=int, default=1, help="Кількість розігрівальних запусків")
+    parser.add_argument("--only", help="Регулярний вираз для вибору вимірювань за назвою")
+    parser.add_argument("--no-ui", action="store_true", help="Не вимірювати InventoryApp та StatsWindow")
+    parser.add_argument("--output", help="Файл JSON для результатів (за замовчуванням — у каталозі benchmark_results)")
+    parser.add_argument("--compare", help="Файл JSON попереднього запуску для порівняння")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    import DBConnection as db_module
+    from Migrations import apply_migrations
+    from SyntheticData import ensure_database, seed
+
+    if args.dbname == db_module.DB_PARAMS["dbname"]:
+        print(f"ПОМИЛКА: база даних {args.dbname} використовується застосунком і не може бути перезаписана")
+        return 1
+
+    ensure_database(db_module.DB_PARAMS, args.dbname)
+    # Вікна застосунку створюють власні підключення, тому параметри змінюються для всього процесу
+    db_module.DB_PARAMS["dbname"] = args.dbname
+
+    db = db_module.DBConnection(min_connections=1, max_connections=2)
+    results = {}
+    started = datetime.now()
+    try:
+        apply_migrations(db)
+        seed_start = time.perf_counter()
+        seeded = seed(db, args.items, args.history, args.seed)
+        if seeded:
+            print(f"Базу заповнено за {time.perf_counter() - seed_start:.1f} с")
+
+        print(f"Вимірювання: {args.items} предметів, {args.history} записів історії, {args.repeat} запусків\n")
+        run_cases(db_cases(db, sample_ids(db)), results, args.repeat, args.warmup, args.only)
+    finally:
+        db.disconnect()
+
+    if not args.no_ui:
+        run_ui_benchmarks(results, args)
+
+    report = {
+        "commit": git_commit(),
+        "started_at": started.isoformat(timespec="seconds"),
+        "volumes": {"items": args.items, "history": args.history, "seed": args.seed},
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+        "python": sys.version.split()[0],
+        "max_rss_kb": max_rss_kb(),
+        "results": results,
+        # Статистика окремих запитів вимірювань методів DBConnection
+        "queries": db.stats.snapshot("total_ms", 50),
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{started:%Y%m%d-%H%M%S}-{report['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"\nРезультати збережено у {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    return 1 if any("error" in result for result in results.values()) else 0
+
+
+def run_ui_benchmarks(results, args):
+    """
+    Функція для вимірювання завантажувачів InventoryApp та StatsWindow у Qt без вікон.
+
+    Модальні повідомлення неможливо закрити без користувача, тому помилки, які вікна
+    показали б у QMessageBox, записуються в журнал.
+
+    :param results: Словник результатів, що доповнюється.
+    :type results: dict
+
+    :param args: Аргументи командного рядка.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+
+    def log_message(parent, title, text, *args, **kwargs):
+        logger.error(f"{title}: {text}")
+        return QMessageBox.StandardButton.Ok
+
+    QMessageBox.critical = QMessageBox.warning = QMessageBox.information = log_message
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from InventoryApp import InventoryApp
+    from StatsWindow import StatsWindow
+
+    start = time.perf_counter()
+    window = InventoryApp()
+    # Перша сторінка інвентарю завантажується після міграцій схеми
+    wait_until(lambda: "inventory" in window.loaded_tabs and not window.executor.is_busy("migrations")
+               and not window.executor.is_busy("inventory"))
+    results["InventoryApp.startup"] = {"runs": 1, "p50_ms": round((time.perf_counter() - start) * 1000, 3)}
+    print(f"{'InventoryApp.startup':<60} {results['InventoryApp.startup']['p50_ms']:>14.1f} мс")
+
+    stats_window = StatsWindow(window.db)
+    try:
+        run_cases(ui_cases(window, stats_window), results, args.repeat, args.warmup, args.only)
+    finally:
+        window.close()
+        stats_window.close()
+        window.db.disconnect()
+        app.processEvents()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+import json
+import logging
+import select
+import threading
+import time
+import traceback
+
+import psycopg2
+from PyQt6.QtCore import QObject, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+class ChangeBatch:
+    """
+    Клас, що відповідає за набір змін, отриманих з каналу сповіщень за короткий проміжок часу.
+
+    Attributes:
+        item_ids: ID доданих або змінених предметів
+        history_ids: ID доданих або змінених записів оренди
+        deleted_item_ids: ID видалених предметів
+        deleted_history_ids: ID видалених записів оренди
+        changed_tables: Таблиці, змінені надто великою кількістю рядків, щоб передати їх ID
+    """
+    def __init__(self):
+        """
+        Метод для ініціалізації порожнього набору змін.
+        """
+        self.item_ids = set()
+        self.history_ids = set()
+        self.deleted_item_ids = set()
+        self.deleted_history_ids = set()
+        self.changed_tables = set()
+
+    def add(self, payload):
+        """
+        Метод для додавання одного сповіщення до набору.
+
+        :param payload: Вміст сповіщення, надісланого тригером (див. CHANGE_FEED_SQL у Migrations.py).
+        :type payload: dict
+        """
+        table = payload.get("table")
+        if payload.get("truncated"):
+            self.changed_tables.add(table)
+            return
+
+        deleted = payload.get("op") == "DELETE"
+        item_ids = payload.get("item_ids") or ()
+        if table == "usage_history":
+            (self.deleted_history_ids if deleted else self.history_ids).update(payload.get("history_ids") or ())
+            # Оренда змінює статус предмета, тому його рядок також оновлюється
+            self.item_ids.update(item_ids)
+        else:
+            (self.deleted_item_ids if deleted else self.item_ids).update(item_ids)
+
+    def __bool__(self):
+        return bool(self.item_ids or self.history_ids or self.deleted_item_ids or self.deleted_history_ids
+                    or self.changed_tables)
+
+    def __repr__(self):
+        return (f"ChangeBatch(items={sorted(self.item_ids)}, history={sorted(self.history_ids)}, "
+                f"deleted_items={sorted(self.deleted_item_ids)}, deleted_history={sorted(self.deleted_history_ids)}, "
+                f"tables={sorted(self.changed_tables)})")
+
+
+class ChangeFeed(QObject):
+    """
+    Клас, що відповідає за отримання змін, зроблених іншими клієнтами, через LISTEN/NOTIFY.
+
+    Окремий потік тримає з'єднання, що слухає канал сповіщень, та об'єднує сповіщення,
+    отримані протягом coalesce_ms, в один набір змін. Сповіщення від з'єднань цього ж
+    клієнта пропускаються: свої зміни вікно застосовує одразу після виконання запиту.
+    Після втрати з'єднання потік перепідключається з паузою reconnect_delay.
+
+    Attributes:
+        changed: Сигнал з набором змін ChangeBatch, що надсилається у потік інтерфейсу
+    """
+    changed = pyqtSignal(object)
+
+    def __init__(self, db, coalesce_ms=200, reconnect_delay=5, parent=None):
+        """
+        Метод для ініціалізації слухача змін.
+
+        :param db: Об'єкт підключення до бази даних.
+        :type db: DBConnection
+
+        :param coalesce_ms: Час (у мілісекундах), протягом якого сповіщення об'єднуються.
+        :type coalesce_ms: int
+
+        :param reconnect_delay: Пауза (у секундах) перед повторним підключенням.
+        :type reconnect_delay: float
+
+        :param parent: Батьківський об'єкт.
+        """
+        super().__init__(parent)
+        self.db = db
+        self.coalesce = coalesce_ms / 1000
+        self.reconnect_delay = reconnect_delay
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Метод для запуску потоку, що слухає канал сповіщень.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ChangeFeed", daemon=True)
+        self._thread.start()
+        logger.info("Слухача змін запущено")
+
+    def stop(self):
+        """
+        Метод для зупинки потоку слухача.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        logger.info("Слухача змін зупинено")
+
+    def _run(self):
+        """
+        Основний цикл потоку: підключення, очікування сповіщень, перепідключення після помилок.
+        """
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self.db.open_listen_connection()
+                self._listen(connection)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                logger.warning(f"З'єднання слухача змін втрачено: {e}")
+            except Exception as e:
+                logger.error(f"Помилка слухача змін: {e}")
+                logger.error(f"Деталі:\n{traceback.format_exc()}")
+            finally:
+                if connection is not None and not connection.closed:
+                    connection.close()
+            self._stop.wait(self.reconnect_delay)
+
+    def _listen(self, connection):
+        """
+        Метод для очікування сповіщень на відкритому з'єднанні.
+
+        :param connection: З'єднання з виконаним LISTEN.
+        """
+        while not self._stop.is_set():
+            # Таймаут дозволяє перевіряти прапорець зупинки
+            if select.select([connection], [], [], 1.0) == ([], [], []):
+                continue
+
+            batch = ChangeBatch()
+            deadline = time.monotonic() + self.coalesce
+            while True:
+                connection.poll()
+                self._collect(connection, batch)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or select.select([connection], [], [], remaining) == ([], [], []):
+                    break
+
+            if batch:
+                logger.debug(f"Отримано зміни від інших клієнтів: {batch}")
+                try:
+                    self.changed.emit(batch)
+                except RuntimeError:
+                    # Вікно, що отримувало зміни, вже закрито
+                    self._stop.set()
+                    return
+
+    def _collect(self, connection, batch):
+        """
+        Метод для перенесення отриманих сповіщень з'єднання до набору змін.
+
+        :param connection: З'єднання слухача.
+
+        :param batch: Набір змін, що заповнюється.
+        :type batch: ChangeBatch
+        """
+        while connection.notifies:
+            notify = connection.notifies.pop(0)
+            if self.db.is_own_backend(notify.pid):
+                continue
+            try:
+                batch.add(json.loads(notify.payload))
+            except ValueError:
+                logger.warning(f"Некоректне сповіщення про зміну: {notify.payload}")
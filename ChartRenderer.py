@@ -0,0 +1,387 @@
+"""
+Побудова графіків статистики у фоновому потоці.
+
+Графіки малюються matplotlib без інтерфейсу (Agg) у растрові зображення, які вікно
+статистики лише показує. Готові зображення зберігаються в кеші за хешем даних графіка
+та його розміром, тому повторний показ графіка з тими самими даними не малює його знову.
+matplotlib імпортується лише під час побудови першого графіка.
+"""
+
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+
+from LazyImport import lazy_import
+
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Сумарний розмір пікселів зображень у кеші графіків (у байтах)
+CHART_CACHE_BYTES = 64 * 1024 * 1024
+
+# Роздільна здатність графіка (точок на дюйм) за масштабу екрана 1.0
+CHART_DPI = 100
+
+
+class ChartImage:
+    """
+    Клас, що відповідає за намальований графік.
+
+    Attributes:
+        width: Ширина зображення в пікселях
+        height: Висота зображення в пікселях
+        pixel_ratio: Масштаб екрана, для якого намальовано зображення
+        pixels: Пікселі у форматі RGBA (рядок за рядком)
+        data_hash: Хеш даних, за якими намальовано графік
+        regions: Стовпчики, на які можна клацнути: (лівий край, правий край у пікселях, значення)
+    """
+    def __init__(self, width, height, pixel_ratio, pixels, data_hash, regions=()):
+        self.width = width
+        self.height = height
+        self.pixel_ratio = pixel_ratio
+        self.pixels = pixels
+        self.data_hash = data_hash
+        self.regions = regions
+
+    def region_at(self, x):
+        """
+        Метод для пошуку стовпчика за горизонтальною координатою.
+
+        :param x: Координата в пікселях зображення від лівого краю.
+        :type x: float
+
+        :return: Значення стовпчика або None.
+        """
+        for left, right, value in self.regions:
+            if left <= x <= right:
+                return value
+        return None
+
+
+class ChartCache:
+    """
+    Клас, що відповідає за кеш намальованих графіків.
+
+    Розмір кешу обмежено сумарним розміром пікселів зображень, а не їх кількістю, бо
+    зображення на екрані з високою щільністю пікселів у кілька разів більше. Записи
+    витісняються за давністю використання (LRU). Використовується з кількох потоків одночасно.
+
+    Attributes:
+        max_bytes: Максимальний сумарний розмір пікселів зображень у байтах
+    """
+    def __init__(self, max_bytes=CHART_CACHE_BYTES):
+        """
+        :param max_bytes: Максимальний сумарний розмір пікселів зображень у байтах.
+        :type max_bytes: int
+        """
+        self.max_bytes = max_bytes
+        self._images = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Метод для отримання зображення з кешу.
+
+        :param key: Ключ графіка (див. render_chart).
+        :type key: tuple
+
+        :return: Зображення або None, якщо його немає в кеші.
+        :rtype: ChartImage, optional
+        """
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        """
+        Метод для збереження зображення в кеші.
+        Зображення, більше за весь кеш, не зберігається.
+
+        :param key: Ключ графіка.
+        :type key: tuple
+
+        :param image: Намальований графік.
+        :type image: ChartImage
+        """
+        size = len(image.pixels)
+        with self._lock:
+            previous = self._images.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.pixels)
+            if size > self.max_bytes:
+                logger.debug("Графік розміром %s байт не збережено в кеші", size)
+                return
+            self._images[key] = image
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= len(evicted.pixels)
+
+    def clear(self):
+        """
+        Метод для очищення кешу.
+        """
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self):
+        """
+        Сумарний розмір пікселів зображень у кеші в байтах.
+
+        :rtype: int
+        """
+        with self._lock:
+            return self._bytes
+
+    def __len__(self):
+        with self._lock:
+            return len(self._images)
+
+
+# Спільний кеш усіх вікон статистики: повторно відкрите вікно показує вже намальовані графіки
+chart_cache = ChartCache()
+
+
+def data_hash(data):
+    """
+    Функція для обчислення хешу даних графіка.
+
+    :param data: Дані графіка.
+    :type data: pandas.DataFrame
+
+    :return: Шістнадцятковий хеш значень, індексу та назв колонок.
+    :rtype: str
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\0".join(map(str, data.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+# Скорочені назви місяців для підписів графіків
+MONTHS = ['Січ', 'Лют', 'Бер', 'Кві', 'Тра', 'Чер',
+          'Лип', 'Сер', 'Вер', 'Жов', 'Лис', 'Гру']
+
+# Заголовки графіка оренд за кроком групування
+SERIES_TITLES = {
+    "day": "Статистика оренди по днях",
+    "week": "Статистика оренди по тижнях",
+    "month": "Статистика оренди по місяцях",
+    "year": "Статистика оренди по роках",
+}
+
+# Найбільша кількість підписів на осі періодів та стовпчиків, над якими пишуться значення
+MAX_PERIOD_LABELS = 24
+MAX_ANNOTATED_PERIODS = 31
+
+
+def chart_title(title, subtitle=None):
+    """
+    Функція для побудови заголовка графіка з описом вибраних фільтрів.
+
+    :param title: Заголовок графіка.
+    :type title: str
+
+    :param subtitle: Опис фільтрів (другий рядок заголовка).
+    :type subtitle: str, optional
+
+    :rtype: str
+    """
+    return f"{title}\n{subtitle}" if subtitle else title
+
+
+def period_label(period, granularity):
+    """
+    Функція для побудови підпису періоду на осі графіка.
+
+    :param period: Перший день періоду.
+    :type period: date
+
+    :param granularity: Крок групування (day, week, month, year).
+    :type granularity: str
+
+    :rtype: str
+    """
+    if granularity == "year":
+        return str(period.year)
+    if granularity == "month":
+        return f"{MONTHS[period.month - 1]} {period:%y}"
+    return f"{period:%d.%m.%y}"
+
+
+def draw_popularity(figure, data, subtitle=None):
+    """
+    Функція для малювання стовпчастої діаграми найпопулярніших предметів.
+
+    :param figure: Полотно графіка.
+    :type figure: matplotlib.figure.Figure
+
+    :param data: Предмети за кількістю оренд (item_name, usage_count).
+    :type data: pandas.DataFrame
+
+    :param subtitle: Опис вибраного періоду та категорії.
+    :type subtitle: str, optional
+    """
+    ax = figure.add_subplot(111)
+
+    bars = ax.bar(data['item_name'], data['usage_count'])
+    ax.set_title(chart_title('Топ 10 найпопулярніших предметів для оренди', subtitle))
+    ax.set_ylabel('Кількість оренд')
+    ax.tick_params(axis='x', rotation=45)
+
+    # Значення над стовпчиками
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height,
+                f'{int(height)}', ha='center', va='bottom')
+
+
+def draw_wear(figure, data, subtitle=None):
+    """
+    Функція для малювання горизонтальної діаграми найбільш зношених предметів.
+
+    :param figure: Полотно графіка.
+    :type figure: matplotlib.figure.Figure
+
+    :param data: Предмети з найменшою цілісністю (item_name, integrity_percentage, condition_name).
+    :type data: pandas.DataFrame
+
+    :param subtitle: Опис вибраної категорії.
+    :type subtitle: str, optional
+    """
+    ax = figure.add_subplot(111)
+
+    bars = ax.barh(data['item_name'], data['integrity_percentage'])
+    ax.set_title(chart_title('Топ 10 найбільш зношених речей', subtitle))
+    ax.set_xlabel('Цілісність (у %)')
+    ax.set_xlim(0, 100)
+
+    for bar, condition in zip(bars, data['condition_name']):
+        width = bar.get_width()
+        ax.text(width + 2, bar.get_y() + bar.get_height() / 2,
+                condition, ha='left', va='center')
+
+
+def draw_rental_series(figure, data, granularity="month", subtitle=None):
+    """
+    Функція для малювання стовпчастої діаграми оренд та запізнень за періодами.
+
+    :param figure: Полотно графіка.
+    :type figure: matplotlib.figure.Figure
+
+    :param data: Кількість оренд та запізнень за періодами (period_start, rental_count, late_count).
+    :type data: pandas.DataFrame
+
+    :param granularity: Крок групування (day, week, month, year).
+    :type granularity: str
+
+    :param subtitle: Опис вибраного періоду та категорії.
+    :type subtitle: str, optional
+
+    :return: Стовпчики оренд разом з першим днем їх періоду.
+    :rtype: list[tuple]
+    """
+    ax = figure.add_subplot(111)
+
+    periods = list(data['period_start'])
+    positions = range(len(periods))
+
+    bars1 = ax.bar(positions, data['rental_count'], label='Всього оренд', alpha=0.7)
+    bars2 = ax.bar(positions, data['late_count'], label='Запізнілі повернення', alpha=0.7)
+
+    ax.set_title(chart_title(SERIES_TITLES[granularity], subtitle))
+    ax.set_ylabel('Кількість')
+    ax.legend()
+
+    # Підписи лише для частини періодів, щоб вони не накладалися
+    step = max(1, -(-len(periods) // MAX_PERIOD_LABELS))
+    ax.set_xticks(positions[::step])
+    ax.set_xticklabels([period_label(period, granularity) for period in periods[::step]],
+                       rotation=45 if granularity in ("day", "week") else 0)
+
+    # Значення над стовпчиками
+    if len(periods) <= MAX_ANNOTATED_PERIODS:
+        for bars in [bars1, bars2]:
+            for bar in bars:
+                height = bar.get_height()
+                if height > 0:
+                    ax.text(bar.get_x() + bar.get_width() / 2., height,
+                            f'{int(height)}', ha='center', va='bottom', fontsize=8)
+
+    return list(zip(bars1, periods))
+
+
+# Функції малювання графіків за ключем графіка
+CHART_DRAWERS = {
+    "popularity": draw_popularity,
+    "wear": draw_wear,
+    "rental_stats": draw_rental_series,
+}
+
+
+def render_chart(kind, data, width, height, pixel_ratio=1.0, cache=chart_cache, **options):
+    """
+    Функція для малювання графіка в растрове зображення.
+
+    Безпечна для виклику у фоновому потоці: кожен графік малюється на власному полотні
+    Agg без pyplot. Якщо графік того самого виду з тими самими даними та розміром уже
+    є в кеші, повертається збережене зображення.
+
+    :param kind: Ключ графіка (один з CHART_DRAWERS).
+    :type kind: str
+
+    :param data: Дані графіка.
+    :type data: pandas.DataFrame
+
+    :param width: Ширина області графіка в логічних пікселях.
+    :type width: int
+
+    :param height: Висота області графіка в логічних пікселях.
+    :type height: int
+
+    :param pixel_ratio: Масштаб екрана (кількість фізичних пікселів на логічний).
+    :type pixel_ratio: float
+
+    :param cache: Кеш зображень (None — без кешу).
+    :type cache: ChartCache, optional
+
+    :param options: Додаткові параметри функції малювання (наприклад, granularity, subtitle).
+
+    :rtype: ChartImage
+    """
+    digest = data_hash(data)
+    key = (kind, digest, width, height, pixel_ratio, tuple(sorted(options.items())))
+    if cache is not None:
+        image = cache.get(key)
+        if image is not None:
+            logger.debug("Графік '%s' %dx%d взято з кешу", kind, width, height)
+            return image
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    dpi = CHART_DPI * pixel_ratio
+    figure = Figure(figsize=(width / CHART_DPI, height / CHART_DPI), dpi=dpi)
+    canvas = FigureCanvasAgg(figure)
+    targets = CHART_DRAWERS[kind](figure, data, **options) or ()
+    figure.tight_layout()
+    canvas.draw()
+
+    buffer = canvas.buffer_rgba()
+    regions = []
+    for artist, value in targets:
+        extent = artist.get_window_extent()
+        regions.append((extent.x0, extent.x1, value))
+    image = ChartImage(buffer.shape[1], buffer.shape[0], pixel_ratio, bytes(buffer), digest, regions)
+    logger.debug("Графік '%s' намальовано: %dx%d пікселів", kind, image.width, image.height)
+
+    if cache is not None:
+        cache.put(key, image)
+    return image
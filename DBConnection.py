@@ -1,62 +1,418 @@
+import csv
+import io
+import itertools
+import re
+import threading
+import time
 import traceback
+import weakref
+from contextlib import contextmanager
+from datetime import timedelta
 
-import pandas as pd
 import psycopg2
+from psycopg2 import errors, pool
+from psycopg2.extras import execute_values
 import logging
 
+from LazyImport import lazy_import
+from QueryStats import QueryStats, query_id
+
+pd = lazy_import("pandas")
+
 
 logger = logging.getLogger(__name__)
 
+# Параметри підключення до бази даних
+DB_PARAMS = {
+    "dbname": "postgres",
+    "user": "postgres",
+    "password": "1234",
+    "host": "localhost"
+}
+
+# Кроки групування статистики оренд (аргумент date_trunc)
+STATS_GRANULARITIES = ("day", "week", "month", "year")
+
+# Канал сповіщень про зміни інвентарю та оренд
+CHANGE_FEED_CHANNEL = "inventory_changes"
+
 class DBConnection:
     """
-    Клас, що відповідає за підключення до бази даних та здійснення запитів до неї
+    Клас, що відповідає за підключення до бази даних та здійснення запитів до неї.
+
+    Запити виконуються через пул з'єднань: кожен запит позичає з'єднання з пулу
+    та повертає його після завершення транзакції, тому фонові завантаження та
+    статистичні запити можуть виконуватися одночасно.
 
     Attributes:
-        connection: Об'єкт підключення до бази даних
+        pool: Пул з'єднань з базою даних
+        min_connections: Мінімальна кількість відкритих з'єднань у пулі
+        max_connections: Максимальна кількість з'єднань у пулі
+        health_check_interval: Час простою з'єднання (у секундах), після якого воно перевіряється перед видачею
+        cache: Кеш результатів запитів (None — кешування вимкнено)
+        stats: Статистика часу та кількості рядків кожного запиту
     """
 
-    def __init__(self):
+    def __init__(self, min_connections=1, max_connections=5, health_check_interval=30, cache=None, stats=None):
         """
-        Метод для ініціалізації об'єкта DBConnection зі значенням підключення none.
+        Метод для ініціалізації об'єкта DBConnection з порожнім пулом з'єднань.
+
+        :param min_connections: Мінімальна кількість з'єднань у пулі.
+        :type min_connections: int
+
+        :param max_connections: Максимальна кількість з'єднань у пулі.
+        :type max_connections: int
+
+        :param health_check_interval: Час простою з'єднання, після якого воно перевіряється запитом SELECT 1.
+        :type health_check_interval: float
+
+        :param cache: Кеш результатів запитів для довідників, що рідко змінюються.
+        :type cache: QueryCache, optional
+
+        :param stats: Статистика запитів (за замовчуванням створюється нова).
+        :type stats: QueryStats, optional
         """
-        self.connection = None
+        self.pool = None
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.health_check_interval = health_check_interval
+        self.cache = cache
+        self.stats = stats if stats is not None else QueryStats()
+
+        self._pool_lock = threading.Lock()
+        # Позичені з'єднання та пули, що їх видали: з'єднання повертається саме до свого пулу,
+        # а перестворений пул закривається після повернення останнього з них
+        self._borrowed = {}
+        # ThreadedConnectionPool не чекає на вільне з'єднання, тому обмежуємо кількість позичальників семафором
+        self._slots = threading.BoundedSemaphore(max_connections)
+        # Лічильник для унікальних назв серверних курсорів
+        self._stream_ids = itertools.count(1)
+        # Час повернення з'єднань до пулу. Ключі — самі з'єднання (слабкі посилання), а не id(),
+        # бо id закритого з'єднання може дістатися новому
+        self._last_used = weakref.WeakKeyDictionary()
+        self._thread_state = threading.local()
+        # PID серверних процесів відкритих з'єднань пулу, щоб відрізняти власні сповіщення
+        # від змін інших клієнтів: з'єднання -> PID. Закриті з'єднання вилучаються, бо сервер
+        # може видати їх PID іншому клієнту
+        self._backend_pids = weakref.WeakKeyDictionary()
+        self._pids_lock = threading.Lock()
+
+        # Реєстр підготовлених запитів: текст запиту -> назва оператора
+        self._statements = {}
+        self._statements_lock = threading.Lock()
+        # Оператори, вже підготовлені на кожному з'єднанні: з'єднання -> множина назв
+        self._prepared = weakref.WeakKeyDictionary()
 
     def connect(self):
         """
-        Метод для встановлення підключення до бази даних.
+        Метод для створення пулу з'єднань з базою даних.
 
         :return:
             True у випадку успішного підключення, False у випадку помилки.
         :rtype: bool
         """
+        with self._pool_lock:
+            try:
+                if self.pool is not None and not self.pool.closed:
+                    self.pool.closeall()
+                self.pool = pool.ThreadedConnectionPool(
+                    self.min_connections, self.max_connections, **DB_PARAMS
+                )
+                self._borrowed.clear()
+                self._last_used.clear()
+                self._prepared.clear()
+                with self._pids_lock:
+                    self._backend_pids.clear()
+                logger.info(
+                    f"Пул підключень до БД створено (min={self.min_connections}, max={self.max_connections})"
+                )
+                return True
+            except Exception as e:
+                self.pool = None
+                logger.error(f"Помилка підключення до БД: {e}" )
+                print(f"Помилка підключення до бази даних: {e}")
+                return False
+
+    def disconnect(self):
+        """
+        Метод для закриття всіх з'єднань пулу.
+
+        Якщо пул було створено, метод закриває всі його з'єднання.
+        """
+        with self._pool_lock:
+            if self.pool is not None and not self.pool.closed:
+                self.pool.closeall()
+                logger.info("Підключення до БД завершено")
+            self.pool = None
+            self._borrowed.clear()
+            self._last_used.clear()
+            self._prepared.clear()
+            with self._pids_lock:
+                self._backend_pids.clear()
+
+    def is_connected(self):
+        """
+        Метод для перевірки наявності робочого пулу з'єднань.
+
+        :return: True, якщо пул створено та він не закритий.
+        :rtype: bool
+        """
+        return self.pool is not None and not self.pool.closed
+
+    @contextmanager
+    def borrow_connection(self):
+        """
+        Контекстний менеджер, що позичає з'єднання з пулу та повертає його після використання.
+
+        Якщо пулу немає (сервер був недоступний або перезапускався), спершу виконується
+        повторне підключення. З'єднання, що простоювало довше за health_check_interval,
+        перевіряється перед видачею.
+
+        :return: Об'єкт з'єднання psycopg2.
+
+        :raise: psycopg2.OperationalError, якщо підключитися до бази даних не вдалося.
+        """
+        self._slots.acquire()
+        connection = None
         try:
-            self.connection = psycopg2.connect(
-                dbname="postgres",
-                user="postgres",
-                password="1234",
-                host="localhost"
-            )
-            logger.info("Підключення до БД встановлено")
+            connection = self._acquire()
+            yield connection
+        finally:
+            if connection is not None:
+                self._release(connection)
+            self._slots.release()
+
+    def _acquire(self):
+        """
+        Метод для отримання перевіреного з'єднання з пулу.
+
+        Розірване з'єднання закривається та вилучається з пулу, після чого з пулу береться
+        наступне. Пул перестворюється лише тоді, коли не працює й щойно відкрите з'єднання.
+
+        :return: Об'єкт з'єднання psycopg2.
+
+        :raise: psycopg2.OperationalError, якщо отримати працездатне з'єднання не вдалося.
+        """
+        if not self.is_connected() and not self.connect():
+            raise psycopg2.OperationalError("Немає підключення до бази даних")
+
+        # Вільних з'єднань не більше max_connections, тому останньою спробою буде нове з'єднання
+        for _ in range(self.max_connections + 1):
+            # Пул може перестворюватися в іншому потоці, тому з'єднання береться та
+            # записується за своїм пулом під тим самим блокуванням
+            with self._pool_lock:
+                current_pool = self.pool
+                if current_pool is None or current_pool.closed:
+                    raise psycopg2.OperationalError("Немає підключення до бази даних")
+                try:
+                    connection = current_pool.getconn()
+                except psycopg2.OperationalError as e:
+                    connection = None
+                    error = e
+                else:
+                    self._borrowed[connection] = current_pool
+
+            if connection is None:
+                logger.warning(f"Не вдалося відкрити нове з'єднання з БД: {error}")
+                self._rebuild_pool(current_pool)
+                continue
+
+            fresh = connection not in self._last_used
+            if self._is_healthy(connection):
+                with self._pids_lock:
+                    self._backend_pids[connection] = connection.get_backend_pid()
+                return connection
+
+            logger.warning("Виявлено розірване з'єднання, його вилучено з пулу")
+            self._discard(connection)
+            if fresh:
+                # Не працює навіть нове з'єднання — найімовірніше, сервер перезапускався
+                self._rebuild_pool(current_pool)
+
+        raise psycopg2.OperationalError("Не вдалося отримати працездатне з'єднання з базою даних")
+
+    def _release(self, connection):
+        """
+        Метод для повернення з'єднання до пулу.
+
+        Розірвані з'єднання та з'єднання пулу, який вже перестворено, закриваються,
+        а не повертаються до пулу.
+
+        :param connection: З'єднання, яке повертається.
+        """
+        with self._pool_lock:
+            owner = self._borrowed.get(connection)
+            current = owner is not None and owner is self.pool
+        if connection.closed or not current:
+            self._discard(connection)
+            return
+        self._borrowed.pop(connection, None)
+        self._last_used[connection] = time.monotonic()
+        owner.putconn(connection)
+
+    def _discard(self, connection):
+        """
+        Метод для остаточного закриття з'єднання та вилучення його з пулу, який його видав.
+
+        :param connection: З'єднання, яке необхідно закрити.
+        """
+        self._forget(connection)
+        with self._pool_lock:
+            owner = self._borrowed.pop(connection, None)
+        try:
+            if owner is not None and not owner.closed:
+                owner.putconn(connection, close=True)
+            elif not connection.closed:
+                connection.close()
+        except pool.PoolError:
+            if not connection.closed:
+                connection.close()
+        if owner is not None:
+            self._close_retired_pool(owner)
+
+    def _forget(self, connection):
+        """
+        Метод для видалення відомостей про з'єднання, яке закривається.
+
+        :param connection: З'єднання, яке закривається.
+        """
+        self._last_used.pop(connection, None)
+        self._prepared.pop(connection, None)
+        with self._pids_lock:
+            self._backend_pids.pop(connection, None)
+
+    def _close_retired_pool(self, retired_pool):
+        """
+        Метод для закриття перествореного пулу, щойно до нього повернуто всі позичені з'єднання.
+
+        :param retired_pool: Пул, який, можливо, вже замінено новим.
+        :type retired_pool: psycopg2.pool.ThreadedConnectionPool
+        """
+        with self._pool_lock:
+            if (retired_pool is self.pool or retired_pool.closed
+                    or any(owner is retired_pool for owner in self._borrowed.values())):
+                return
+        logger.debug("Закриття вільних з'єднань перествореного пулу")
+        retired_pool.closeall()
+
+    def _rebuild_pool(self, stale_pool):
+        """
+        Метод для перестворення пулу після втрати зв'язку з сервером.
+
+        Старий пул закривається (closeall) лише тоді, коли до нього повернуто всі позичені
+        з'єднання: потокове читання чи експорт в іншому потоці працюють далі, а їхні
+        з'єднання закриваються під час повернення (див. _release).
+
+        :param stale_pool: Пул, у якому не вдалося отримати працездатне з'єднання.
+        :type stale_pool: psycopg2.pool.ThreadedConnectionPool
+
+        :raise: psycopg2.OperationalError, якщо сервер досі недоступний.
+        """
+        with self._pool_lock:
+            if self.pool is not stale_pool:
+                # Пул вже перестворено в іншому потоці
+                return
+            try:
+                self.pool = pool.ThreadedConnectionPool(
+                    self.min_connections, self.max_connections, **DB_PARAMS
+                )
+            except psycopg2.Error as e:
+                logger.error(f"Помилка перепідключення до БД: {e}")
+                raise psycopg2.OperationalError(f"Не вдалося відновити підключення до бази даних: {e}")
+            logger.info("Пул підключень до БД перестворено після втрати зв'язку з сервером")
+
+        self._close_retired_pool(stale_pool)
+
+    def _is_healthy(self, connection):
+        """
+        Метод для перевірки працездатності з'єднання.
+
+        :param connection: З'єднання для перевірки.
+
+        :return: True, якщо з'єднання можна використовувати.
+        :rtype: bool
+        """
+        if connection.closed:
+            return False
+
+        last_used = self._last_used.get(connection)
+        if last_used is not None and time.monotonic() - last_used < self.health_check_interval:
             return True
-        except Exception as e:
-            logger.error(f"Помилка підключення до БД: {e}" )
-            print(f"Помилка підключення до бази даних: {e}")
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
             return False
 
-    def disconnect(self):
+    def refresh_rollups(self):
         """
-        Метод для закриття підключення до бази даних.
+        Метод для повного перерахунку зведених таблиць статистики з історії оренд.
+
+        Тригер підтримує таблиці в актуальному стані, тому перерахунок потрібен лише
+        для відновлення після змін, зроблених в обхід тригера.
 
-        Якщо підключення було відкрите, метод закриває його.
+        :return: True при успішному перерахунку.
+        :rtype: bool
+
+        :raise: Exception, якщо перерахунок не вдався.
         """
-        if self.connection:
-            self.connection.close()
-            logger.info("Підключення до БД завершено")
+        logger.info("Перерахунок зведених таблиць статистики оренд")
+        try:
+            return self.execute_query("SELECT refresh_usage_rollups()")
+        except Exception as e:
+            logger.error(f"Помилка перерахунку зведених таблиць: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося перерахувати статистику: {str(e)}")
 
-    def execute_query(self, query, params=None, fetch=False, return_df=False):
+    def open_listen_connection(self):
+        """
+        Метод для відкриття окремого з'єднання, що слухає канал сповіщень про зміни.
+
+        З'єднання не належить пулу: воно постійно зайняте очікуванням сповіщень.
+
+        :return: З'єднання psycopg2 в режимі autocommit з виконаним LISTEN.
+
+        :raise: psycopg2.OperationalError, якщо підключитися до бази даних не вдалося.
+        """
+        connection = psycopg2.connect(**DB_PARAMS)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANGE_FEED_CHANNEL}")
+        logger.info(f"Очікування сповіщень на каналі {CHANGE_FEED_CHANNEL}")
+        return connection
+
+    def is_own_backend(self, pid):
+        """
+        Метод для перевірки, чи надіслано сповіщення з'єднанням цього клієнта.
+
+        :param pid: PID серверного процесу, що надіслав сповіщення.
+        :type pid: int
+
+        :rtype: bool
+        """
+        with self._pids_lock:
+            # Пул сам закриває зайві вільні з'єднання, тому закриті пропускаються тут
+            return any(own_pid == pid and not connection.closed
+                       for connection, own_pid in self._backend_pids.items())
+
+    def execute_query(self, query, params=None, fetch=False, return_df=False, prepared=False,
+                      cache_tables=None, cache_ttl=None, invalidates=()):
         """
         Метод для виконання запиту до бази даних.
 
+        Запит виконується на з'єднанні, позиченому з пулу, в окремій транзакції.
+        Якщо з'єднання виявилося розірваним, запит повторюється один раз після перепідключення.
+
+        Часті запити, що відрізняються лише параметрами, варто виконувати з prepared=True:
+        тоді сервер розбирає та планує запит один раз на з'єднання (PREPARE), а далі
+        лише виконує його (EXECUTE).
+
+        Якщо задано cache_tables і кеш увімкнено, результат читання зберігається в кеші;
+        запити, що змінюють дані, передають змінені таблиці в invalidates.
+
         :param query: Запит мовою SQL.
         :type query: str
 
@@ -69,48 +425,284 @@ class DBConnection:
         :param return_df: Чи необхідно повертати результат у вигляді DataFrame.
         :type return_df: bool
 
+        :param prepared: Чи виконувати запит як підготовлений оператор.
+        :type prepared: bool
+
+        :param cache_tables: Таблиці, з яких читає запит (результат кешується лише за їх наявності).
+        :type cache_tables: tuple[str], optional
+
+        :param cache_ttl: Час життя результату в кеші (у секундах), за замовчуванням — TTL кешу.
+        :type cache_ttl: float, optional
+
+        :param invalidates: Таблиці, які змінює запит; залежні записи кешу видаляються після виконання.
+        :type invalidates: tuple[str]
+
         :return:
             * Якщо fetch = False: True при успішному виконанні.
             * Якщо fetch = True та return_df = False: Список кортежів з результатами.
             * Якщо fetch = True та return_df = True: DataFrame з результатами запиту.
         """
         short_query = query[:100] + "..." if len(query) > 100 else query
-        logger.info(f"SQL Query: {short_query}")
+
+        use_cache = self.cache is not None and fetch and cache_tables
+        if use_cache:
+            cache_key = self.cache.make_key(query, params)
+            found, result = self.cache.get(cache_key)
+            if found:
+                logger.debug("SQL Query (з кешу): %s", short_query, extra={"query_id": query_id(query)})
+                self.stats.record(query, cached=True)
+                return result
+
+        logger.info("SQL Query: %s", short_query, extra={"query_id": query_id(query)})
 
         if params:
-            logger.debug(f"Параметри запиту: {params}")
+            logger.debug("Параметри запиту: %s", params)
 
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(query, params or ())
+            result = self._run_query(query, params, fetch, return_df, prepared)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            if not self._connection_lost:
+                raise
+            logger.warning(f"Втрачено з'єднання під час запиту, повторна спроба: {e}")
+            # Решта вільних з'єднань, ймовірно, теж розірвані: перевіряємо кожне перед видачею
+            self._last_used.clear()
+            result = self._run_query(query, params, fetch, return_df, prepared)
+
+        if invalidates:
+            self.invalidate_cache(*invalidates)
+        if use_cache:
+            self.cache.put(cache_key, result, cache_tables, cache_ttl)
+        return result
+
+    def stream_query(self, query, params=None, itersize=2000, return_df=False):
+        """
+        Генератор для потокового читання великої вибірки частинами через серверний (іменований) курсор.
 
-                if fetch:
-                    if return_df:
-                        # Для повернення DataFrame
-                        logger.debug("Повернення результату як DataFrame")
+        На відміну від execute_query, рядки не збираються в один список: сервер надсилає
+        по itersize рядків, і в пам'яті одночасно перебуває лише одна частина.
+        З'єднання позичене з пулу, доки генератор не вичерпано або не закрито.
+
+        :param query: Запит мовою SQL (лише читання).
+        :type query: str
+
+        :param params: Параметри для підставлення в запит.
+        :type params: tuple, optional
+
+        :param itersize: Кількість рядків в одній частині.
+        :type itersize: int
+
+        :param return_df: Чи повертати частини у вигляді DataFrame.
+        :type return_df: bool
+
+        :return: Частини вибірки: списки кортежів або DataFrame.
+        :rtype: Iterator[list[tuple]] | Iterator[pandas.DataFrame]
+        """
+        short_query = query[:100] + "..." if len(query) > 100 else query
+        logger.info("SQL Query (потокове читання по %d рядків): %s", itersize, short_query,
+                    extra={"query_id": query_id(query)})
+        if params:
+            logger.debug("Параметри запиту: %s", params)
+
+        total = 0
+        # Час обробки частин викликаючим кодом між ітераціями не враховується
+        execute_s = fetch_s = build_s = 0.0
+        failed = True
+        with self.borrow_connection() as connection:
+            cursor = connection.cursor(name=f"stream_{next(self._stream_ids)}")
+            cursor.itersize = itersize
+            try:
+                start = time.perf_counter()
+                cursor.execute(query, params or ())
+                execute_s = time.perf_counter() - start
+                columns = None
+                while True:
+                    start = time.perf_counter()
+                    rows = cursor.fetchmany(itersize)
+                    fetch_s += time.perf_counter() - start
+                    if not rows:
+                        break
+                    if columns is None:
                         columns = [desc[0] for desc in cursor.description]
-                        data = cursor.fetchall()
-                        df = pd.DataFrame(data, columns=columns)
-                        self.connection.commit()
-                        logger.info(f"Отримано {len(df)} рядків даних")
-                        return df
+                    total += len(rows)
+                    if return_df:
+                        start = time.perf_counter()
+                        rows = pd.DataFrame(rows, columns=columns)
+                        build_s += time.perf_counter() - start
+                    yield rows
+                cursor.close()
+                connection.commit()
+                failed = False
+                logger.info("Потоково отримано %d рядків даних", total,
+                            extra={"query_id": query_id(query), "rows": total,
+                                   "duration_ms": round((execute_s + fetch_s + build_s) * 1000, 3)})
+            except BaseException as e:
+                # Сюди потрапляє і GeneratorExit, якщо читання припинено достроково
+                if not connection.closed:
+                    try:
+                        connection.rollback()
+                    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                        pass
+                if isinstance(e, GeneratorExit):
+                    failed = False
+                else:
+                    logger.error(f"Помилка потокового читання після {total} рядків: {e}")
+                raise
+            finally:
+                self.stats.record(query, execute_s, fetch_s, build_s, total, failed=failed)
+
+    def invalidate_cache(self, *tables):
+        """
+        Метод для видалення з кешу результатів, прочитаних зі змінених таблиць.
+
+        Викликається автоматично для запитів з параметром invalidates, а також
+        для змін, зроблених іншими клієнтами.
+
+        :param tables: Назви змінених таблиць.
+        :type tables: str
+        """
+        if self.cache is not None:
+            self.cache.invalidate(*tables)
+
+    @property
+    def _connection_lost(self):
+        """
+        Ознака того, що останній запит в поточному потоці впав через розірване з'єднання.
+
+        :rtype: bool
+        """
+        return getattr(self._thread_state, "connection_lost", False)
+
+    def _run_query(self, query, params, fetch, return_df, prepared=False):
+        """
+        Метод для виконання одного запиту на позиченому з'єднанні.
+
+        Параметри аналогічні до execute_query.
+        """
+        self._thread_state.connection_lost = False
+        with self.borrow_connection() as connection:
+            execute_s = fetch_s = build_s = 0.0
+            rows = 0
+            failed = True
+            start = time.perf_counter()
+            try:
+                with connection.cursor() as cursor:
+                    if prepared:
+                        self._execute_prepared(connection, cursor, query, params or ())
                     else:
-                        # Для повернення звичайного результату
+                        cursor.execute(query, params or ())
+                    execute_s = time.perf_counter() - start
+
+                    if fetch:
                         result = cursor.fetchall()
-                        self.connection.commit()
-                        logger.info(f"Отримано {len(result)} рядків")
+                        fetch_s = time.perf_counter() - start - execute_s
+                        rows = len(result)
+                        if return_df:
+                            # Для повернення DataFrame
+                            logger.debug("Повернення результату як DataFrame")
+                            columns = [desc[0] for desc in cursor.description]
+                            result = pd.DataFrame(result, columns=columns)
+                            build_s = time.perf_counter() - start - execute_s - fetch_s
+                        connection.commit()
+                        logger.info("Отримано %d рядків даних", rows,
+                                    extra={"query_id": query_id(query), "rows": rows,
+                                           "duration_ms": round((time.perf_counter() - start) * 1000, 3)})
+                        failed = False
                         return result
 
-                self.connection.commit()
-                logger.info(f"Змінено {cursor.rowcount} рядків")
-                return True
+                    connection.commit()
+                    # Для запитів, що змінюють дані, час включає фіксацію транзакції
+                    execute_s = time.perf_counter() - start
+                    rows = max(cursor.rowcount, 0)
+                    logger.info("Змінено %d рядків", cursor.rowcount,
+                                extra={"query_id": query_id(query), "rows": rows,
+                                       "duration_ms": round(execute_s * 1000, 3)})
+                    failed = False
+                    return True
+
+            except Exception as e:
+                if not connection.closed:
+                    try:
+                        connection.rollback()
+                    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                        pass
+                self._thread_state.connection_lost = bool(connection.closed)
+                logger.error(f"Помилка виконання запиту: {e}")
+                logger.error(f"Деталі:\n{traceback.format_exc()}")
+                print(f"Помилка виконання запиту: {e}")
+                raise  # Піднімаємо виняток для обробки у викликаючому коді
+            finally:
+                if failed and not execute_s:
+                    execute_s = time.perf_counter() - start
+                self.stats.record(query, execute_s, fetch_s, build_s, rows, failed=failed)
+
+    def _statement_name(self, query):
+        """
+        Метод для отримання назви підготовленого оператора для тексту запиту.
 
-        except Exception as e:
-            self.connection.rollback()
-            logger.error(f"Помилка виконання запиту: {e}")
-            logger.error(f"Деталі:\n{traceback.format_exc()}")
-            print(f"Помилка виконання запиту: {e}")
-            raise  # Піднімаємо виняток для обробки у викликаючому коді
+        :param query: Текст запиту.
+        :type query: str
+
+        :return: Назва оператора (однакова для всіх з'єднань).
+        :rtype: str
+        """
+        with self._statements_lock:
+            name = self._statements.get(query)
+            if name is None:
+                name = self._statements[query] = f"stmt_{len(self._statements) + 1}"
+                logger.debug("Зареєстровано підготовлений запит %s", name)
+            return name
+
+    @staticmethod
+    def _positional_query(query):
+        """
+        Метод для заміни параметрів %s на позиційні параметри $1, $2, ... для PREPARE.
+
+        :param query: Текст запиту з параметрами psycopg2.
+        :type query: str
+
+        :rtype: str
+        """
+        counter = iter(range(1, query.count("%s") + 1))
+        return re.sub(r"%([%s])", lambda m: "%" if m.group(1) == "%" else f"${next(counter)}", query)
+
+    def _execute_prepared(self, connection, cursor, query, params):
+        """
+        Метод для виконання запиту як підготовленого оператора.
+
+        Оператор готується на з'єднанні під час першого використання. Після перепідключення
+        з'єднання нові, тому оператори готуються на них повторно.
+
+        :param connection: Позичене з'єднання.
+        :param cursor: Курсор з'єднання.
+
+        :param query: Текст запиту з параметрами %s.
+        :type query: str
+
+        :param params: Параметри запиту.
+        :type params: tuple
+        """
+        name = self._statement_name(query)
+        prepared = self._prepared.setdefault(connection, set())
+        execute = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})" if params else f"EXECUTE {name}"
+
+        if name not in prepared:
+            try:
+                cursor.execute(f"PREPARE {name} AS {self._positional_query(query)}")
+            except errors.DuplicatePreparedStatement:
+                # Оператор лишився на з'єднанні, відомості про яке було втрачено
+                connection.rollback()
+            prepared.add(name)
+            logger.debug("Підготовлено запит %s на з'єднанні %x", name, id(connection))
+
+        try:
+            cursor.execute(execute, params)
+        except errors.InvalidSqlStatementName:
+            # Оператори зникли з з'єднання (наприклад, після DISCARD ALL на сервері)
+            connection.rollback()
+            prepared.clear()
+            cursor.execute(f"PREPARE {name} AS {self._positional_query(query)}")
+            prepared.add(name)
+            cursor.execute(execute, params)
 
     def get_categories(self):
         """Метод для отримання всіх категорій інвентарю з бази даних
@@ -124,9 +716,9 @@ class DBConnection:
         try:
             result = self.execute_query(
                 "SELECT category_id, category_name FROM categories ORDER BY category_name",
-                fetch=True, return_df=True
+                fetch=True, return_df=True, cache_tables=("categories",), cache_ttl=300
             )
-            logger.debug(f"Отримано {len(result)} категорій")
+            logger.debug("Отримано %s категорій", len(result))
             return result
         except Exception as e:
             logger.error(f"Помилка виконання запиту: {e}")
@@ -146,9 +738,9 @@ class DBConnection:
         try:
             result =  self.execute_query(
                 "SELECT status_id, status_name FROM availability_statues ORDER BY status_id",
-                fetch=True, return_df=True
+                fetch=True, return_df=True, cache_tables=("availability_statues",), cache_ttl=3600
             )
-            logger.debug(f"Отримано {len(result)} статусів")
+            logger.debug("Отримано %s статусів", len(result))
             return result
         except Exception as e:
             logger.error(f"Помилка виконання запиту: {e}")
@@ -168,15 +760,309 @@ class DBConnection:
         try:
             result = self.execute_query(
                 "SELECT * FROM inventory_details ORDER BY \"ID предмету\"",
-                fetch=True, return_df=True
+                fetch=True, return_df=True,
+                cache_tables=("inventory", "categories", "availability_statues", "conditions"), cache_ttl=30
             )
-            logger.debug(f"Отримано {len(result)} рядків предметів")
+            logger.debug("Отримано %s рядків предметів", len(result))
             return result
         except Exception as e:
             logger.error(f"Помилка виконання запиту: {e}")
             logger.error(f"Деталі:\n{traceback.format_exc()}")
             raise Exception(f"Не вдалося отримати дані інвентарю: {str(e)}")
 
+    def get_inventory_page(self, search_text=None, category_id=None, status_id=None,
+                           after_id=None, page_size=100):
+        """
+        Метод для отримання однієї сторінки інвентарю з фільтрацією на боці сервера.
+
+        Пошук за назвою/номером, фільтри категорії та статусу передаються в умову WHERE,
+        а сторінки вибираються за ключем (keyset pagination): наступна сторінка починається
+        після останнього ID попередньої, тому вартість запиту не залежить від номера сторінки.
+
+        :param search_text: Текст для пошуку в назві або інвентарному номері.
+        :type search_text: str, optional
+
+        :param category_id: ID категорії для фільтрації.
+        :type category_id: int, optional
+
+        :param status_id: ID статусу доступності для фільтрації.
+        :type status_id: int, optional
+
+        :param after_id: ID останнього предмета попередньої сторінки (None для першої сторінки).
+        :type after_id: int, optional
+
+        :param page_size: Максимальна кількість рядків на сторінці.
+        :type page_size: int
+
+        :return: DataFrame з рядками сторінки (не більше page_size + 1 рядків;
+            зайвий рядок означає, що існує наступна сторінка).
+        :rtype: pandas.DataFrame
+
+        :raise: Exception, якщо відбулася помилка отримання даних.
+        """
+        logger.info("Запит сторінки інвентарю після ID=%s", after_id)
+        logger.debug("Фільтри: пошук='%s', категорія=%s, статус=%s", search_text, category_id, status_id)
+
+        conditions, params = self._inventory_filter(search_text, category_id, status_id)
+
+        if after_id is not None:
+            conditions.append("d.\"ID предмету\" > %s")
+            params.append(after_id)
+
+        query = "SELECT d.* FROM inventory_details d"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY d.\"ID предмету\" LIMIT %s"
+        params.append(page_size + 1)
+
+        try:
+            result = self.execute_query(query, tuple(params), fetch=True, return_df=True)
+            logger.debug("Отримано %s рядків сторінки інвентарю", len(result))
+            return result
+        except Exception as e:
+            logger.error(f"Помилка виконання запиту: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати дані інвентарю: {str(e)}")
+
+    def _inventory_filter(self, search_text, category_id, status_id):
+        """
+        Метод для побудови умов WHERE для пошуку та фільтрів інвентарю (представлення inventory_details d).
+
+        :return: Пара (список умов, список параметрів).
+        :rtype: tuple[list[str], list]
+        """
+        conditions = []
+        params = []
+
+        if search_text:
+            pattern = "%" + self.escape_like(search_text) + "%"
+            conditions.append("(d.\"Назва предмету\" ILIKE %s OR d.\"Предметний номер\" ILIKE %s)")
+            params.extend([pattern, pattern])
+
+        if category_id is not None or status_id is not None:
+            item_conditions = ["i.item_id = d.\"ID предмету\""]
+            if category_id is not None:
+                item_conditions.append("i.category_id = %s")
+                params.append(category_id)
+            if status_id is not None:
+                item_conditions.append("i.status_id = %s")
+                params.append(status_id)
+            conditions.append(
+                "EXISTS (SELECT 1 FROM inventory i WHERE " + " AND ".join(item_conditions) + ")"
+            )
+
+        return conditions, params
+
+    @staticmethod
+    def escape_like(text):
+        """
+        Метод для екранування спеціальних символів шаблону LIKE.
+
+        :param text: Текст пошуку.
+        :type text: str
+
+        :return: Текст, у якому символи \\, % та _ сприймаються буквально.
+        :rtype: str
+        """
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def get_popular_items(self, limit=10, date_from=None, date_to=None, category_id=None):
+        """
+        Метод для отримання найпопулярніших предметів за кількістю оренд.
+
+        Без обмеження дат кількість оренд береться зі зведеної таблиці; для періоду
+        оренди рахуються запитом по історії (за датою початку оренди).
+
+        :param limit: Кількість предметів.
+        :type limit: int
+
+        :param date_from: Перший день періоду (None — без обмеження).
+        :type date_from: date, optional
+
+        :param date_to: Останній день періоду (None — без обмеження).
+        :type date_to: date, optional
+
+        :param category_id: ID категорії предметів (None — усі категорії).
+        :type category_id: int, optional
+
+        :return: DataFrame з колонками item_name та usage_count.
+        :rtype: pandas.DataFrame
+
+        :raise: Exception, якщо відбулася помилка отримання даних.
+        """
+        logger.info(f"Запит топ-{limit} найпопулярніших предметів")
+        logger.debug("Період: %s — %s, категорія=%s", date_from, date_to, category_id)
+        params = {"limit": limit, "date_from": date_from, "date_to": date_to, "category_id": category_id}
+        try:
+            if date_from is None and date_to is None:
+                return self.execute_query("""
+                    SELECT inv.item_name, s.rental_count AS usage_count
+                    FROM usage_item_stats s
+                    JOIN inventory inv ON inv.item_id = s.item_id
+                    WHERE s.rental_count > 0
+                      AND (%(category_id)s::INTEGER IS NULL OR inv.category_id = %(category_id)s)
+                    ORDER BY s.rental_count DESC
+                    LIMIT %(limit)s
+                """, params, fetch=True, return_df=True)
+
+            return self.execute_query("""
+                SELECT inv.item_name, COUNT(*) AS usage_count
+                FROM usage_history uh
+                JOIN inventory inv ON inv.item_id = uh.item_id
+                WHERE uh.is_rental = true
+                  AND (%(date_from)s::DATE IS NULL OR uh.start_date >= %(date_from)s)
+                  AND (%(date_to)s::DATE IS NULL OR uh.start_date <= %(date_to)s)
+                  AND (%(category_id)s::INTEGER IS NULL OR inv.category_id = %(category_id)s)
+                GROUP BY inv.item_id, inv.item_name
+                ORDER BY usage_count DESC
+                LIMIT %(limit)s
+            """, params, fetch=True, return_df=True)
+        except Exception as e:
+            logger.error(f"Помилка виконання запиту: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати статистику популярності: {str(e)}")
+
+    def get_most_worn_items(self, limit=10, category_id=None):
+        """
+        Метод для отримання предметів з найменшою цілісністю.
+
+        :param limit: Кількість предметів.
+        :type limit: int
+
+        :param category_id: ID категорії предметів (None — усі категорії).
+        :type category_id: int, optional
+
+        :return: DataFrame з колонками item_name, integrity_percentage та condition_name.
+        :rtype: pandas.DataFrame
+
+        :raise: Exception, якщо відбулася помилка отримання даних.
+        """
+        logger.info(f"Запит топ-{limit} найбільш зношених предметів")
+        try:
+            return self.execute_query("""
+                SELECT inv.item_name, inv.integrity_percentage, cnd.condition_name
+                FROM inventory inv
+                JOIN conditions cnd ON inv.condition_id = cnd.condition_id
+                WHERE %(category_id)s::INTEGER IS NULL OR inv.category_id = %(category_id)s
+                ORDER BY inv.integrity_percentage ASC
+                LIMIT %(limit)s
+            """, {"limit": limit, "category_id": category_id}, fetch=True, return_df=True)
+        except Exception as e:
+            logger.error(f"Помилка виконання запиту: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати статистику зносу: {str(e)}")
+
+    def get_monthly_rental_stats(self):
+        """
+        Метод для отримання кількості оренд та запізнень по місяцях року (зі зведеної таблиці).
+
+        :return: DataFrame з колонками month (1-12), rental_count та late_count.
+        :rtype: pandas.DataFrame
+
+        :raise: Exception, якщо відбулася помилка отримання даних.
+        """
+        logger.info("Запит статистики оренди по місяцях")
+        try:
+            return self.execute_query("""
+                SELECT
+                    EXTRACT(MONTH FROM month_start) AS month,
+                    SUM(rental_count) AS rental_count,
+                    SUM(late_count) AS late_count
+                FROM usage_month_stats
+                GROUP BY month
+                HAVING SUM(rental_count) > 0
+                ORDER BY month
+            """, fetch=True, return_df=True)
+        except Exception as e:
+            logger.error(f"Помилка виконання запиту: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати статистику оренди: {str(e)}")
+
+    def get_rental_series(self, date_from=None, date_to=None, category_id=None, granularity="month"):
+        """
+        Метод для отримання кількості оренд та запізнень за періодами (день, тиждень, місяць, рік).
+
+        Оренди групуються за датою початку через date_trunc на сервері, тому в застосунок
+        надходить лише по одному рядку на період; періоди без оренд між першим та останнім
+        повертаються з нулями. Без категорії та для періоду з цілих місяців кількості
+        по місяцях та роках беруться зі зведеної таблиці usage_month_stats.
+
+        :param date_from: Перший день періоду (None — від першої оренди).
+        :type date_from: date, optional
+
+        :param date_to: Останній день періоду (None — до останньої оренди).
+        :type date_to: date, optional
+
+        :param category_id: ID категорії предметів (None — усі категорії).
+        :type category_id: int, optional
+
+        :param granularity: Крок групування, один з STATS_GRANULARITIES.
+        :type granularity: str
+
+        :return: DataFrame з колонками period_start (перший день періоду), rental_count та late_count.
+        :rtype: pandas.DataFrame
+
+        :raise: ValueError, якщо крок групування невідомий.
+        :raise: Exception, якщо відбулася помилка отримання даних.
+        """
+        if granularity not in STATS_GRANULARITIES:
+            raise ValueError(f"Невідомий крок групування '{granularity}', очікується один з {STATS_GRANULARITIES}")
+
+        logger.info(f"Запит статистики оренди по періодах ({granularity})")
+        logger.debug("Період: %s — %s, категорія=%s", date_from, date_to, category_id)
+        params = {"granularity": granularity, "step": f"1 {granularity}",
+                  "date_from": date_from, "date_to": date_to, "category_id": category_id}
+
+        whole_months = ((date_from is None or date_from.day == 1)
+                        and (date_to is None or (date_to + timedelta(days=1)).day == 1))
+        if category_id is None and granularity in ("month", "year") and whole_months:
+            # Зведена таблиця вже містить кількості по місяцях
+            counts = """
+                SELECT date_trunc(%(granularity)s, month_start)::DATE AS period_start,
+                       SUM(rental_count) AS rental_count,
+                       SUM(late_count) AS late_count
+                FROM usage_month_stats
+                WHERE rental_count > 0
+                  AND (%(date_from)s::DATE IS NULL OR month_start >= %(date_from)s)
+                  AND (%(date_to)s::DATE IS NULL OR month_start <= %(date_to)s)
+                GROUP BY 1
+            """
+        else:
+            counts = """
+                SELECT date_trunc(%(granularity)s, uh.start_date)::DATE AS period_start,
+                       COUNT(*) AS rental_count,
+                       COUNT(*) FILTER (WHERE uh.returned_date > uh.end_date) AS late_count
+                FROM usage_history uh
+                WHERE uh.is_rental = true
+                  AND (%(date_from)s::DATE IS NULL OR uh.start_date >= %(date_from)s)
+                  AND (%(date_to)s::DATE IS NULL OR uh.start_date <= %(date_to)s)
+                  AND (%(category_id)s::INTEGER IS NULL OR uh.item_id IN (
+                      SELECT item_id FROM inventory WHERE category_id = %(category_id)s))
+                GROUP BY 1
+            """
+
+        try:
+            return self.execute_query(f"""
+                WITH counts AS ({counts}),
+                bounds AS (
+                    SELECT date_trunc(%(granularity)s, COALESCE(%(date_from)s::DATE, MIN(period_start)))::DATE AS first_period,
+                           date_trunc(%(granularity)s, COALESCE(%(date_to)s::DATE, MAX(period_start)))::DATE AS last_period
+                    FROM counts
+                )
+                SELECT periods.period_start::DATE AS period_start,
+                       COALESCE(counts.rental_count, 0) AS rental_count,
+                       COALESCE(counts.late_count, 0) AS late_count
+                FROM bounds
+                CROSS JOIN generate_series(bounds.first_period, bounds.last_period, %(step)s::INTERVAL)
+                    AS periods(period_start)
+                LEFT JOIN counts ON counts.period_start = periods.period_start::DATE
+                ORDER BY periods.period_start
+            """, params, fetch=True, return_df=True)
+        except Exception as e:
+            logger.error(f"Помилка виконання запиту: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати статистику оренди: {str(e)}")
+
     def get_rental_history(self):
         """
         Метод для отримання історії оренд інвентарю з бази даних.
@@ -192,13 +1078,398 @@ class DBConnection:
                 "SELECT * FROM rental_items ORDER BY \"Початок оренди\" DESC",
                 fetch=True, return_df=True
             )
-            logger.debug(f"Отримано {len(result)} рядків історії використання")
+            logger.debug("Отримано %s рядків історії використання", len(result))
             return result
         except Exception as e:
             logger.error(f"Помилка виконання запиту: {e}")
             logger.error(f"Деталі:\n{traceback.format_exc()}")
             raise Exception(f"Не вдалося отримати історію оренди: {str(e)}")
 
+    # Допустимі варіанти сортування історії використання
+    HISTORY_SORT_OPTIONS = {
+        "start_date_asc": "uh.start_date ASC",
+        "start_date_desc": "uh.start_date DESC",
+        "end_date_asc": "uh.end_date ASC",
+        "end_date_desc": "uh.end_date DESC",
+        "name_asc": "i.item_name ASC",
+        "name_desc": "i.item_name DESC",
+        "user_asc": "uh.user_name ASC",
+        "user_desc": "uh.user_name DESC",
+    }
+
+    HISTORY_QUERY = """
+        SELECT
+            uh.history_id,
+            i.inventory_number,
+            i.item_name,
+            uh.user_name,
+            uh.start_date,
+            uh.end_date,
+            uh.returned_date,
+            CASE
+                WHEN uh.returned_date IS NULL AND uh.end_date < CURRENT_DATE THEN 'Протерміновано'
+                WHEN uh.returned_date IS NULL THEN 'В оренді'
+                WHEN uh.returned_date > uh.end_date THEN 'Повернено з запізненням'
+                ELSE 'Повернено'
+            END as status,
+            uh.usage_notes
+        FROM usage_history uh
+        LEFT JOIN inventory i ON uh.item_id = i.item_id
+        WHERE uh.is_rental = true
+    """
+
+    def get_usage_history(self, sort_option=None):
+        """
+        Метод для отримання історії використання інвентарю зі статусом кожної оренди.
+
+        :param sort_option: Ключ сортування з HISTORY_SORT_OPTIONS (за замовчуванням — дата початку за спаданням).
+        :type sort_option: str, optional
+
+        :return: DataFrame з історією використання.
+        :rtype: pandas.DataFrame
+
+        :raise: Exception, якщо відбулася помилка отримання даних.
+        """
+        logger.info("Запит на отримання історії використання з сортуванням")
+        order_by = self.HISTORY_SORT_OPTIONS.get(sort_option, "uh.start_date DESC")
+        try:
+            result = self.execute_query(
+                self.HISTORY_QUERY + f" ORDER BY {order_by}",
+                fetch=True, return_df=True
+            )
+            logger.debug("Отримано %s рядків історії використання", len(result))
+            return result
+        except Exception as e:
+            logger.error(f"Помилка виконання запиту: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати історію використання: {str(e)}")
+
+    def stream_usage_history(self, sort_option=None, chunk_size=5000):
+        """
+        Генератор для потокового читання історії використання частинами.
+
+        :param sort_option: Ключ сортування з HISTORY_SORT_OPTIONS (за замовчуванням — дата початку за спаданням).
+        :type sort_option: str, optional
+
+        :param chunk_size: Кількість рядків в одній частині.
+        :type chunk_size: int
+
+        :return: Частини історії з колонками, як у get_usage_history.
+        :rtype: Iterator[pandas.DataFrame]
+
+        :raise: Exception, якщо відбулася помилка отримання даних.
+        """
+        logger.info("Потоковий запит історії використання з сортуванням")
+        order_by = self.HISTORY_SORT_OPTIONS.get(sort_option, "uh.start_date DESC")
+        try:
+            yield from self.stream_query(
+                self.HISTORY_QUERY + f" ORDER BY {order_by}", itersize=chunk_size, return_df=True
+            )
+        except Exception as e:
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати історію використання: {str(e)}")
+
+    # Запити для експорту вкладок: повна вибірка без розбиття на сторінки
+    EXPORT_SOURCES = ("inventory", "rentals", "history")
+
+    def export_query(self, source, search_text=None, category_id=None, status_id=None, sort_option=None,
+                     rental_status=None):
+        """
+        Метод для побудови запиту, що вибирає всі рядки вкладки для експорту.
+
+        Запит враховує ті самі пошук та фільтри, що й вкладка: для інвентарю — пошук, категорію
+        та статус (як у get_inventory_page, але без сторінок), для оренд — лише неповернені
+        оренди, пошук та статус оренди, для історії використання — пошук та сортування.
+
+        :param source: Вкладка: "inventory", "rentals" або "history".
+        :type source: str
+
+        :param search_text: Текст з поля пошуку вкладки.
+        :type search_text: str, optional
+
+        :param category_id: ID категорії для фільтрації (лише інвентар).
+        :type category_id: int, optional
+
+        :param status_id: ID статусу доступності для фільтрації (лише інвентар).
+        :type status_id: int, optional
+
+        :param sort_option: Ключ сортування з HISTORY_SORT_OPTIONS (лише історія).
+        :type sort_option: str, optional
+
+        :param rental_status: Фільтр статусу оренди: "active", "returned" або "overdue" (лише оренди).
+        :type rental_status: str, optional
+
+        :return: Пара (текст запиту, параметри).
+        :rtype: tuple[str, tuple]
+
+        :raise: ValueError, якщо вкладка невідома.
+        """
+        if source == "inventory":
+            conditions, params = self._inventory_filter(search_text, category_id, status_id)
+            query = "SELECT d.* FROM inventory_details d"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            return query + " ORDER BY d.\"ID предмету\"", tuple(params)
+
+        if source == "rentals":
+            # Вкладка оренд показує лише неповернені оренди
+            conditions = ["r.\"Дата повернення\" IS NULL"]
+            params = []
+            if rental_status in self.RENTAL_STATUS_FILTERS:
+                condition, value = self.RENTAL_STATUS_FILTERS[rental_status]
+                conditions.append(condition)
+                params.append(value)
+            if search_text:
+                conditions.append(self._text_search(["r.\"Назва предмету\"", "r.\"Орендар\""]))
+                params.append(search_text.strip().lower())
+            query = "SELECT r.* FROM rental_items r WHERE " + " AND ".join(conditions)
+            return query + " ORDER BY r.\"Початок оренди\" DESC", tuple(params)
+
+        if source == "history":
+            query = self.HISTORY_QUERY
+            params = []
+            if search_text:
+                query += " AND " + self._text_search(["i.item_name", "uh.user_name"])
+                params.append(search_text.strip().lower())
+            order_by = self.HISTORY_SORT_OPTIONS.get(sort_option, "uh.start_date DESC")
+            return query + f" ORDER BY {order_by}", tuple(params)
+
+        raise ValueError(f"Невідома вкладка для експорту: {source}")
+
+    # Умови фільтра статусу вкладки оренд (представлення rental_items r): (умова, параметр)
+    RENTAL_STATUS_FILTERS = {
+        "active": ("r.\"Статус оренди\" = %s", "В оренді"),
+        "returned": ("strpos(r.\"Статус оренди\", %s) > 0", "Повернено"),
+        "overdue": ("r.\"Статус оренди\" = %s", "Протерміновано"),
+    }
+
+    @staticmethod
+    def _text_search(columns):
+        """
+        Метод для побудови умови пошуку, що збігається з пошуком у таблицях вкладок (FilterEngine).
+
+        Вкладка шукає текст (у нижньому регістрі) як підрядок у значеннях колонок, записаних
+        через перенесення рядка, тому умова будує той самий рядок на сервері.
+
+        :param columns: Вирази колонок, у яких шукається текст.
+        :type columns: list[str]
+
+        :return: Умова з одним параметром — текстом пошуку в нижньому регістрі.
+        :rtype: str
+        """
+        haystack = " || E'\\n' || ".join(f"COALESCE({column}::TEXT, '')" for column in columns)
+        return f"strpos(lower({haystack}), %s) > 0"
+
+    def copy_to_csv(self, query, params, file):
+        """
+        Метод для вивантаження результату запиту у файл CSV командою COPY ... TO STDOUT.
+
+        Рядки форматує сервер і надсилає потоком прямо у файл, тому вибірка
+        не перетворюється на об'єкти Python і не зберігається в пам'яті.
+
+        :param query: Запит мовою SQL (лише читання, без крапки з комою в кінці).
+        :type query: str
+
+        :param params: Параметри для підставлення в запит.
+        :type params: tuple, optional
+
+        :param file: Відкритий для запису текстовий файл.
+
+        :return: Кількість вивантажених рядків.
+        :rtype: int
+
+        :raise: Exception, якщо відбулася помилка вивантаження.
+        """
+        short_query = query[:100] + "..." if len(query) > 100 else query
+        logger.info("SQL Query (COPY TO STDOUT): %s", short_query, extra={"query_id": query_id("COPY " + query)})
+        if params:
+            logger.debug("Параметри запиту: %s", params)
+
+        with self.borrow_connection() as connection:
+            start = time.perf_counter()
+            row_count = 0
+            failed = True
+            try:
+                with connection.cursor() as cursor:
+                    # COPY не приймає параметрів, тому вони підставляються на боці клієнта
+                    copy_query = cursor.mogrify(query, params or ()).decode(psycopg2.extensions.encodings[connection.encoding])
+                    cursor.copy_expert(
+                        f"COPY ({copy_query}) TO STDOUT WITH (FORMAT csv, HEADER)", file
+                    )
+                    row_count = cursor.rowcount
+                connection.commit()
+                failed = False
+                logger.info("Вивантажено %d рядків у CSV", row_count,
+                            extra={"query_id": query_id("COPY " + query), "rows": row_count,
+                                   "duration_ms": round((time.perf_counter() - start) * 1000, 3)})
+                return row_count
+            except Exception as e:
+                if not connection.closed:
+                    try:
+                        connection.rollback()
+                    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                        pass
+                logger.error(f"Помилка вивантаження даних: {e}")
+                logger.error(f"Деталі:\n{traceback.format_exc()}")
+                raise Exception(f"Не вдалося вивантажити дані: {str(e)}")
+            finally:
+                # Рядки записуються у файл під час COPY, тому весь час враховується як виконання
+                self.stats.record("COPY " + query, time.perf_counter() - start, rows=max(row_count, 0), failed=failed)
+
+    def get_query_columns(self, query, params=None):
+        """
+        Метод для отримання назв та типів колонок результату запиту без читання рядків.
+
+        :param query: Запит мовою SQL.
+        :type query: str
+
+        :param params: Параметри для підставлення в запит.
+        :type params: tuple, optional
+
+        :return: Список пар (назва колонки, OID типу PostgreSQL).
+        :rtype: list[tuple[str, int]]
+        """
+        with self.borrow_connection() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SELECT * FROM ({query}) AS q LIMIT 0", params or ())
+                    columns = [(desc.name, desc.type_code) for desc in cursor.description]
+                connection.commit()
+                return columns
+            except Exception:
+                if not connection.closed:
+                    connection.rollback()
+                raise
+
+    def get_inventory_rows(self, item_ids, search_text=None, category_id=None, status_id=None):
+        """
+        Метод для отримання рядків інвентарю за їх ID (для оновлення окремих рядків таблиці).
+
+        Якщо задано пошук або фільтри вкладки інвентарю, повертаються лише ті з предметів,
+        що їм відповідають (умови ті самі, що в get_inventory_page).
+
+        :param item_ids: ID предметів.
+        :type item_ids: list[int]
+
+        :param search_text: Текст для пошуку в назві або інвентарному номері.
+        :type search_text: str, optional
+
+        :param category_id: ID категорії для фільтрації.
+        :type category_id: int, optional
+
+        :param status_id: ID статусу доступності для фільтрації.
+        :type status_id: int, optional
+
+        :return: DataFrame з рядками view inventory_details.
+        :rtype: pandas.DataFrame
+
+        :raise: Exception, якщо відбулася помилка отримання даних.
+        """
+        logger.info(f"Запит рядків інвентарю з ID: {list(item_ids)}")
+        conditions, params = self._inventory_filter(search_text, category_id, status_id)
+        conditions.insert(0, "d.\"ID предмету\" = ANY(%s)")
+        params.insert(0, list(item_ids))
+        try:
+            return self.execute_query(
+                "SELECT d.* FROM inventory_details d WHERE " + " AND ".join(conditions),
+                tuple(params), fetch=True, return_df=True, prepared=True
+            )
+        except Exception as e:
+            logger.error(f"Помилка виконання запиту: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати дані інвентарю: {str(e)}")
+
+    def get_rental_rows(self, history_ids):
+        """
+        Метод для отримання рядків оренд за їх ID (для оновлення окремих рядків таблиці).
+
+        :param history_ids: ID записів оренди.
+        :type history_ids: list[int]
+
+        :return: DataFrame з рядками view rental_items.
+        :rtype: pandas.DataFrame
+
+        :raise: Exception, якщо відбулася помилка отримання даних.
+        """
+        logger.info(f"Запит рядків оренд з ID: {list(history_ids)}")
+        try:
+            return self.execute_query(
+                "SELECT * FROM rental_items WHERE \"ID оренди\" = ANY(%s)",
+                (list(history_ids),), fetch=True, return_df=True, prepared=True
+            )
+        except Exception as e:
+            logger.error(f"Помилка виконання запиту: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати дані оренди: {str(e)}")
+
+    def get_usage_history_rows(self, history_ids):
+        """
+        Метод для отримання рядків історії використання за їх ID (для оновлення окремих рядків таблиці).
+
+        :param history_ids: ID записів історії.
+        :type history_ids: list[int]
+
+        :return: DataFrame з колонками, як у get_usage_history.
+        :rtype: pandas.DataFrame
+
+        :raise: Exception, якщо відбулася помилка отримання даних.
+        """
+        logger.info(f"Запит рядків історії використання з ID: {list(history_ids)}")
+        try:
+            return self.execute_query(
+                self.HISTORY_QUERY + " AND uh.history_id = ANY(%s)",
+                (list(history_ids),), fetch=True, return_df=True, prepared=True
+            )
+        except Exception as e:
+            logger.error(f"Помилка виконання запиту: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати історію використання: {str(e)}")
+
+    def get_or_create_category(self, category_name):
+        """
+        Метод для отримання ID категорії за назвою або створення нової категорії.
+
+        :param category_name: Назва категорії.
+        :type category_name: str
+
+        :return: ID категорії або None, якщо створити категорію не вдалося.
+        :rtype: int
+
+        :raise: Exception, якщо відбулася помилка роботи з категоріями.
+        """
+        logger.debug("Обробка категорії: '%s'", category_name)
+
+        try:
+            # Спочатку пробуємо знайти існуючу категорію
+            logger.debug("Пошук існуючої категорії '%s'", category_name)
+            result = self.execute_query(
+                "SELECT category_id FROM categories WHERE category_name = %s",
+                (category_name,), fetch=True, cache_tables=("categories",), cache_ttl=300)
+
+            if result: # Категорія існує
+                category_id = result[0][0]
+                logger.debug("Знайдено існуючу категорію '%s' з ID=%s", category_name, category_id)
+                return category_id
+
+            # Якщо категорії немає - створюємо нову
+            logger.info(f"Створення нової категорії: '{category_name}'")
+            result = self.execute_query(
+                "INSERT INTO categories (category_name) VALUES (%s) RETURNING category_id",
+                (category_name,), fetch=True, invalidates=("categories",))
+
+            if result:
+                category_id = result[0][0]
+                logger.info(f"Створено нову категорію '{category_name}' з ID={category_id}")
+                return category_id
+
+            logger.error(f"Не вдалося створити категорію '{category_name}' - немає результату")
+            return None
+
+        except Exception as e:
+            logger.error(f"Помилка роботи з категоріями для '{category_name}': {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося отримати або створити категорію: {str(e)}")
+
     def add_inventory_item(self, item_data):
         """
         Метод для додавання предметів в інвентар.
@@ -219,7 +1490,7 @@ class DBConnection:
         :raise: Exception, якщо відбулася помилка додавання даних.
         """
         logger.info(f"Додавання нового предмету: {item_data.get('item_name')}")
-        logger.debug(f"Дані предмету: {item_data}")
+        logger.debug("Дані предмету: %s", item_data)
 
         try:
             # Категорія вже повинна бути створена на цей момент
@@ -236,10 +1507,10 @@ class DBConnection:
                 item_data["item_notes"]
             )
 
-            result = self.execute_query(query, params, fetch=True)
+            result = self.execute_query(query, params, fetch=True, invalidates=("inventory",))
             if result:
                 item_id = result[0][0]
-                logger.info(f"Предмет додано успішно з ID: {item_id}")
+                logger.info("Предмет додано успішно з ID: %s", item_id, extra={"item_id": item_id})
                 return item_id # Повертаємо ID нового предмету
             logger.warning("Предмет додано, але ID не отримано")
             return None
@@ -249,6 +1520,102 @@ class DBConnection:
             logger.error(f"Деталі:\n{traceback.format_exc()}")
             raise Exception(f"Не вдалося додати предмет: {str(e)}")
 
+    def bulk_import_inventory(self, rows):
+        """
+        Метод для масового додавання предметів в інвентар.
+
+        Рядки завантажуються командою COPY FROM STDIN у тимчасову таблицю, відсутні
+        категорії створюються одним запитом, після чого всі предмети переносяться в
+        inventory одним INSERT ... SELECT. Все виконується в одній транзакції:
+        у разі помилки не додається жоден предмет.
+
+        :param rows: Перевірені рядки (результат InventoryImport.read_inventory_csv) з полями
+            line, item_name, category_name, status_name, integrity_percentage, purchase_date, item_notes.
+        :type rows: list[dict]
+
+        :return: Словник з ключами item_ids (ID доданих предметів) та created_categories (назви нових категорій).
+        :rtype: dict
+
+        :raise: Exception, якщо виникла помилка імпорту.
+        """
+        logger.info("Масовий імпорт %s предметів", len(rows))
+        started = time.monotonic()
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                row["line"], row["item_name"], row["category_name"], row["status_name"],
+                row["integrity_percentage"], row["purchase_date"].isoformat(), row["item_notes"]
+            ])
+        buffer.seek(0)
+
+        try:
+            with self.borrow_connection() as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute("""
+                            CREATE TEMP TABLE inventory_import (
+                                line INTEGER,
+                                item_name TEXT,
+                                category_name TEXT,
+                                status_name TEXT,
+                                integrity_percentage INTEGER,
+                                purchase_date DATE,
+                                item_notes TEXT
+                            ) ON COMMIT DROP
+                        """)
+                        cursor.copy_expert("COPY inventory_import FROM STDIN WITH (FORMAT csv)", buffer)
+                        logger.debug("Завантажено %s рядків у тимчасову таблицю", cursor.rowcount)
+
+                        cursor.execute("""
+                            INSERT INTO categories (category_name)
+                            SELECT DISTINCT s.category_name
+                            FROM inventory_import s
+                            WHERE NOT EXISTS (
+                                SELECT 1 FROM categories c WHERE c.category_name = s.category_name
+                            )
+                            RETURNING category_name
+                        """)
+                        created_categories = [row[0] for row in cursor.fetchall()]
+
+                        cursor.execute("""
+                            INSERT INTO inventory (
+                                item_name, category_id, status_id,
+                                integrity_percentage, purchase_date, item_notes
+                            )
+                            SELECT s.item_name, c.category_id, st.status_id,
+                                   s.integrity_percentage, s.purchase_date, s.item_notes
+                            FROM inventory_import s
+                            JOIN (
+                                SELECT category_name, MIN(category_id) AS category_id
+                                FROM categories GROUP BY category_name
+                            ) c ON c.category_name = s.category_name
+                            JOIN (
+                                SELECT status_name, MIN(status_id) AS status_id
+                                FROM availability_statues GROUP BY status_name
+                            ) st ON st.status_name = s.status_name
+                            ORDER BY s.line
+                            RETURNING item_id
+                        """)
+                        item_ids = [row[0] for row in cursor.fetchall()]
+                    connection.commit()
+                except Exception:
+                    if not connection.closed:
+                        connection.rollback()
+                    raise
+
+        except Exception as e:
+            logger.error(f"Помилка масового імпорту: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося імпортувати предмети: {str(e)}")
+
+        self.invalidate_cache("inventory", "categories")
+        elapsed = time.monotonic() - started
+        logger.info("Імпортовано %s предметів за %.2f с, створено категорій: %s",
+                    len(item_ids), elapsed, len(created_categories))
+        return {"item_ids": item_ids, "created_categories": created_categories}
+
     def update_inventory_item(self, item_id, item_data):
         """
         Метод для оновлення чинного інвентарю.
@@ -264,8 +1631,8 @@ class DBConnection:
 
         :raise: Exception, якщо відбулася помилка оновлення даних.
         """
-        logger.info(f"Оновлення предмету з ID: {item_id}")
-        logger.debug(f"Нові дані: {item_data}")
+        logger.info("Оновлення предмету з ID: %s", item_id, extra={"item_id": item_id})
+        logger.debug("Нові дані: %s", item_data, extra={"item_id": item_id})
 
         try:
             query = """
@@ -284,8 +1651,8 @@ class DBConnection:
                 item_data["item_notes"], item_id
             )
 
-            result = self.execute_query(query, params)
-            logger.info(f"Предмет з ID {item_id} оновлено успішно")
+            result = self.execute_query(query, params, invalidates=("inventory",))
+            logger.info("Предмет з ID %s оновлено успішно", item_id, extra={"item_id": item_id})
             return result
 
         except Exception as e:
@@ -310,19 +1677,92 @@ class DBConnection:
         try:
             result = self.execute_query(
                 "DELETE FROM inventory WHERE item_id = %s",
-                (item_id,)
+                (item_id,), invalidates=("inventory", "usage_history")
             )
-            logger.info(f"Предмет з ID {item_id} видалено")
+            logger.info("Предмет з ID %s видалено", item_id, extra={"item_id": item_id})
             return result
         except Exception as e:
             logger.error(f"Помилка при видаленні предмету {item_id}: {e}")
             logger.error(f"Деталі:\n{traceback.format_exc()}")
             raise Exception(f"Не вдалося видалити предмет: {str(e)}")
 
+    # Статуси доступності, які змінюються під час оренди та повернення
+    STATUS_AVAILABLE = "Доступний"
+    STATUS_RENTED = "В оренді"
+
+    # Оренда одним запитом: рядок предмета блокується (FOR UPDATE), тому два одночасні
+    # запити на той самий предмет виконуються по черзі, і другий вже не бачить його доступним.
+    # Якщо статусу "В оренді" немає в довіднику, статус предмета не змінюється.
+    RENT_ITEM_QUERY = """
+        WITH item AS (
+            SELECT inv.item_id
+            FROM inventory inv
+            WHERE inv.item_id = %s
+              AND inv.status_id = (SELECT status_id FROM availability_statues WHERE status_name = %s)
+              AND NOT EXISTS (
+                  SELECT 1 FROM usage_history uh
+                  WHERE uh.item_id = inv.item_id AND uh.is_rental = true AND uh.returned_date IS NULL
+              )
+            FOR UPDATE
+        ), rental AS (
+            INSERT INTO usage_history (
+                item_id, user_name, start_date, end_date,
+                returned_date, usage_notes, is_rental
+            )
+            SELECT item.item_id, %s, %s, %s, NULL, %s, true
+            FROM item
+            RETURNING history_id, item_id
+        ), status AS (
+            UPDATE inventory inv SET
+                status_id = COALESCE(
+                    (SELECT status_id FROM availability_statues WHERE status_name = %s),
+                    inv.status_id
+                )
+            FROM rental
+            WHERE inv.item_id = rental.item_id
+        )
+        SELECT history_id FROM rental
+    """
+
+    # Повернення одним запитом: запис оренди блокується, оновлюється разом з цілісністю предмета,
+    # а статус "В оренді" змінюється на "Доступний" (інші статуси, наприклад "На ремонті", зберігаються)
+    RETURN_ITEM_QUERY = """
+        WITH rental AS (
+            SELECT uh.history_id, uh.item_id
+            FROM usage_history uh
+            WHERE uh.history_id = %s AND uh.is_rental = true AND uh.returned_date IS NULL
+            FOR UPDATE
+        ), returned AS (
+            UPDATE usage_history uh SET
+                returned_date = %s,
+                usage_notes = %s
+            FROM rental
+            WHERE uh.history_id = rental.history_id
+            RETURNING uh.item_id
+        ), item AS (
+            UPDATE inventory inv SET
+                integrity_percentage = %s,
+                status_id = CASE
+                    WHEN inv.status_id = (SELECT status_id FROM availability_statues WHERE status_name = %s)
+                    THEN COALESCE(
+                        (SELECT status_id FROM availability_statues WHERE status_name = %s),
+                        inv.status_id
+                    )
+                    ELSE inv.status_id
+                END
+            FROM returned
+            WHERE inv.item_id = returned.item_id
+        )
+        SELECT item_id FROM returned
+    """
+
     def rent_item(self, item_id, user_name, start_date, end_date, notes):
         """
         Метод для оформлення оренди конкретного предмета з інвентарю.
 
+        Запис оренди створюється, а статус предмета змінюється на "В оренді" одним запитом
+        (RENT_ITEM_QUERY) в одній транзакції.
+
         :param item_id: ID предмету для оренди.
         :type item_id: int
 
@@ -341,37 +1781,210 @@ class DBConnection:
         :return: ID новоствореного запису оренди.
         :rtype: int
 
-        :raise: Exception, якщо виникла помилка оформлення оренди.
+        :raise: Exception, якщо предмет недоступний для оренди або виникла помилка оформлення оренди.
         """
-        logger.info(f"Оформлення оренди: предмет {item_id}, орендар {user_name}")
-        logger.debug(f"Дата початку: {start_date}, дата завершення: {end_date}")
+        logger.info("Оформлення оренди: предмет %s, орендар %s", item_id, user_name, extra={"item_id": item_id})
+        logger.debug("Дата початку: %s, дата завершення: %s", start_date, end_date, extra={"item_id": item_id})
 
         try:
-            query = """
-                INSERT INTO usage_history (
-                    item_id, user_name, start_date, end_date,
-                    returned_date, usage_notes, is_rental
-                ) VALUES (%s, %s, %s, %s, NULL, %s, true)
-                RETURNING history_id
-            """
-            params = (item_id, user_name, start_date, end_date, notes)
+            result = self.execute_query(
+                self.RENT_ITEM_QUERY,
+                (item_id, self.STATUS_AVAILABLE, user_name, start_date, end_date, notes, self.STATUS_RENTED),
+                fetch=True, prepared=True, invalidates=("usage_history", "inventory")
+            )
+            if not result:
+                logger.warning(f"Предмет {item_id} недоступний для оренди")
+                raise Exception("Предмет уже орендовано або він недоступний для оренди")
 
-            result = self.execute_query(query, params, fetch=True)
-            if result:
-                history_id = result[0][0] # Повертаємо ID нової оренди
-                logger.info(f"Оренду оформлено з ID: {history_id}")
-                return history_id
-            return None
+            history_id = result[0][0]
+            logger.info("Оренду оформлено з ID: %s", history_id,
+                        extra={"item_id": item_id, "history_id": history_id})
+            return history_id
 
         except Exception as e:
             logger.error(f"Помилка при оформленні оренди: {e}")
             logger.error(f"Деталі:\n{traceback.format_exc()}")
             raise Exception(f"Не вдалося оформити оренду: {str(e)}")
 
+    def rent_items(self, item_ids, user_name, start_date, end_date, notes):
+        """
+        Метод для оформлення оренди кількох предметів одному орендарю (наприклад, для групового походу).
+
+        Рядки всіх предметів блокуються одним запитом, записи оренди додаються одним
+        багаторядковим INSERT, а статуси змінюються одним UPDATE. Все виконується в одній
+        транзакції: якщо хоча б один предмет недоступний, не оформлюється жодна оренда.
+
+        :param item_ids: ID предметів для оренди.
+        :type item_ids: list[int]
+
+        :param user_name: Ім'я орендаря.
+        :type user_name: str
+
+        :param start_date: Дата початку оренди.
+        :type start_date: date
+
+        :param end_date: Дата кінця оренди.
+        :type end_date: date
+
+        :param notes: Нотатки.
+        :type notes: str
+
+        :return: Словник {ID предмета: ID запису оренди}.
+        :rtype: dict
+
+        :raise: Exception, якщо не вибрано жодного предмета, деякі предмети недоступні
+            або виникла помилка оформлення оренди.
+        """
+        item_ids = sorted(set(item_ids))
+        if not item_ids:
+            # execute_values з page_size=0 надіслав би INSERT без жодного рядка VALUES
+            logger.error("Оренду не оформлено: не вибрано жодного предмета")
+            raise Exception("Не вдалося оформити оренду: не вибрано жодного предмета")
+        logger.info(f"Оформлення оренди {len(item_ids)} предметів, орендар {user_name}")
+        logger.debug("Предмети: %s, дата початку: %s, дата завершення: %s", item_ids, start_date, end_date)
+
+        try:
+            with self.borrow_connection() as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        # Рядки блокуються в порядку ID, щоб одночасні групові оренди не блокували одна одну
+                        cursor.execute("""
+                            SELECT inv.item_id
+                            FROM inventory inv
+                            WHERE inv.item_id = ANY(%s)
+                              AND inv.status_id = (SELECT status_id FROM availability_statues WHERE status_name = %s)
+                              AND NOT EXISTS (
+                                  SELECT 1 FROM usage_history uh
+                                  WHERE uh.item_id = inv.item_id AND uh.is_rental = true AND uh.returned_date IS NULL
+                              )
+                            ORDER BY inv.item_id
+                            FOR UPDATE
+                        """, (item_ids, self.STATUS_AVAILABLE))
+                        available = {row[0] for row in cursor.fetchall()}
+                        unavailable = [item_id for item_id in item_ids if item_id not in available]
+                        if unavailable:
+                            raise Exception(f"Предмети недоступні для оренди (ID): {', '.join(map(str, unavailable))}")
+
+                        rentals = execute_values(cursor, """
+                            INSERT INTO usage_history (
+                                item_id, user_name, start_date, end_date,
+                                returned_date, usage_notes, is_rental
+                            ) VALUES %s
+                            RETURNING item_id, history_id
+                        """, [(item_id, user_name, start_date, end_date, notes) for item_id in item_ids],
+                            template="(%s, %s, %s, %s, NULL, %s, true)", page_size=len(item_ids), fetch=True)
+
+                        cursor.execute("""
+                            UPDATE inventory inv SET
+                                status_id = COALESCE(
+                                    (SELECT status_id FROM availability_statues WHERE status_name = %s),
+                                    inv.status_id
+                                )
+                            WHERE inv.item_id = ANY(%s)
+                        """, (self.STATUS_RENTED, item_ids))
+                    connection.commit()
+                except Exception:
+                    if not connection.closed:
+                        connection.rollback()
+                    raise
+
+        except Exception as e:
+            logger.error(f"Помилка при оформленні групової оренди: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося оформити оренду: {str(e)}")
+
+        self.invalidate_cache("usage_history", "inventory")
+        logger.info(f"Оформлено {len(rentals)} оренд")
+        return dict(rentals)
+
+    def return_items(self, returns, returned_date, notes):
+        """
+        Метод для оформлення повернення кількох предметів з оренди.
+
+        Записи оренди блокуються та оновлюються одним запитом, а цілісність та статуси
+        предметів — одним UPDATE за масивами значень. Все виконується в одній транзакції:
+        якщо хоча б одну оренду вже закрито, не фіксується жодне повернення.
+
+        :param returns: Словник {ID запису оренди: цілісність предмета після повернення}.
+        :type returns: dict[int, int]
+
+        :param returned_date: Дата повернення.
+        :type returned_date: date
+
+        :param notes: Нотатки.
+        :type notes: str
+
+        :return: Словник {ID запису оренди: ID повернутого предмета}.
+        :rtype: dict
+
+        :raise: Exception, якщо деякі оренди не знайдено, їх уже закрито або виникла помилка повернення.
+        """
+        history_ids = sorted(returns)
+        logger.info(f"Повернення {len(history_ids)} предметів з оренди")
+        logger.debug("Записи оренди та нова цілісність: %s", returns)
+
+        try:
+            with self.borrow_connection() as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute("""
+                            SELECT uh.history_id, uh.item_id
+                            FROM usage_history uh
+                            WHERE uh.history_id = ANY(%s) AND uh.is_rental = true AND uh.returned_date IS NULL
+                            ORDER BY uh.history_id
+                            FOR UPDATE
+                        """, (history_ids,))
+                        items = dict(cursor.fetchall())
+                        missing = [history_id for history_id in history_ids if history_id not in items]
+                        if missing:
+                            raise Exception(
+                                f"Оренди не знайдено або предмети вже повернено (ID): {', '.join(map(str, missing))}")
+
+                        cursor.execute("""
+                            UPDATE usage_history SET
+                                returned_date = %s,
+                                usage_notes = %s
+                            WHERE history_id = ANY(%s)
+                        """, (returned_date, notes, history_ids))
+
+                        cursor.execute("""
+                            UPDATE inventory inv SET
+                                integrity_percentage = v.integrity_percentage,
+                                status_id = CASE
+                                    WHEN inv.status_id = (SELECT status_id FROM availability_statues WHERE status_name = %s)
+                                    THEN COALESCE(
+                                        (SELECT status_id FROM availability_statues WHERE status_name = %s),
+                                        inv.status_id
+                                    )
+                                    ELSE inv.status_id
+                                END
+                            FROM unnest(%s::integer[], %s::integer[]) AS v(item_id, integrity_percentage)
+                            WHERE inv.item_id = v.item_id
+                        """, (self.STATUS_RENTED, self.STATUS_AVAILABLE,
+                              [items[history_id] for history_id in history_ids],
+                              [returns[history_id] for history_id in history_ids]))
+                    connection.commit()
+                except Exception:
+                    if not connection.closed:
+                        connection.rollback()
+                    raise
+
+        except Exception as e:
+            logger.error(f"Помилка при груповому поверненні: {e}")
+            logger.error(f"Деталі:\n{traceback.format_exc()}")
+            raise Exception(f"Не вдалося зафіксувати повернення: {str(e)}")
+
+        self.invalidate_cache("usage_history", "inventory")
+        logger.info(f"Зафіксовано повернення {len(items)} предметів")
+        return items
+
     def return_item(self, history_id, returned_date, integrity_percentage, notes):
         """
         Метод для оформлення повернення предмета з оренди.
 
+        Запис оренди, цілісність та статус предмета оновлюються одним запитом
+        (RETURN_ITEM_QUERY) в одній транзакції.
+
         :param history_id: ID запису оренди.
         :type history_id: int
 
@@ -384,46 +1997,29 @@ class DBConnection:
         :param notes: Нотатки
         :type notes: str
 
-        :return: True при успішному поверненні предмета з оренди.
-        :rtype: bool
+        :return: ID повернутого предмета (для оновлення рядка інвентарю).
+        :rtype: int
 
-        :raise: Exception, якщо виникла помилка повернення предмета з оренди.
+        :raise: Exception, якщо оренду не знайдено, предмет уже повернено або виникла помилка повернення.
         """
-        logger.info(f"Повернення предмету з оренди ID: {history_id}")
-        logger.debug(f"Новий стан цілісності: {integrity_percentage}%")
+        logger.info("Повернення предмету з оренди ID: %s", history_id, extra={"history_id": history_id})
+        logger.debug("Новий стан цілісності: %s%%", integrity_percentage, extra={"history_id": history_id})
 
         try:
-            # Спочатку отримуємо ID предмету
-            item_query = "SELECT item_id FROM usage_history WHERE history_id = %s"
-            item_result = self.execute_query(item_query, (history_id,), fetch=True)
-            if not item_result:
-                logger.error(f"Не знайдено запис оренди з ID {history_id}")
-                raise Exception("Не знайдено запис оренди")
-
-            item_id = item_result[0][0]
-            logger.debug(f"ID предмету: {item_id}")
-
-            # Оновлюємо запис оренди
-            update_query = """
-                UPDATE usage_history SET
-                    returned_date = %s,
-                    usage_notes = %s
-                WHERE history_id = %s
-            """
-
-            self.execute_query(update_query, (returned_date, notes, history_id))
-            logger.debug("Запис оренди оновлено")
-
-            # Оновлюємо цілісність предмета
-            integrity_query = """
-                UPDATE inventory SET
-                    integrity_percentage = %s
-                WHERE item_id = %s
-            """
-            self.execute_query(integrity_query, (integrity_percentage, item_id))
-            logger.debug("Цілісність предмета оновлено")
-
-            return True
+            result = self.execute_query(
+                self.RETURN_ITEM_QUERY,
+                (history_id, returned_date, notes, integrity_percentage,
+                 self.STATUS_RENTED, self.STATUS_AVAILABLE),
+                fetch=True, prepared=True, invalidates=("usage_history", "inventory")
+            )
+            if not result:
+                logger.error(f"Не знайдено активний запис оренди з ID {history_id}")
+                raise Exception("Не знайдено запис оренди або предмет уже повернено")
+
+            item_id = result[0][0]
+            logger.debug("Запис оренди та предмет %s оновлено", item_id,
+                         extra={"item_id": item_id, "history_id": history_id})
+            return item_id
 
         except Exception as e:
             logger.error(f"Помилка при поверненні предмету: {e}")
@@ -0,0 +1,231 @@
+import logging
+import os
+import traceback
+from decimal import Decimal
+
+logger = logging.getLogger(__name__)
+
+# Формати експорту та розширення файлів
+EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+}
+
+# Кількість рядків в одній групі рядків (row group) файлу Parquet
+PARQUET_CHUNK_SIZE = 50000
+
+# OID типів PostgreSQL та назви відповідних типів Arrow
+PG_ARROW_TYPES = {
+    16: "bool",
+    20: "int64",
+    21: "int16",
+    23: "int32",
+    700: "float32",
+    701: "float64",
+    1700: "float64",
+    1082: "date32",
+    1114: "timestamp",
+    1184: "timestamptz",
+}
+
+
+def export_format(path):
+    """
+    Функція для визначення формату експорту за розширенням файлу.
+
+    :param path: Шлях до файлу.
+    :type path: str
+
+    :return: "csv" або "parquet".
+    :rtype: str
+
+    :raise: ValueError, якщо розширення не підтримується.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Непідтримуваний формат файлу '{extension}' (очікується .csv або .parquet)")
+    return EXPORT_FORMATS[extension]
+
+
+def import_pyarrow():
+    """
+    Функція для імпорту pyarrow, необов'язкової залежності для експорту у Parquet.
+
+    :return: Модулі pyarrow та pyarrow.parquet.
+    :rtype: tuple
+
+    :raise: RuntimeError, якщо pyarrow не встановлено.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Для експорту у Parquet потрібна бібліотека pyarrow (pip install pyarrow)")
+    return pyarrow, pyarrow.parquet
+
+
+def arrow_schema(pa, columns):
+    """
+    Функція для побудови схеми Arrow за типами колонок PostgreSQL.
+
+    Числа NUMERIC записуються як float64, типи без відповідника — як текст.
+
+    :param pa: Модуль pyarrow.
+
+    :param columns: Пари (назва колонки, OID типу), результат DBConnection.get_query_columns.
+    :type columns: list[tuple[str, int]]
+
+    :rtype: pyarrow.Schema
+    """
+    fields = []
+    for name, type_code in columns:
+        arrow_type = PG_ARROW_TYPES.get(type_code)
+        if arrow_type == "timestamp":
+            field_type = pa.timestamp("us")
+        elif arrow_type == "timestamptz":
+            field_type = pa.timestamp("us", tz="UTC")
+        elif arrow_type is not None:
+            field_type = getattr(pa, arrow_type)()
+        else:
+            field_type = pa.string()
+        fields.append(pa.field(name, field_type))
+    return pa.schema(fields)
+
+
+def rows_to_table(pa, schema, rows):
+    """
+    Функція для перетворення частини рядків запиту на таблицю Arrow.
+
+    :param pa: Модуль pyarrow.
+
+    :param schema: Схема файлу.
+    :type schema: pyarrow.Schema
+
+    :param rows: Рядки частини вибірки.
+    :type rows: list[tuple]
+
+    :rtype: pyarrow.Table
+    """
+    arrays = []
+    for position, field in enumerate(schema):
+        values = [row[position] for row in rows]
+        if pa.types.is_floating(field.type):
+            values = [float(value) if isinstance(value, Decimal) else value for value in values]
+        elif pa.types.is_string(field.type):
+            values = [value if value is None or isinstance(value, str) else str(value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def export_csv(db, query, params, path):
+    """
+    Функція для експорту результату запиту у файл CSV (UTF-8 з BOM, щоб Excel правильно показував кирилицю).
+
+    :param db: Об'єкт підключення до бази даних.
+    :type db: DBConnection
+
+    :param query: Запит мовою SQL.
+    :type query: str
+
+    :param params: Параметри запиту.
+    :type params: tuple
+
+    :param path: Шлях до файлу.
+    :type path: str
+
+    :return: Кількість експортованих рядків.
+    :rtype: int
+    """
+    with open(path, "w", newline="", encoding="utf-8-sig") as file:
+        return db.copy_to_csv(query, params, file)
+
+
+def export_parquet(db, query, params, path, chunk_size=PARQUET_CHUNK_SIZE, progress=None):
+    """
+    Функція для експорту результату запиту у файл Parquet.
+
+    Рядки читаються серверним курсором по chunk_size і кожна частина одразу
+    записується окремою групою рядків, тому в пам'яті перебуває лише одна частина.
+
+    :param db: Об'єкт підключення до бази даних.
+    :type db: DBConnection
+
+    :param query: Запит мовою SQL.
+    :type query: str
+
+    :param params: Параметри запиту.
+    :type params: tuple
+
+    :param path: Шлях до файлу.
+    :type path: str
+
+    :param chunk_size: Кількість рядків в одній частині.
+    :type chunk_size: int
+
+    :param progress: Функція, що отримує кількість уже записаних рядків.
+    :type progress: callable, optional
+
+    :return: Кількість експортованих рядків.
+    :rtype: int
+
+    :raise: RuntimeError, якщо pyarrow не встановлено.
+    """
+    pa, pq = import_pyarrow()
+    schema = arrow_schema(pa, db.get_query_columns(query, params))
+
+    total = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for rows in db.stream_query(query, params, itersize=chunk_size):
+            writer.write_table(rows_to_table(pa, schema, rows))
+            total += len(rows)
+            if progress is not None:
+                progress(total)
+    return total
+
+
+def export_query(db, query, params, path, progress=None):
+    """
+    Функція для експорту результату запиту у файл CSV або Parquet (за розширенням).
+
+    Дані записуються в тимчасовий файл поруч, який після успішного завершення
+    замінює цільовий, тому перерваний експорт не залишає частково записаного файлу.
+
+    :param db: Об'єкт підключення до бази даних.
+    :type db: DBConnection
+
+    :param query: Запит мовою SQL.
+    :type query: str
+
+    :param params: Параметри запиту.
+    :type params: tuple
+
+    :param path: Шлях до файлу (.csv або .parquet).
+    :type path: str
+
+    :param progress: Функція, що отримує кількість уже записаних рядків (лише Parquet).
+    :type progress: callable, optional
+
+    :return: Кількість експортованих рядків.
+    :rtype: int
+
+    :raise: Exception, якщо відбулася помилка експорту.
+    """
+    file_format = export_format(path)
+    logger.info(f"Експорт даних у файл {path} (формат {file_format})")
+
+    partial_path = path + ".part"
+    try:
+        if file_format == "csv":
+            total = export_csv(db, query, params, partial_path)
+        else:
+            total = export_parquet(db, query, params, partial_path, progress=progress)
+        os.replace(partial_path, path)
+    except Exception as e:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        logger.error(f"Помилка експорту у файл {path}: {e}")
+        logger.error(f"Деталі:\n{traceback.format_exc()}")
+        raise Exception(f"Не вдалося експортувати дані: {str(e)}")
+
+    logger.info(f"Експортовано {total} рядків у файл {path}")
+    return total
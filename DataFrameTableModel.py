@@ -0,0 +1,308 @@
+import logging
+
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+logger = logging.getLogger(__name__)
+
+def is_missing(value):
+    """
+    Функція для перевірки, чи є значення клітинки порожнім (None, NaN, NaT або pandas.NA).
+
+    Працює без імпорту pandas, тому модель можна створити до завантаження перших даних.
+
+    :param value: Значення клітинки.
+
+    :rtype: bool
+    """
+    if value is None:
+        return True
+    try:
+        # NaN та NaT не дорівнюють самі собі
+        return bool(value != value)
+    except TypeError:
+        # pandas.NA не можна перетворити на bool
+        return True
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """
+    Клас, що відповідає за модель таблиці, побудовану над масивами колонок DataFrame.
+
+    Модель не створює окремих елементів для кожної клітинки: текст та колір
+    обчислюються в методі data() лише для рядків, які таблиця відображає на екрані.
+
+    Attributes:
+        columns: Назви колонок DataFrame, які відображаються в таблиці
+        headers: Заголовки колонок таблиці
+        background: Функція (model, row, column) -> QColor або None, що визначає колір клітинки
+    """
+    def __init__(self, columns, headers, background=None, parent=None):
+        """
+        Метод для ініціалізації порожньої моделі таблиці.
+
+        :param columns: Назви колонок DataFrame у порядку відображення.
+        :type columns: list[str]
+
+        :param headers: Заголовки колонок таблиці.
+        :type headers: list[str]
+
+        :param background: Функція для обчислення кольору клітинки (отримує номер рядка таблиці).
+        :type background: callable, optional
+
+        :param parent: Батьківський об'єкт.
+        """
+        super().__init__(parent)
+        self.columns = list(columns)
+        self.headers = list(headers)
+        self.background = background
+
+        self._data = [np.empty(0, dtype=object) for _ in self.columns]
+        self._row_count = 0
+        # Індекси рядків джерела, що відображаються (None — всі рядки)
+        self._rows = None
+
+    def set_dataframe(self, df):
+        """
+        Метод для заміни даних моделі вмістом DataFrame.
+
+        Зберігаються лише масиви потрібних колонок, без копіювання у проміжні структури.
+
+        :param df: DataFrame з результатами запиту.
+        :type df: pandas.DataFrame
+        """
+        self.beginResetModel()
+        self._data = [df[column].to_numpy() for column in self.columns]
+        self._row_count = len(df)
+        self._rows = None
+        self.endResetModel()
+        logger.debug(f"Модель таблиці оновлено: {self._row_count} рядків")
+
+    def upsert_rows(self, df, key, append=True):
+        """
+        Метод для оновлення окремих рядків за ключем без перебудови всієї таблиці.
+
+        Рядки з наявним ключем оновлюються на місці, нові — додаються в кінець таблиці.
+
+        :param df: DataFrame зі зміненими рядками.
+        :type df: pandas.DataFrame
+
+        :param key: Назва ключової колонки.
+        :type key: str
+
+        :param append: Чи додавати рядки, ключів яких ще немає в моделі.
+        :type append: bool
+
+        :return: Номери рядків джерела для оновлених та доданих рядків df.
+        :rtype: list[int]
+        """
+        keys = self._data[self.columns.index(key)]
+        changed = df[key].to_numpy()
+        # Позиції шукаються лише для змінених ключів, без словника для всієї таблиці
+        matches = np.flatnonzero(np.isin(keys, changed))
+        positions = dict(zip(keys[matches].tolist(), matches.tolist()))
+
+        source_rows = []
+        new_rows = []
+        for df_row, row_key in enumerate(changed.tolist()):
+            source = positions.get(row_key)
+            if source is None:
+                if not append:
+                    continue
+                new_rows.append(df_row)
+                source_rows.append(self._row_count + len(new_rows) - 1)
+                continue
+            for col, column in enumerate(self.columns):
+                self._set_cell(col, source, df[column].iat[df_row])
+            source_rows.append(source)
+            self._emit_row_changed(source)
+
+        if new_rows:
+            self.append_dataframe(df.iloc[new_rows])
+
+        logger.debug("Оновлено %d та додано %d рядків моделі", len(source_rows) - len(new_rows), len(new_rows))
+        return source_rows
+
+    def append_dataframe(self, df):
+        """
+        Метод для додавання рядків DataFrame в кінець таблиці (наприклад, чергової частини потокового завантаження).
+
+        :param df: DataFrame з новими рядками.
+        :type df: pandas.DataFrame
+        """
+        if len(df) == 0:
+            return
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(df) - 1)
+        self._data = [
+            np.concatenate([array, df[column].to_numpy()])
+            for array, column in zip(self._data, self.columns)
+        ]
+        added = np.arange(self._row_count, self._row_count + len(df), dtype=np.intp)
+        self._row_count += len(df)
+        if self._rows is not None:
+            self._rows = np.concatenate([self._rows, added])
+        self.endInsertRows()
+
+    def remove_rows(self, key, keys):
+        """
+        Метод для видалення рядків за значеннями ключа.
+
+        :param key: Назва ключової колонки.
+        :type key: str
+
+        :param keys: Значення ключа рядків, що видаляються.
+        :type keys: list
+
+        :return: Номери видалених рядків джерела.
+        :rtype: numpy.ndarray
+        """
+        keep = ~np.isin(self.column_array(key), list(keys))
+        removed = np.flatnonzero(~keep)
+        if len(removed) == 0:
+            return removed
+
+        self.beginResetModel()
+        self._data = [array[keep] for array in self._data]
+        self._row_count = int(keep.sum())
+        if self._rows is not None:
+            # Зсуваємо індекси рядків, що залишилися, на кількість видалених перед ними
+            new_index = np.cumsum(keep) - 1
+            self._rows = new_index[self._rows[keep[self._rows]]]
+        self.endResetModel()
+
+        logger.debug(f"Видалено {len(removed)} рядків моделі")
+        return removed
+
+    def _set_cell(self, col, source, value):
+        """
+        Метод для запису значення в клітинку масиву колонки.
+
+        Якщо масив доступний лише для читання або має несумісний тип, він замінюється копією.
+        """
+        array = self._data[col]
+        if array.dtype != object and not np.can_cast(np.asarray(value).dtype, array.dtype, casting="same_kind"):
+            # Наприклад, NULL або дробове число в цілочисельній колонці
+            array = self._data[col] = array.astype(object)
+        elif not array.flags.writeable:
+            array = self._data[col] = array.copy()
+        try:
+            array[source] = value
+        except (TypeError, ValueError):
+            array = self._data[col] = array.astype(object)
+            array[source] = value
+
+    def _emit_row_changed(self, source):
+        """
+        Метод для сповіщення таблиці про зміну рядка джерела, якщо він відображається.
+        """
+        if self._rows is None:
+            row = source
+        else:
+            matches = np.flatnonzero(self._rows == source)
+            if len(matches) == 0:
+                return
+            row = int(matches[0])
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+
+    def set_visible_rows(self, rows):
+        """
+        Метод для відображення лише частини рядків (результату фільтрації).
+
+        :param rows: Індекси рядків джерела або None для відображення всіх рядків.
+        :type rows: numpy.ndarray, optional
+        """
+        self.beginResetModel()
+        self._rows = None if rows is None else np.asarray(rows, dtype=np.intp)
+        self.endResetModel()
+
+    def source_row_count(self):
+        """
+        Метод для отримання кількості рядків джерела без урахування фільтрації.
+
+        :rtype: int
+        """
+        return self._row_count
+
+    def source_row(self, row):
+        """
+        Метод для перетворення номера рядка таблиці у номер рядка джерела.
+
+        :param row: Номер рядка таблиці.
+        :type row: int
+
+        :rtype: int
+        """
+        return row if self._rows is None else int(self._rows[row])
+
+    def column_array(self, column):
+        """
+        Метод для отримання масиву значень колонки.
+
+        :param column: Назва колонки DataFrame.
+        :type column: str
+
+        :return: Масив значень колонки.
+        :rtype: numpy.ndarray
+        """
+        return self._data[self.columns.index(column)]
+
+    def value(self, row, column):
+        """
+        Метод для отримання сирого значення клітинки.
+
+        :param row: Номер рядка таблиці.
+        :type row: int
+
+        :param column: Назва колонки DataFrame.
+        :type column: str
+
+        :return: Значення клітинки.
+        """
+        return self.column_array(column)[self.source_row(row)]
+
+    def rowCount(self, parent=QModelIndex()):
+        """Кількість рядків моделі"""
+        if parent.isValid():
+            return 0
+        return self._row_count if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        """Кількість колонок моделі"""
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """
+        Метод для отримання даних клітинки для відображення.
+
+        :param index: Індекс клітинки.
+        :type index: QModelIndex
+
+        :param role: Роль даних (текст, колір фону тощо).
+
+        :return: Текст клітинки, колір фону або None.
+        """
+        if not index.isValid():
+            return None
+
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self._data[col][self.source_row(row)]
+            return "" if is_missing(value) else str(value)
+
+        if role == Qt.ItemDataRole.BackgroundRole and self.background is not None:
+            return self.background(self, row, col)
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        """
+        Метод для отримання заголовків колонок та номерів рядків.
+        """
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
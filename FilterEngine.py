@@ -0,0 +1,178 @@
+import logging
+
+import numpy as np
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+class FilterEngine(QObject):
+    """
+    Клас, що відповідає за відкладену фільтрацію таблиць за текстом пошуку.
+
+    Натискання клавіш об'єднуються таймером: прохід фільтрації починається лише після
+    паузи у введенні. Прохід виконується частинами в циклі подій Qt, тому нове введення
+    скасовує прохід, що ще не завершився. Якщо новий запит містить попередній
+    (користувач дописав символи), перевіряються лише рядки попереднього результату.
+
+    Без набору рядків для пошуку (haystack) двигун лише відкладає запит і сповіщає про
+    нього сигналом triggered — так працює серверна фільтрація інвентарю.
+
+    Attributes:
+        triggered: Сигнал з текстом запиту, що надсилається після паузи у введенні
+        filtered: Сигнал з масивом індексів рядків, що відповідають запиту
+    """
+    triggered = pyqtSignal(str)
+    filtered = pyqtSignal(object)
+
+    def __init__(self, delay_ms=250, chunk_size=5000, parent=None):
+        """
+        Метод для ініціалізації двигуна фільтрації.
+
+        :param delay_ms: Пауза у введенні (у мілісекундах), після якої починається фільтрація.
+        :type delay_ms: int
+
+        :param chunk_size: Кількість рядків, що перевіряються за одну ітерацію циклу подій.
+        :type chunk_size: int
+
+        :param parent: Батьківський об'єкт.
+        """
+        super().__init__(parent)
+        self.chunk_size = chunk_size
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start_pass)
+
+        self._haystack = None
+        self._mask = None
+        self._text = ""
+        self._generation = 0
+
+        # Результат останнього завершеного проходу для звуження пошуку
+        self._last_text = None
+        self._last_result = None
+
+    def set_haystack(self, haystack):
+        """
+        Метод для встановлення рядків, серед яких виконується пошук.
+
+        :param haystack: Текст кожного рядка таблиці в нижньому регістрі.
+        :type haystack: list[str]
+        """
+        self._haystack = haystack
+        self._reset_cache()
+
+    def set_mask(self, mask):
+        """
+        Метод для встановлення додаткового фільтра (наприклад, за статусом).
+
+        :param mask: Булевий масив рядків, що проходять фільтр, або None.
+        :type mask: numpy.ndarray, optional
+        """
+        self._mask = mask
+        self._reset_cache()
+
+    def schedule(self, text):
+        """
+        Метод для відкладеного запуску фільтрації після паузи у введенні.
+
+        Прохід, що вже виконується, скасовується.
+
+        :param text: Текст пошуку.
+        :type text: str
+        """
+        self._text = text.strip().lower()
+        self._generation += 1
+        self._timer.start()
+
+    def run_now(self, text=None):
+        """
+        Метод для негайного запуску фільтрації (наприклад, після завантаження даних).
+
+        :param text: Текст пошуку (None — використовується останній введений текст).
+        :type text: str, optional
+        """
+        if text is not None:
+            self._text = text.strip().lower()
+        self._timer.stop()
+        self._start_pass()
+
+    def cancel(self):
+        """
+        Метод для скасування запланованого або поточного проходу фільтрації.
+        """
+        self._timer.stop()
+        self._generation += 1
+
+    def _reset_cache(self):
+        """
+        Метод для скидання результату попереднього проходу та скасування поточного.
+        """
+        self._generation += 1
+        self._last_text = None
+        self._last_result = None
+
+    def _start_pass(self):
+        """
+        Метод для початку нового проходу фільтрації.
+        """
+        text = self._text
+        self.triggered.emit(text)
+        if self._haystack is None:
+            return
+
+        self._generation += 1
+        generation = self._generation
+
+        if self._last_result is not None and self._last_text in text:
+            # Запит лише подовжився — результат є підмножиною попереднього
+            candidates = self._last_result
+        elif self._mask is not None:
+            candidates = np.flatnonzero(self._mask)
+        else:
+            candidates = np.arange(len(self._haystack))
+
+        if not text:
+            self._finish(text, candidates)
+            return
+
+        self._continue_pass(generation, text, candidates, 0, [])
+
+    def _continue_pass(self, generation, text, candidates, position, matches):
+        """
+        Метод для обробки чергової частини рядків проходу фільтрації.
+
+        :param generation: Номер проходу; якщо він застарів, прохід припиняється.
+        :param text: Текст пошуку.
+        :param candidates: Індекси рядків, що перевіряються.
+        :param position: Позиція початку частини в масиві candidates.
+        :param matches: Накопичені масиви індексів, що відповідають запиту.
+        """
+        if generation != self._generation:
+            return
+
+        chunk = candidates[position:position + self.chunk_size]
+        haystack = self._haystack
+        matches.append(chunk[np.fromiter(
+            (text in haystack[i] for i in chunk), dtype=bool, count=len(chunk)
+        )])
+
+        position += self.chunk_size
+        if position < len(candidates):
+            QTimer.singleShot(0, lambda: self._continue_pass(generation, text, candidates, position, matches))
+            return
+
+        self._finish(text, np.concatenate(matches))
+
+    def _finish(self, text, result):
+        """
+        Метод для завершення проходу: збереження результату та надсилання сигналу.
+
+        :param text: Текст пошуку.
+        :param result: Індекси рядків, що відповідають запиту.
+        """
+        self._last_text = text
+        self._last_result = result
+        logger.debug("Фільтрація '%s': знайдено %d з %d рядків", text, len(result), len(self._haystack))
+        self.filtered.emit(result)
@@ -1,24 +1,142 @@
-import sys
 import logging
-import traceback
+import os
 
-import pandas as pd
+import numpy as np
 from PyQt6.QtGui import QColor, QAction
 from PyQt6.QtCore import Qt, QDate, QTimer
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,QPushButton,
-    QTableWidget, QTableWidgetItem, QLineEdit, QComboBox, QTabWidget,
-    QStatusBar, QMessageBox, QHeaderView, QDialog
+    QTableView, QLineEdit, QComboBox, QTabWidget,
+    QStatusBar, QMessageBox, QHeaderView, QDialog, QLabel, QFileDialog
 )
 
+from ChangeFeed import ChangeFeed
+from DataExport import export_query
+from BatchReturnForm import BatchReturnForm
+from DataFrameTableModel import DataFrameTableModel, is_missing
 from DBConnection import DBConnection
+from FilterEngine import FilterEngine
+from QueryExecutor import QueryExecutor
+from InventoryImport import read_inventory_csv
 from InventoryItemForm import InventoryItemForm
+from LazyImport import lazy_import
+from Migrations import apply_migrations
+from QueryCache import QueryCache
+from QueryStatsDialog import QueryStatsDialog
 from RentalForm import RentalForm
 from ReturnForm import ReturnForm
 from StatsWindow import StatsWindow
 
+# pandas імпортується разом з першими даними у фоновому потоці, а не під час запуску
+pd = lazy_import("pandas")
+
 logger = logging.getLogger(__name__)
 
+INVENTORY_PAGE_SIZE = 100
+
+# Файл, у який під час закриття застосунку зберігається статистика запитів
+QUERY_STATS_PATH = os.path.join("logs", "query_stats.json")
+
+CRITICAL_COLOR = QColor(255, 200, 200)  # Світло-червоний
+LATE_COLOR = QColor(255, 220, 150)  # Світло-оранжевий
+RETURNED_COLOR = QColor(200, 255, 200)  # Світло-зелений
+
+HISTORY_STATUS_COLORS = {
+    'Протерміновано': CRITICAL_COLOR,
+    'Повернено з запізненням': LATE_COLOR,
+    'Повернено': RETURNED_COLOR,
+}
+
+
+def inventory_background(model, row, col):
+    """
+    Функція для підсвітки клітинки цілісності предметів з критичним станом (менше 20%).
+
+    :param model: Модель таблиці інвентарю.
+    :type model: DataFrameTableModel
+
+    :param row: Номер рядка таблиці.
+    :type row: int
+
+    :param col: Номер колонки таблиці.
+    :type col: int
+
+    :return: Колір фону клітинки або None.
+    """
+    if model.columns[col] != "Цілісність (%)":
+        return None
+    value = model.value(row, "Цілісність (%)")
+    if not is_missing(value) and int(value) < 20:
+        return CRITICAL_COLOR
+    return None
+
+
+def history_background(model, row, col):
+    """
+    Функція для підсвітки клітинки статусу в таблиці історії використання.
+
+    :param model: Модель таблиці історії.
+    :type model: DataFrameTableModel
+
+    :param row: Номер рядка таблиці.
+    :type row: int
+
+    :param col: Номер колонки таблиці.
+    :type col: int
+
+    :return: Колір фону клітинки або None.
+    """
+    if model.columns[col] != "status":
+        return None
+    return HISTORY_STATUS_COLORS.get(model.value(row, "status"))
+
+
+def rental_background(model, row, col):
+    """
+    Функція для підсвітки всього рядка протермінованої оренди.
+
+    :param model: Модель таблиці оренд.
+    :type model: DataFrameTableModel
+
+    :param row: Номер рядка таблиці.
+    :type row: int
+
+    :param col: Номер колонки таблиці.
+    :type col: int
+
+    :return: Колір фону клітинки або None.
+    """
+    if model.value(row, "Статус оренди") == 'Протерміновано':
+        return CRITICAL_COLOR
+    return None
+
+
+def current_row(table):
+    """
+    Функція для отримання номера вибраного рядка таблиці.
+
+    :param table: Таблиця.
+    :type table: QTableView
+
+    :return: Номер рядка або -1, якщо нічого не вибрано.
+    :rtype: int
+    """
+    index = table.currentIndex()
+    return index.row() if index.isValid() else -1
+
+
+def selected_rows(table):
+    """
+    Функція для отримання номерів усіх вибраних рядків таблиці.
+
+    :param table: Таблиця.
+    :type table: QTableView
+
+    :return: Відсортовані номери рядків.
+    :rtype: list[int]
+    """
+    return sorted(index.row() for index in table.selectionModel().selectedRows())
+
 class InventoryApp(QMainWindow):
     """
     Головний клас додатку. В собі має головний інтерфейс користувача з чотирма вкладками.
@@ -33,14 +151,44 @@ class InventoryApp(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
         logger.info("Ініціалізація головного вікна додатку")
 
+        # Курсори сторінок інвентарю: ID останнього предмета попередньої сторінки для кожної відкритої сторінки
+        self.inventory_page_cursors = [None]
+
+        # ID змінених записів, рядки яких ще не оновлено в таблицях
+        self.pending_item_ids = set()
+        self.pending_history_ids = set()
+
+        # Виконання запитів у фонових потоках
+        self.executor = QueryExecutor(self)
+        self.executor.started.connect(self.on_load_started)
+        self.executor.idle.connect(self.on_load_finished)
+
+        # Відкладена фільтрація для полів пошуку
+        self.inventory_filter = FilterEngine(parent=self)
+        self.inventory_filter.triggered.connect(self.filter_inventory)
+        self.history_filter = FilterEngine(parent=self)
+        self.history_filter.filtered.connect(self.show_history_rows)
+        self.rental_filter = FilterEngine(parent=self)
+        self.rental_filter.filtered.connect(self.show_rental_rows)
+
         # Підключення до бази даних
         logger.debug("Спроба підключення до бази даних")
-        self.db = DBConnection()
-        if not self.db.connect():
+        # Довідники (категорії, статуси) кешуються, зміни через DBConnection очищають кеш
+        self.db = DBConnection(min_connections=1, max_connections=5, cache=QueryCache())
+        if self.db.connect():
+            logger.info("Підключення до бази даних успішне")
+        else:
+            # Пул спробує перепідключитися при наступному запиті, тому застосунок не завершується
             logger.error("Не вдалося підключитися до бази даних")
-            QMessageBox.critical(self, "Помилка", "Не вдалося підключитися до бази даних")
-            sys.exit(1)
-        logger.info("Підключення до бази даних успішне")
+            QMessageBox.warning(
+                self, "Помилка",
+                "Не вдалося підключитися до бази даних.\n"
+                "Підключення буде повторено автоматично під час наступного оновлення даних."
+            )
+
+        # Зміни, зроблені іншими клієнтами
+        self.change_feed = ChangeFeed(self.db, parent=self)
+        self.change_feed.changed.connect(self.apply_remote_changes)
 
         # Головний віджет
         self.main_widget = QWidget()
@@ -54,13 +202,12 @@ class InventoryApp(QMainWindow):
         logger.debug("Ініціалізація UI")
         self.init_ui()
 
-        # Завантаження початкових даних
-        logger.debug("Завантаження початкових даних")
-        self.load_initial_data()
-
         # Застосування стилів
         self.apply_styles()
 
+        # Міграції схеми застосовуються у фоновому потоці, після них завантажуються початкові дані
+        self.migrate_schema()
+
         logger.info("Головне вікно успішно ініціалізовано")
 
     def init_ui(self):
@@ -102,6 +249,29 @@ class InventoryApp(QMainWindow):
         self.tabs.addTab(self.stats_tab, "Статистика")
         logger.debug("Вкладку 'Статистика' створено")
 
+        # Вкладки, заголовок яких показує стан фонового завантаження
+        self.loading_tabs = {
+            "inventory": self.inventory_tab,
+            "history": self.history_tab,
+            "rentals": self.rental_tab,
+        }
+        self.tab_titles = {key: self.tabs.tabText(self.tabs.indexOf(tab)) for key, tab in self.loading_tabs.items()}
+
+        # Вкладки завантажуються під час першого відкриття
+        self.tab_loaders = {
+            "inventory": self.load_inventory_tab,
+            "history": self.load_history_data,
+            "rentals": self.load_rental_data,
+        }
+        self.loaded_tabs = set()
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+
+        # Меню з діагностикою
+        service_menu = self.menuBar().addMenu("Сервіс")
+        query_stats_action = QAction("Статистика запитів…", self)
+        query_stats_action.triggered.connect(self.show_query_stats)
+        service_menu.addAction(query_stats_action)
+
         # Статус бар
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
@@ -127,35 +297,67 @@ class InventoryApp(QMainWindow):
         self.search_input.setAccessibleName("Поле пошуку інвентарю")
         self.search_input.setAccessibleDescription(
             "Введіть текст для пошуку предметів за назвою або інвентарним номером")
-        self.search_input.textChanged.connect(self.filter_inventory)
+        self.search_input.textChanged.connect(self.inventory_filter.schedule)
         search_layout.addWidget(self.search_input)
 
         self.category_filter = QComboBox()
         self.category_filter.setAccessibleName("Фільтр категорій")
         self.category_filter.setAccessibleDescription("Виберіть категорію для фільтрації інвентарю")
         self.category_filter.addItem("Всі категорії", None)
+        self.category_filter.currentIndexChanged.connect(self.filter_inventory)
         search_layout.addWidget(self.category_filter)
 
         self.status_filter = QComboBox()
         self.status_filter.setAccessibleName("Фільтр статусів")
         self.status_filter.setAccessibleDescription("Виберіть статус доступності для фільтрації інвентарю")
         self.status_filter.addItem("Всі статуси", None)
+        self.status_filter.currentIndexChanged.connect(self.filter_inventory)
         search_layout.addWidget(self.status_filter)
 
         layout.addWidget(search_panel)
         logger.debug("Панель пошуку предметів створено")
 
         # Таблиця інвентарю
-        self.inventory_table = QTableWidget()
-        self.inventory_table.setColumnCount(8)
-        self.inventory_table.setHorizontalHeaderLabels([
-            "ID", "Номер", "Назва", "Категорія", "Статус", "Стан", "Цілісність (%)", "Примітки"
-        ])
+        self.inventory_model = DataFrameTableModel(
+            [
+                "ID предмету", "Предметний номер", "Назва предмету",
+                "Категорія", "Статус доступності", "Стан предмету",
+                "Цілісність (%)", "Примітки"
+            ],
+            ["ID", "Номер", "Назва", "Категорія", "Статус", "Стан", "Цілісність (%)", "Примітки"],
+            background=inventory_background, parent=self
+        )
+        self.inventory_table = QTableView()
+        self.inventory_table.setModel(self.inventory_model)
+        self.inventory_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.inventory_table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
         self.inventory_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.inventory_table.doubleClicked.connect(self.edit_inventory_item)
         layout.addWidget(self.inventory_table)
         logger.debug("Таблицю інвентарю створено")
 
+        # Панель навігації сторінками
+        page_panel = QWidget()
+        page_layout = QHBoxLayout()
+        page_panel.setLayout(page_layout)
+
+        self.prev_page_button = QPushButton("◀ Попередня")
+        self.prev_page_button.setAccessibleName("Попередня сторінка інвентарю")
+        self.prev_page_button.clicked.connect(self.prev_inventory_page)
+        page_layout.addWidget(self.prev_page_button)
+
+        self.page_label = QLabel()
+        self.page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        page_layout.addWidget(self.page_label)
+
+        self.next_page_button = QPushButton("Наступна ▶")
+        self.next_page_button.setAccessibleName("Наступна сторінка інвентарю")
+        self.next_page_button.clicked.connect(self.next_inventory_page)
+        page_layout.addWidget(self.next_page_button)
+
+        layout.addWidget(page_panel)
+        logger.debug("Панель навігації сторінками створено")
+
         # Панель кнопок
         button_panel = QWidget()
         button_layout = QHBoxLayout()
@@ -177,6 +379,16 @@ class InventoryApp(QMainWindow):
         self.rent_button.clicked.connect(self.rent_item)
         button_layout.addWidget(self.rent_button)
 
+        self.import_button = QPushButton("Імпорт CSV")
+        self.import_button.setAccessibleName("Імпорт предметів з файлу CSV")
+        self.import_button.clicked.connect(self.import_inventory)
+        button_layout.addWidget(self.import_button)
+
+        self.export_inventory_button = QPushButton("Експорт")
+        self.export_inventory_button.setAccessibleName("Експорт інвентарю у файл CSV або Parquet")
+        self.export_inventory_button.clicked.connect(lambda: self.export_tab("inventory"))
+        button_layout.addWidget(self.export_inventory_button)
+
         self.refresh_button = QPushButton("Оновити")
         self.refresh_button.clicked.connect(self.load_inventory_data)
         button_layout.addWidget(self.refresh_button)
@@ -201,7 +413,7 @@ class InventoryApp(QMainWindow):
         # Поле пошуку
         self.history_search = QLineEdit()
         self.history_search.setPlaceholderText("Пошук за користувачем або предметом...")
-        self.history_search.textChanged.connect(self.filter_history)
+        self.history_search.textChanged.connect(self.history_filter.schedule)
         search_layout.addWidget(self.history_search)
 
         # Комбобокс для сортування
@@ -222,12 +434,20 @@ class InventoryApp(QMainWindow):
         logger.debug("Панель пошуку історії використання створено")
 
         # Таблиця історії
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(9)
-        self.history_table.setHorizontalHeaderLabels([
-            "ID", "Номер предмету", "Предмет", "Користувач",
-            "Початок", "Кінець", "Повернено", "Статус", "Примітки"
-        ])
+        self.history_model = DataFrameTableModel(
+            [
+                "history_id", "inventory_number", "item_name", "user_name",
+                "start_date", "end_date", "returned_date", "status", "usage_notes"
+            ],
+            [
+                "ID", "Номер предмету", "Предмет", "Користувач",
+                "Початок", "Кінець", "Повернено", "Статус", "Примітки"
+            ],
+            background=history_background, parent=self
+        )
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
+        self.history_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.history_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         layout.addWidget(self.history_table)
         logger.debug("Таблицю історії створено")
@@ -247,6 +467,11 @@ class InventoryApp(QMainWindow):
         self.clear_history_button.clicked.connect(self.clear_history)
         button_layout.addWidget(self.clear_history_button)
 
+        self.export_history_button = QPushButton("Експорт")
+        self.export_history_button.setAccessibleName("Експорт історії використання у файл CSV або Parquet")
+        self.export_history_button.clicked.connect(lambda: self.export_tab("history"))
+        button_layout.addWidget(self.export_history_button)
+
         layout.addWidget(button_panel)
         logger.debug("Панель кнопок створено")
 
@@ -268,7 +493,7 @@ class InventoryApp(QMainWindow):
 
         self.rental_search = QLineEdit()
         self.rental_search.setPlaceholderText("Пошук за користувачем або предметом...")
-        self.rental_search.textChanged.connect(self.filter_rentals)
+        self.rental_search.textChanged.connect(self.rental_filter.schedule)
         search_layout.addWidget(self.rental_search)
 
         self.rental_status_filter = QComboBox()
@@ -276,18 +501,29 @@ class InventoryApp(QMainWindow):
         self.rental_status_filter.addItem("В оренді", "active")
         self.rental_status_filter.addItem("Повернені", "returned")
         self.rental_status_filter.addItem("Протерміновані", "overdue")
+        self.rental_status_filter.currentIndexChanged.connect(self.filter_rentals)
         search_layout.addWidget(self.rental_status_filter)
 
         layout.addWidget(search_panel)
         logger.debug("Панель пошуку оренд створено")
 
         # Таблиця оренди
-        self.rental_table = QTableWidget()
-        self.rental_table.setColumnCount(9)
-        self.rental_table.setHorizontalHeaderLabels([
-            "ID", "Номер предмету", "Предмет", "Орендар",
-            "Початок", "Кінець", "Повернено", "Статус", "Примітки"
-        ])
+        self.rental_model = DataFrameTableModel(
+            [
+                "ID оренди", "Номер предмету", "Назва предмету",
+                "Орендар", "Початок оренди", "Кінець оренди",
+                "Дата повернення", "Статус оренди", "Примітки"
+            ],
+            [
+                "ID", "Номер предмету", "Предмет", "Орендар",
+                "Початок", "Кінець", "Повернено", "Статус", "Примітки"
+            ],
+            background=rental_background, parent=self
+        )
+        self.rental_table = QTableView()
+        self.rental_table.setModel(self.rental_model)
+        self.rental_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.rental_table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
         self.rental_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.rental_table.doubleClicked.connect(self.return_item)
         layout.addWidget(self.rental_table)
@@ -306,184 +542,283 @@ class InventoryApp(QMainWindow):
         self.refresh_rental_button.clicked.connect(self.load_rental_data)
         button_layout.addWidget(self.refresh_rental_button)
 
+        self.export_rental_button = QPushButton("Експорт")
+        self.export_rental_button.setAccessibleName("Експорт оренд у файл CSV або Parquet")
+        self.export_rental_button.clicked.connect(lambda: self.export_tab("rentals"))
+        button_layout.addWidget(self.export_rental_button)
+
         layout.addWidget(button_panel)
         logger.debug("Панель кнопок створено")
 
+    def migrate_schema(self):
+        """
+        Метод для застосування міграцій схеми бази даних у фоновому потоці.
+        Після завершення (успішного чи ні) завантажуються початкові дані та запускається слухач змін.
+        """
+        logger.debug("Перевірка міграцій схеми бази даних")
+
+        def on_migrated(applied):
+            if applied:
+                logger.info(f"Застосовано міграції схеми: {applied}")
+            self.load_initial_data()
+            self.change_feed.start()
+
+        def on_error(error):
+            # Схема могла бути створена вручну, тому застосунок продовжує роботу з наявною схемою
+            logger.error(f"Помилка міграції схеми: {error}")
+            self.status_bar.showMessage("Не вдалося оновити схему бази даних", 5000)
+            self.load_initial_data()
+            self.change_feed.start()
+
+        self.executor.submit("migrations", apply_migrations, self.db, on_result=on_migrated, on_error=on_error)
+
     def load_initial_data(self):
         """
-        Метод для завантаження початкових даних для всіх вкладок.
+        Метод для завантаження початкових даних.
+        Завантажується лише поточна вкладка, інші — під час першого відкриття.
+        Всі запити виконуються у фонових потоках.
         """
         logger.info("Завантаження початкових даних")
+        self.on_tab_changed(self.tabs.currentIndex())
+
+    def on_tab_changed(self, index):
+        """
+        Обробник перемикання вкладок. Завантажує дані вкладки під час її першого відкриття.
 
+        :param index: Індекс активної вкладки.
+        :type index: int
+        """
+        tab = self.tabs.widget(index)
+        for key, loaded_tab in self.loading_tabs.items():
+            if loaded_tab is tab and key not in self.loaded_tabs:
+                logger.info(f"Перше відкриття вкладки '{self.tab_titles[key]}', завантаження даних")
+                self.loaded_tabs.add(key)
+                self.tab_loaders[key]()
+
+    def load_inventory_tab(self):
+        """
+        Метод для першого завантаження вкладки інвентарю: фільтрів та першої сторінки.
+        """
         # Завантаження даних для фільтрів
         self.load_filter_data()
 
         # Завантаження даних інвентарю
         self.load_inventory_data()
 
-        # Завантаження історії використання
-        self.load_history_data()
+    def reload_if_loaded(self, key):
+        """
+        Метод для оновлення даних вкладки, лише якщо вона вже відкривалася.
+        Невідкриті вкладки отримають актуальні дані під час першого відкриття.
 
-        # Завантаження даних оренди
-        self.load_rental_data()
+        :param key: Ключ вкладки.
+        :type key: str
+        """
+        if key in self.loaded_tabs:
+            self.tab_loaders[key]()
 
-        logger.info("Всі початкові дані завантажено")
+    def on_load_started(self, key):
+        """
+        Обробник початку фонового завантаження. Позначає відповідну вкладку як таку, що завантажується.
 
+        :param key: Ключ завантаження.
+        :type key: str
+        """
+        tab = self.loading_tabs.get(key)
+        if tab is not None:
+            index = self.tabs.indexOf(tab)
+            self.tabs.setTabText(index, f"{self.tab_titles[key]} (завантаження…)")
+
+    def on_load_finished(self, key):
+        """
+        Обробник завершення фонового завантаження. Повертає вкладці звичайний заголовок.
+
+        :param key: Ключ завантаження.
+        :type key: str
+        """
+        tab = self.loading_tabs.get(key)
+        if tab is not None:
+            self.tabs.setTabText(self.tabs.indexOf(tab), self.tab_titles[key])
+
+    def show_load_error(self, message):
+        """
+        Метод для створення обробника помилки фонового завантаження.
+
+        :param message: Текст повідомлення для користувача.
+        :type message: str
+
+        :return: Функція, що показує повідомлення про помилку.
+        :rtype: callable
+        """
+        def handler(error):
+            logger.error(f"{message}: {error}")
+            QMessageBox.critical(self, "Помилка", f"{message}: {str(error)}")
+        return handler
 
     def load_filter_data(self):
         """
         Метод для завантаження даних для фільтрів категорій та статусів.
         """
         logger.info("Завантаження даних для фільтрів")
-        try:
-            # Завантаження категорій
-            categories = self.db.get_categories()
-            self.category_filter.clear()
-            self.category_filter.addItem("Всі категорії", None)
-            for _, row in categories.iterrows():
-                self.category_filter.addItem(row['category_name'], row['category_id'])
-            logger.debug(f"Завантажено {len(categories)} категорій")
-
-            # Завантаження статусів
-            statuses = self.db.get_statuses()
-            self.status_filter.clear()
-            self.status_filter.addItem("Всі статуси", None)
-            for _, row in statuses.iterrows():
-                self.status_filter.addItem(row['status_name'], row['status_id'])
-            logger.debug(f"Завантажено {len(statuses)} статусів")
-
-        except Exception as e:
-            logger.error(f"Помилка завантаження даних фільтрів: {e}")
-            logger.error(f"Деталі:\n{traceback.format_exc()}")
-            QMessageBox.critical(self, "Помилка", f"Не вдалося завантажити дані фільтрів: {str(e)}")
+        self.executor.submit(
+            "filters", lambda: (self.db.get_categories(), self.db.get_statuses()),
+            on_result=self.show_filter_data,
+            on_error=self.show_load_error("Не вдалося завантажити дані фільтрів")
+        )
+
+    def show_filter_data(self, result):
+        """
+        Метод для заповнення фільтрів категорій та статусів завантаженими даними.
+
+        :param result: Пара DataFrame (категорії, статуси).
+        :type result: tuple
+        """
+        categories, statuses = result
+
+        # Сигнали блокуються, щоб заповнення списків не запускало запити фільтрації
+        # Завантаження категорій
+        self.category_filter.blockSignals(True)
+        self.category_filter.clear()
+        self.category_filter.addItem("Всі категорії", None)
+        for _, row in categories.iterrows():
+            self.category_filter.addItem(row['category_name'], int(row['category_id']))
+        self.category_filter.blockSignals(False)
+        logger.debug(f"Завантажено {len(categories)} категорій")
+
+        # Завантаження статусів
+        self.status_filter.blockSignals(True)
+        self.status_filter.clear()
+        self.status_filter.addItem("Всі статуси", None)
+        for _, row in statuses.iterrows():
+            self.status_filter.addItem(row['status_name'], int(row['status_id']))
+        self.status_filter.blockSignals(False)
+        logger.debug(f"Завантажено {len(statuses)} статусів")
 
     def load_inventory_data(self):
         """
-        Метод для завантаження та відображення даних про інвентар у таблиці.
-        Якщо цілісність предмета менше, ніж 20%, він підсвітиться світло-червоним кольором.
+        Метод для завантаження поточної сторінки інвентарю.
+        Пошук та фільтри застосовуються на боці бази даних, завантажується лише видима сторінка.
         """
-        logger.info("Завантаження даних інвентарю")
-        try:
-            inventory_data = self.db.get_inventory_details()
-            logger.debug(f"Отримано {len(inventory_data)} записів інвентарю")
+        page_number = len(self.inventory_page_cursors)
+        logger.info(f"Завантаження сторінки інвентарю {page_number}")
+        self.executor.submit(
+            "inventory", self.db.get_inventory_page,
+            **self.inventory_filters(),
+            after_id=self.inventory_page_cursors[-1],
+            page_size=INVENTORY_PAGE_SIZE,
+            on_result=lambda data: self.show_inventory_data(data, page_number),
+            on_error=self.show_load_error("Не вдалося завантажити дані інвентарю")
+        )
 
-            self.inventory_table.setRowCount(len(inventory_data))
-            critical_count = 0
+    def inventory_filters(self):
+        """
+        Метод для отримання поточних пошуку та фільтрів вкладки інвентарю.
 
-            for row_idx, row in inventory_data.iterrows():
-                for col_idx, col in enumerate([
-                    "ID предмету", "Предметний номер", "Назва предмету",
-                    "Категорія", "Статус доступності", "Стан предмету",
-                    "Цілісність (%)", "Примітки"
-                ]):
-                    item = QTableWidgetItem(str(row[col]) if pd.notna(row[col]) else "")
-                    self.inventory_table.setItem(row_idx, col_idx, item)
+        :return: Іменовані аргументи search_text, category_id та status_id для запитів інвентарю.
+        :rtype: dict
+        """
+        return {
+            "search_text": self.search_input.text().strip() or None,
+            "category_id": self.category_filter.currentData(),
+            "status_id": self.status_filter.currentData(),
+        }
 
-                    # Підсвітка критичного стану
-                    if col == "Цілісність (%)" and pd.notna(row[col]) and int(row[col]) < 20:
-                        item.setBackground(QColor(255, 200, 200))  # Світло-червоний
-                        critical_count += 1
+    def show_inventory_data(self, inventory_data, page_number):
+        """
+        Метод для відображення сторінки інвентарю у таблиці.
+        Якщо цілісність предмета менше, ніж 20%, він підсвітиться світло-червоним кольором.
 
-                if critical_count > 0:
-                    logger.warning(f"Виявлено {critical_count} предметів з критичним станом (Цілісність < 20%)")
+        :param inventory_data: Рядки сторінки (з одним зайвим рядком, якщо існує наступна сторінка).
+        :type inventory_data: pandas.DataFrame
 
-        except Exception as e:
-            logger.error(f"Помилка завантаження даних інвентарю: {e}")
-            logger.error(f"Деталі:\n{traceback.format_exc()}")
-            QMessageBox.critical(self, "Помилка", f"Не вдалося завантажити дані інвентарю: {str(e)}")
+        :param page_number: Номер сторінки.
+        :type page_number: int
+        """
+        has_next_page = len(inventory_data) > INVENTORY_PAGE_SIZE
+        inventory_data = inventory_data.iloc[:INVENTORY_PAGE_SIZE]
+        logger.debug(f"Отримано {len(inventory_data)} записів інвентарю")
+
+        self.inventory_model.set_dataframe(inventory_data)
 
+        self.page_label.setText(f"Сторінка {page_number}")
+        self.prev_page_button.setEnabled(page_number > 1)
+        self.next_page_button.setEnabled(has_next_page)
+
+        integrity = pd.to_numeric(inventory_data["Цілісність (%)"], errors="coerce")
+        critical_count = int((integrity < 20).sum())
+        if critical_count > 0:
+            logger.warning(f"Виявлено {critical_count} предметів з критичним станом (Цілісність < 20%)")
 
     def load_history_data(self):
         """
-        Метод для завантаження та відображення історії використання інвентарю.
-        Різні статуси оренди підсвічуються різними кольорами.
+        Метод для завантаження історії використання інвентарю з вибраним сортуванням.
         """
         logger.info("Завантаження історії використання")
+        self.executor.submit(
+            "history", self.fetch_history_chunks, self.history_sort_combo.currentData(),
+            on_progress=self.show_history_chunk,
+            on_result=self.show_history_data,
+            on_error=self.show_load_error("Не вдалося завантажити історію використання")
+        )
 
-        try:
-            base_query = """
-                SELECT
-                    uh.history_id,
-                    i.inventory_number,
-                    i.item_name,
-                    uh.user_name,
-                    uh.start_date,
-                    uh.end_date,
-                    uh.returned_date,
-                    CASE
-                        WHEN uh.returned_date IS NULL AND uh.end_date < CURRENT_DATE THEN 'Протерміновано'
-                        WHEN uh.returned_date IS NULL THEN 'В оренді'
-                        WHEN uh.returned_date > uh.end_date THEN 'Повернено з запізненням'
-                        ELSE 'Повернено'
-                    END as status,
-                    uh.usage_notes
-                FROM usage_history uh
-                LEFT JOIN inventory i ON uh.item_id = i.item_id
-                WHERE uh.is_rental = true
-            """
-
-            sort_option = self.history_sort_combo.currentData()
-            if sort_option == "start_date_asc":
-                base_query += " ORDER BY uh.start_date ASC"
-            elif sort_option == "start_date_desc":
-                base_query += " ORDER BY uh.start_date DESC"
-            elif sort_option == "end_date_asc":
-                base_query += " ORDER BY uh.end_date ASC"
-            elif sort_option == "end_date_desc":
-                base_query += " ORDER BY uh.end_date DESC"
-            elif sort_option == "name_asc":
-                base_query += " ORDER BY i.item_name ASC"
-            elif sort_option == "name_desc":
-                base_query += " ORDER BY i.item_name DESC"
-            elif sort_option == "user_asc":
-                base_query += " ORDER BY uh.user_name ASC"
-            elif sort_option == "user_desc":
-                base_query += " ORDER BY uh.user_name DESC"
-            else:
-                base_query += " ORDER BY uh.start_date DESC"
-
-            history_data = self.db.execute_query(base_query, fetch=True, return_df=True)
-            logger.debug(f"Отримано {len(history_data)} записів історії використання")
-
-            self.history_table.setRowCount(len(history_data))
-            overdue_count = 0
-            late_count = 0
-
-            for row_idx, row in history_data.iterrows():
-                for col_idx, col in enumerate([
-                    "history_id", "inventory_number", "item_name", "user_name",
-                    "start_date", "end_date", "returned_date", "status", "usage_notes"
-                ]):
-                    item = QTableWidgetItem(str(row[col]) if pd.notna(row[col]) else "")
-                    self.history_table.setItem(row_idx, col_idx, item)
-
-                    # Підсвітка протермінованих оренд
-                status = row['status']
-                color = QColor(255, 255, 255)
-
-                if status == 'Протерміновано':
-                    color = QColor(255, 200, 200)  # Світло-червоний
-                    overdue_count += 1
-                elif status == 'Повернено з запізненням':
-                    color = QColor(255, 220, 150)  # Світло-оранжевий
-                    late_count += 1
-                elif status == 'Повернено':
-                    color = QColor(200, 255, 200)  # Світло-зелений
-
-                for i in range(self.history_table.columnCount()):
-                    item = self.history_table.item(row_idx, 7)
-                    if item:  # Перевіряємо, чи існує елемент
-                        item.setBackground(color)
-
-            if overdue_count > 0:
-                logger.warning(f"Виявлено {overdue_count} протермінованих оренд")
-            if late_count > 0:
-                logger.warning(f"Виявлено {late_count} повернень з запізненням")
-
-        except Exception as e:
-            logger.error(f"Помилка завантаження історії використання: {e}")
-            logger.error(f"Деталі:\n{traceback.format_exc()}")
-            QMessageBox.critical(self, "Помилка", f"Не вдалося завантажити історію використання: {str(e)}")
+    def fetch_history_chunks(self, sort_option, progress):
+        """
+        Метод для потокового читання історії використання. Виконується у фоновому потоці.
+        Кожна частина одразу надсилається у потік інтерфейсу, тому повна вибірка
+        не зберігається в пам'яті двічі (кортежі та DataFrame).
+
+        :param sort_option: Ключ сортування.
+        :type sort_option: str
+
+        :param progress: Функція для надсилання пари (номер частини, DataFrame частини).
+        :type progress: callable
+
+        :return: Кількість отриманих частин.
+        :rtype: int
+        """
+        chunk_count = 0
+        for chunk in self.db.stream_usage_history(sort_option):
+            progress((chunk_count, chunk))
+            chunk_count += 1
+        return chunk_count
+
+    def show_history_chunk(self, result):
+        """
+        Метод для відображення чергової частини історії використання.
+        Перша частина замінює попередні дані таблиці, наступні додаються в кінець.
+
+        :param result: Пара (номер частини, DataFrame частини).
+        :type result: tuple
+        """
+        chunk_number, chunk = result
+        if chunk_number == 0:
+            self.history_model.set_dataframe(chunk)
+        else:
+            self.history_model.append_dataframe(chunk)
+        logger.debug("Отримано частину %d історії використання (%d записів)", chunk_number + 1, len(chunk))
+
+    def show_history_data(self, chunk_count):
+        """
+        Метод для завершення завантаження історії використання: оновлення пошуку та фільтрації.
+        Різні статуси оренди підсвічуються різними кольорами.
+
+        :param chunk_count: Кількість отриманих частин.
+        :type chunk_count: int
+        """
+        if chunk_count == 0:
+            self.history_model.set_dataframe(pd.DataFrame(columns=self.history_model.columns))
+        logger.debug(f"Отримано {self.history_model.source_row_count()} записів історії використання")
+
+        self.update_history_search()
+
+        # Кольори статусів обчислюються моделлю під час відображення
+        statuses = self.history_model.column_array("status")
+        overdue_count = int((statuses == 'Протерміновано').sum())
+        late_count = int((statuses == 'Повернено з запізненням').sum())
+
+        if overdue_count > 0:
+            logger.warning(f"Виявлено {overdue_count} протермінованих оренд")
+        if late_count > 0:
+            logger.warning(f"Виявлено {late_count} повернень з запізненням")
 
     def clear_history(self):
         """
@@ -499,145 +834,395 @@ class InventoryApp(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                logger.info("Підтверджено очищення історії використання")
-                if self.db.execute_query("DELETE FROM usage_history"):
+            logger.info("Підтверджено очищення історії використання")
+
+            def on_cleared(result):
+                if result:
                     self.load_history_data()
                     QMessageBox.information(self, "Успіх", "Історію використання успішно очищено")
                     logger.info("Історію використання очищено")
-            except Exception as e:
-                logger.error(f"Помилка очищення історії використання: {e}")
-                logger.error(f"Деталі:\n{traceback.format_exc()}")
-                QMessageBox.critical(self, "Помилка", f"Не вдалося очистити історію: {str(e)}")
+
+            self.executor.submit(
+                "clear_history", self.db.execute_query, "DELETE FROM usage_history",
+                invalidates=("usage_history",),
+                on_result=on_cleared,
+                on_error=self.show_load_error("Не вдалося очистити історію")
+            )
 
     def load_rental_data(self):
         """
-        Метод для завантаження та відображення активних оренд.
-        Фільтрує записи, показуючи лише активні оренди.
+        Метод для завантаження активних оренд.
         """
         logger.info("Завантаження даних про активні оренди")
-        try:
-            rental_data = self.db.get_rental_history()
-            logger.debug(f"Отримано {len(rental_data)} записів оренд")
-
-            # Фільтруємо дані - лише оренди без дати повернення
-            active_rentals = rental_data[pd.isna(rental_data["Дата повернення"])]
-            logger.debug(f"Активних оренд: {len(active_rentals)}")
-
-            self.rental_table.setRowCount(len(active_rentals))
-            overdue_count = 0
-
-            for row_idx, (_, row) in enumerate(active_rentals.iterrows()):
-                for col_idx, col in enumerate([
-                    "ID оренди", "Номер предмету", "Назва предмету",
-                    "Орендар", "Початок оренди", "Кінець оренди",
-                    "Дата повернення", "Статус оренди", "Примітки"
-                ]):
-                    item = QTableWidgetItem(str(row[col]) if pd.notna(row[col]) else "")
-                    self.rental_table.setItem(row_idx, col_idx, item)
-
-                    # Підсвітка протермінованих оренд
-                    if col == "Статус оренди" and row[col] == 'Протерміновано':
-                        for i in range(self.rental_table.columnCount()):
-                            self.rental_table.item(row_idx, i).setBackground(QColor(255, 200, 200))
-                        overdue_count += 1
-            if overdue_count > 0:
-                logger.warning(f"Активних протермінованих оренд: {overdue_count}")
-
-        except Exception as e:
-            logger.error(f"Помилка завантаження даних оренди: {e}")
-            logger.error(f"Деталі:\n{traceback.format_exc()}")
-            QMessageBox.critical(self, "Помилка", f"Не вдалося завантажити дані оренди: {str(e)}")
+        self.executor.submit(
+            "rentals", self.db.get_rental_history,
+            on_result=self.show_rental_data,
+            on_error=self.show_load_error("Не вдалося завантажити дані оренди")
+        )
+
+    def show_rental_data(self, rental_data):
+        """
+        Метод для відображення активних оренд.
+        Фільтрує записи, показуючи лише активні оренди.
+
+        :param rental_data: Історія оренд.
+        :type rental_data: pandas.DataFrame
+        """
+        logger.debug(f"Отримано {len(rental_data)} записів оренд")
+
+        # Фільтруємо дані - лише оренди без дати повернення
+        active_rentals = rental_data[pd.isna(rental_data["Дата повернення"])]
+        logger.debug(f"Активних оренд: {len(active_rentals)}")
+
+        self.rental_model.set_dataframe(active_rentals)
+        self.rental_filter.set_haystack(
+            self.build_haystack(active_rentals, ["Назва предмету", "Орендар"])
+        )
+        self.filter_rentals()
+
+        overdue_count = int((active_rentals["Статус оренди"] == 'Протерміновано').sum())
+        if overdue_count > 0:
+            logger.warning(f"Активних протермінованих оренд: {overdue_count}")
 
     def filter_inventory(self):
         """
-        Метод для фільтрування таблиці з інвентарем за текстом пошуку та вибраними фільтрами.
+        Метод для фільтрування інвентарю за текстом пошуку та вибраними фільтрами.
+        Фільтрація виконується запитом до бази даних, починаючи з першої сторінки.
         """
-        search_text = self.search_input.text().lower()
-        category_id = self.category_filter.currentData()
-        status_id = self.status_filter.currentData()
-        logger.debug(f"Фільтрація інвентарю: пошук='{search_text}', категорія={category_id}, статус={status_id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Фільтрація інвентарю: пошук='%s', категорія=%s, статус=%s", self.search_input.text(),
+                         self.category_filter.currentData(), self.status_filter.currentData())
+        self.inventory_filter.cancel()
+        self.inventory_page_cursors = [None]
+        self.load_inventory_data()
 
-        visible_count = 0
-        for row in range(self.inventory_table.rowCount()):
-            should_show = True
-            item_name = self.inventory_table.item(row, 2).text().lower()
-            item_number = self.inventory_table.item(row, 1).text().lower()
-            item_category = self.inventory_table.item(row, 3).text()
-            item_status = self.inventory_table.item(row, 4).text()
+    def next_inventory_page(self):
+        """
+        Метод для переходу на наступну сторінку інвентарю.
+        """
+        model = self.inventory_model
+        if model.rowCount() == 0:
+            return
+        last_id = int(model.value(model.rowCount() - 1, "ID предмету"))
+        self.inventory_page_cursors.append(last_id)
+        self.load_inventory_data()
 
-            # Фільтр пошуку
-            if search_text and (search_text not in item_name and search_text not in item_number):
-                should_show = False
+    def prev_inventory_page(self):
+        """
+        Метод для переходу на попередню сторінку інвентарю.
+        """
+        if len(self.inventory_page_cursors) > 1:
+            self.inventory_page_cursors.pop()
+            self.load_inventory_data()
 
-            # Фільтр категорії
-            if category_id and item_category != self.category_filter.currentText():
-                should_show = False
+    @staticmethod
+    def build_haystack(df, columns):
+        """
+        Метод для побудови тексту пошуку для кожного рядка таблиці.
 
-            # Фільтр статусу
-            if status_id and item_status != self.status_filter.currentText():
-                should_show = False
+        :param df: Дані таблиці.
+        :type df: pandas.DataFrame
 
-            self.inventory_table.setRowHidden(row, not should_show)
-            if should_show:
-                visible_count += 1
+        :param columns: Колонки, за якими виконується пошук.
+        :type columns: list[str]
 
-        logger.debug(f"Результат фільтрації інвентарю: показано {visible_count} з {self.inventory_table.rowCount()} записів")
+        :return: Текст кожного рядка в нижньому регістрі.
+        :rtype: list[str]
+        """
+        if df.empty:
+            return []
+        text = df[columns[0]].fillna("").astype(str)
+        for column in columns[1:]:
+            text = text + "\n" + df[column].fillna("").astype(str)
+        return text.str.lower().tolist()
 
     def filter_history(self):
         """
-        Метод для фільтрації таблиці історії пошуку за текстом пошуку та статусом.
+        Метод для фільтрації таблиці історії за текстом пошуку.
+        Рядки, що відповідають запиту, відображаються методом show_history_rows.
         """
-        search_text = self.history_search.text().lower()
-        logger.debug(f"Фільтрація історії: пошук='{search_text}'")
-
-        visible_count = 0
-        for row in range(self.history_table.rowCount()):
-            should_show = True
-            item_name = self.history_table.item(row, 1).text().lower()
-            user_name = self.history_table.item(row, 2).text().lower()
+        self.history_filter.run_now(self.history_search.text())
 
-            # Фільтр пошуку
-            if search_text and (search_text not in item_name and search_text not in user_name):
-                should_show = False
+    def show_history_rows(self, rows):
+        """
+        Метод для відображення результату фільтрації історії використання.
 
-            self.history_table.setRowHidden(row, not should_show)
-            if should_show:
-                visible_count += 1
-        logger.debug(
-            f"Результат фільтрації історії використання: показано {visible_count} з {self.history_table.rowCount()} записів")
+        :param rows: Індекси рядків, що відповідають запиту.
+        :type rows: numpy.ndarray
+        """
+        model = self.history_model
+        model.set_visible_rows(None if len(rows) == model.source_row_count() else rows)
+        logger.debug("Результат фільтрації історії використання: показано %d з %d записів",
+                     model.rowCount(), model.source_row_count())
 
     def filter_rentals(self):
         """
         Метод для фільтрації таблиці оренди за текстом пошуку та статусом.
+        Рядки, що відповідають запиту, відображаються методом show_rental_rows.
         """
-        search_text = self.rental_search.text().lower()
         status_filter = self.rental_status_filter.currentData()
-        logger.debug(f"Фільтрація оренд: пошук='{search_text}', статус={status_filter}")
-
-        visible_count = 0
-        for row in range(self.rental_table.rowCount()):
-            should_show = True
-            item_name = self.rental_table.item(row, 2).text().lower()
-            user_name = self.rental_table.item(row, 3).text().lower()
-            status = self.rental_table.item(row, 7).text()
-
-            # Фільтр пошуку
-            if search_text and (search_text not in item_name and search_text not in user_name):
-                should_show = False
-
-            # Фільтр статусу
-            if status_filter == "active" and status != "В оренді":
-                should_show = False
-            elif status_filter == "returned" and "Повернено" not in status:
-                should_show = False
-            elif status_filter == "overdue" and status != "Протерміновано":
-                should_show = False
-
-            self.rental_table.setRowHidden(row, not should_show)
-            if should_show:
-                visible_count += 1
-        logger.debug(f"Результат фільтрації оренд: показано {visible_count} з {self.rental_table.rowCount()} записів")
+        statuses = self.rental_model.column_array("Статус оренди")
+
+        # Фільтр статусу
+        mask = None
+        if status_filter == "active":
+            mask = statuses == "В оренді"
+        elif status_filter == "returned":
+            mask = np.array(["Повернено" in str(status) for status in statuses], dtype=bool)
+        elif status_filter == "overdue":
+            mask = statuses == "Протерміновано"
+
+        self.rental_filter.set_mask(mask)
+        self.rental_filter.run_now(self.rental_search.text())
+
+    def show_rental_rows(self, rows):
+        """
+        Метод для відображення результату фільтрації оренд.
+
+        :param rows: Індекси рядків, що відповідають запиту.
+        :type rows: numpy.ndarray
+        """
+        model = self.rental_model
+        model.set_visible_rows(None if len(rows) == model.source_row_count() else rows)
+        logger.debug("Результат фільтрації оренд: показано %d з %d записів", model.rowCount(), model.source_row_count())
+
+    def refresh_rows(self, item_ids=(), history_ids=()):
+        """
+        Метод для оновлення окремих рядків таблиць після зміни даних.
+        Замість повторного завантаження вкладок у фоновому потоці запитуються лише змінені рядки.
+
+        ID накопичуються, доки оновлення не завершиться: новий запит замінює попередній
+        і отримує рядки для всіх змінених записів.
+
+        :param item_ids: ID змінених предметів.
+        :type item_ids: list[int]
+
+        :param history_ids: ID змінених записів оренди.
+        :type history_ids: list[int]
+        """
+        self.pending_item_ids.update(item_ids)
+        self.pending_history_ids.update(history_ids)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Оновлення рядків: предмети %s, оренди %s",
+                         sorted(self.pending_item_ids), sorted(self.pending_history_ids))
+
+        self.executor.submit(
+            "refresh_rows", self.fetch_changed_rows,
+            sorted(self.pending_item_ids), sorted(self.pending_history_ids), set(self.loaded_tabs),
+            self.inventory_filters(),
+            on_result=self.apply_changed_rows,
+            on_error=self.on_refresh_rows_error
+        )
+
+    def fetch_changed_rows(self, item_ids, history_ids, loaded_tabs, inventory_filters):
+        """
+        Метод для отримання змінених рядків для відкритих вкладок. Виконується у фоновому потоці.
+
+        :param item_ids: ID змінених предметів.
+        :type item_ids: list[int]
+
+        :param history_ids: ID змінених записів оренди.
+        :type history_ids: list[int]
+
+        :param loaded_tabs: Ключі вкладок, що вже відкривалися.
+        :type loaded_tabs: set[str]
+
+        :param inventory_filters: Пошук та фільтри вкладки інвентарю (див. inventory_filters).
+        :type inventory_filters: dict
+
+        :return: Словник {ключ вкладки: DataFrame зі зміненими рядками}; для інвентарю —
+            кортеж (ID змінених предметів, фільтри, рядки, що відповідають фільтрам).
+        :rtype: dict
+        """
+        changes = {}
+        if item_ids and "inventory" in loaded_tabs:
+            changes["inventory"] = (
+                item_ids, inventory_filters, self.db.get_inventory_rows(item_ids, **inventory_filters)
+            )
+        if history_ids and "rentals" in loaded_tabs:
+            changes["rentals"] = self.db.get_rental_rows(history_ids)
+        if history_ids and "history" in loaded_tabs:
+            changes["history"] = self.db.get_usage_history_rows(history_ids)
+        return changes
+
+    def apply_changed_rows(self, changes):
+        """
+        Метод для застосування змінених рядків до моделей таблиць.
+
+        :param changes: Словник {ключ вкладки: DataFrame зі зміненими рядками}.
+        :type changes: dict
+        """
+        self.pending_item_ids.clear()
+        self.pending_history_ids.clear()
+
+        inventory_change = changes.get("inventory")
+        if inventory_change is not None:
+            self.apply_inventory_rows(*inventory_change)
+
+        rental_rows = changes.get("rentals")
+        if rental_rows is not None:
+            # Вкладка оренди показує лише активні оренди
+            returned = pd.notna(rental_rows["Дата повернення"])
+            self.rental_model.remove_rows("ID оренди", rental_rows.loc[returned, "ID оренди"].tolist())
+            self.rental_model.upsert_rows(rental_rows[~returned], "ID оренди")
+            self.update_rental_search()
+
+        history_rows = changes.get("history")
+        if history_rows is not None:
+            self.history_model.upsert_rows(history_rows, "history_id")
+            self.update_history_search()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Оновлено рядки вкладок: %s", sorted(changes))
+
+    def apply_inventory_rows(self, item_ids, filters, rows):
+        """
+        Метод для застосування змінених рядків до поточної сторінки інвентарю.
+
+        Предмети, що більше не відповідають пошуку чи фільтрам, прибираються зі сторінки.
+        Нові предмети мають найбільший ID, тому додаються лише на останню сторінку;
+        якщо ж предмет тепер відповідає фільтрам і має потрапити всередину поточної
+        сторінки, сторінка завантажується заново.
+
+        :param item_ids: ID змінених предметів.
+        :type item_ids: list[int]
+
+        :param filters: Пошук та фільтри, з якими запитано рядки.
+        :type filters: dict
+
+        :param rows: Змінені предмети, що відповідають фільтрам.
+        :type rows: pandas.DataFrame
+        """
+        if filters != self.inventory_filters():
+            # Фільтри змінено під час запиту: сторінка вже завантажується з новими фільтрами
+            return
+
+        key = "ID предмету"
+        model = self.inventory_model
+        model.remove_rows(key, set(item_ids) - set(rows[key].tolist()))
+
+        page_ids = model.column_array(key)
+        known = rows[key].isin(page_ids)
+        new_ids = rows.loc[~known, key]
+        after_id = self.inventory_page_cursors[-1]
+        if after_id is not None:
+            new_ids = new_ids[new_ids > after_id]
+        if len(page_ids) and (new_ids < page_ids.max()).any():
+            self.load_inventory_data()
+            return
+
+        model.upsert_rows(rows[known], key, append=False)
+        if not self.next_page_button.isEnabled():
+            model.append_dataframe(rows[rows[key].isin(new_ids)].sort_values(key))
+
+    def apply_remote_changes(self, batch):
+        """
+        Обробник змін, зроблених іншими клієнтами.
+        Видалені записи прибираються з таблиць, змінені — запитуються та оновлюються на місці.
+        Після масових змін (без переліку ID) відкриті вкладки завантажуються заново.
+
+        :param batch: Набір змін з каналу сповіщень.
+        :type batch: ChangeBatch
+        """
+        logger.info(f"Отримано зміни від інших клієнтів: {batch}")
+
+        if batch.changed_tables:
+            # Про масові зміни надходить лише назва таблиці, тому відкриті вкладки завантажуються повністю
+            self.db.invalidate_cache("inventory", "usage_history")
+            self.reload_if_loaded("inventory")
+            self.reload_if_loaded("rentals")
+            self.reload_if_loaded("history")
+            return
+
+        # Зміни інших клієнтів не проходять через цей DBConnection, тому кеш очищається тут
+        if batch.item_ids or batch.deleted_item_ids:
+            self.db.invalidate_cache("inventory")
+        if batch.history_ids or batch.deleted_history_ids:
+            self.db.invalidate_cache("usage_history")
+
+        if batch.deleted_item_ids:
+            self.inventory_model.remove_rows("ID предмету", batch.deleted_item_ids)
+
+        if batch.deleted_history_ids:
+            self.rental_model.remove_rows("ID оренди", batch.deleted_history_ids)
+            self.update_rental_search()
+
+            self.history_model.remove_rows("history_id", batch.deleted_history_ids)
+            self.update_history_search()
+
+        item_ids = batch.item_ids - batch.deleted_item_ids
+        history_ids = batch.history_ids - batch.deleted_history_ids
+        if item_ids or history_ids:
+            self.refresh_rows(item_ids=item_ids, history_ids=history_ids)
+
+    def on_refresh_rows_error(self, error):
+        """
+        Обробник помилки оновлення рядків. Відкриті вкладки завантажуються повністю.
+
+        :param error: Виняток фонового завдання.
+        :type error: Exception
+        """
+        logger.error(f"Не вдалося оновити змінені рядки: {error}")
+        self.pending_item_ids.clear()
+        self.pending_history_ids.clear()
+        self.reload_if_loaded("inventory")
+        self.reload_if_loaded("rentals")
+        self.reload_if_loaded("history")
+
+    def update_rental_search(self):
+        """
+        Метод для оновлення тексту пошуку оренд після зміни рядків моделі та повторної фільтрації.
+        """
+        self.rental_filter.set_haystack(
+            self.build_haystack(self.model_frame(self.rental_model), ["Назва предмету", "Орендар"])
+        )
+        self.filter_rentals()
+
+    def update_history_search(self):
+        """
+        Метод для оновлення тексту пошуку історії після зміни рядків моделі та повторної фільтрації.
+        """
+        self.history_filter.set_haystack(
+            self.build_haystack(self.model_frame(self.history_model), ["item_name", "user_name"])
+        )
+        self.filter_history()
+
+    @staticmethod
+    def model_frame(model):
+        """
+        Метод для отримання даних моделі таблиці у вигляді DataFrame (без копіювання масивів колонок).
+
+        :param model: Модель таблиці.
+        :type model: DataFrameTableModel
+
+        :rtype: pandas.DataFrame
+        """
+        return pd.DataFrame({column: model.column_array(column) for column in model.columns}, copy=False)
+
+    def run_db_action(self, key, fn, *args, on_done=None, error_message="Помилка"):
+        """
+        Метод для виконання зміни даних (додавання, редагування, оренда тощо) у фоновому потоці.
+
+        Результат кожної дії обробляється, навіть якщо користувач встиг запустити ще одну
+        з тим самим ключем: обидві вже змінили базу даних.
+
+        :param key: Ключ дії для виконавця запитів.
+        :type key: str
+
+        :param fn: Метод DBConnection, що виконує зміну.
+        :type fn: callable
+
+        :param on_done: Функція, що викликається з результатом після успішного виконання.
+        :type on_done: callable, optional
+
+        :param error_message: Текст для журналу у разі помилки.
+        :type error_message: str
+        """
+        def on_error(error):
+            logger.error(f"{error_message}: {error}")
+            QMessageBox.critical(self, "Помилка", str(error))
+
+        self.executor.submit(key, fn, *args, on_result=on_done, on_error=on_error, drop_stale=False)
 
     def add_inventory_item(self):
         """
@@ -648,63 +1233,173 @@ class InventoryApp(QMainWindow):
 
         dialog = InventoryItemForm(self.db)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            try:
-                item_data = dialog.get_data()
-                logger.debug(f"Дані нового предмету: {item_data}")
+            item_data = dialog.get_data()
+            logger.debug(f"Дані нового предмету: {item_data}")
 
-                item_id = self.db.add_inventory_item(item_data)
+            def on_added(item_id):
                 if item_id:
-                    self.load_inventory_data()
+                    self.refresh_rows(item_ids=[item_id])
                     self.status_bar.showMessage("Предмет успішно додано", 3000)
                     logger.info(f"Предмет додано з ID: {item_id}")
-            except Exception as e:
-                logger.error(f"Помилка додавання предмету: {e}")
-                QMessageBox.critical(self, "Помилка", str(e))
+
+            self.run_db_action(
+                "add_item", self.db.add_inventory_item, item_data,
+                on_done=on_added, error_message="Помилка додавання предмету"
+            )
+
+    def import_inventory(self):
+        """
+        Метод для масового імпорту предметів з файлу CSV.
+        Файл перевіряється та завантажується у фоновому потоці, після чого показується звіт з помилками.
+        """
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Імпорт предметів", "", "Файли CSV (*.csv);;Всі файли (*)"
+        )
+        if not path:
+            return
+
+        logger.info(f"Імпорт предметів з файлу {path}")
+        self.import_button.setEnabled(False)
+
+        def run_import():
+            statuses = set(self.db.get_statuses()["status_name"])
+            rows, errors = read_inventory_csv(path, statuses)
+            result = self.db.bulk_import_inventory(rows) if rows else {"item_ids": [], "created_categories": []}
+            return result, errors
+
+        def on_error(error):
+            self.import_button.setEnabled(True)
+            logger.error(f"Помилка імпорту з файлу {path}: {error}")
+            QMessageBox.critical(self, "Помилка", f"Не вдалося імпортувати предмети: {str(error)}")
+
+        self.executor.submit("import", run_import, on_result=self.show_import_result, on_error=on_error,
+                             drop_stale=False)
+
+    def show_import_result(self, result):
+        """
+        Метод для відображення звіту про імпорт та оновлення таблиці інвентарю.
+
+        :param result: Пара (результат bulk_import_inventory, список помилок рядків).
+        :type result: tuple
+        """
+        self.import_button.setEnabled(True)
+        imported, errors = result
+
+        if imported["created_categories"]:
+            self.load_filter_data()
+        if imported["item_ids"]:
+            self.load_inventory_data()
+
+        message = (f"Імпортовано предметів: {len(imported['item_ids'])}\n"
+                   f"Створено категорій: {len(imported['created_categories'])}\n"
+                   f"Рядків з помилками: {len(errors)}")
+        logger.info(message.replace("\n", ", "))
+
+        box = QMessageBox(
+            QMessageBox.Icon.Warning if errors else QMessageBox.Icon.Information,
+            "Імпорт завершено", message, parent=self
+        )
+        if errors:
+            for error in errors:
+                logger.warning(f"Помилка імпорту: {error}")
+            box.setDetailedText("\n".join(str(error) for error in errors))
+        box.exec()
+
+    def export_tab(self, source):
+        """
+        Метод для експорту всіх рядків вкладки у файл CSV або Parquet.
+        Дані читаються з бази даних потоком у фоновому потоці, а не з таблиці вікна,
+        з тими самими пошуком та фільтрами, що й на вкладці (для інвентарю — з усіх сторінок).
+
+        :param source: Вкладка: "inventory", "rentals" або "history".
+        :type source: str
+        """
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Експорт даних", f"{source}.csv", "Файли CSV (*.csv);;Файли Parquet (*.parquet)"
+        )
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += ".parquet" if "parquet" in selected_filter else ".csv"
+
+        # Експорт містить ті самі рядки, що й вкладка, з усіх її сторінок
+        if source == "inventory":
+            filters = self.inventory_filters()
+        elif source == "rentals":
+            filters = {
+                "search_text": self.rental_search.text().strip() or None,
+                "rental_status": self.rental_status_filter.currentData(),
+            }
+        else:
+            filters = {
+                "search_text": self.history_search.text().strip() or None,
+                "sort_option": self.history_sort_combo.currentData(),
+            }
+        query, params = self.db.export_query(source, **filters)
+        logger.info(f"Експорт вкладки '{source}' у файл {path}")
+        self.status_bar.showMessage(f"Експорт у файл {os.path.basename(path)}...")
+
+        def on_progress(total):
+            self.status_bar.showMessage(f"Експорт у файл {os.path.basename(path)}: {total} рядків...")
+
+        def on_done(total):
+            self.status_bar.showMessage(f"Експортовано {total} рядків у файл {os.path.basename(path)}", 5000)
+
+        def on_error(error):
+            self.status_bar.clearMessage()
+            QMessageBox.critical(self, "Помилка", str(error))
+
+        self.executor.submit(
+            f"export_{source}",
+            lambda progress: export_query(self.db, query, params, path, progress=progress),
+            on_progress=on_progress, on_result=on_done, on_error=on_error, drop_stale=False
+        )
 
     def edit_inventory_item(self):
         """
         Відкриває форму для редагування вибраного предмета інвентарю.
         Після успішного закінчення операції, оновлює таблицю.
         """
-        selected_row = self.inventory_table.currentRow()
+        selected_row = current_row(self.inventory_table)
         if selected_row == -1:
             logger.warning("Спроба редагування без вибору предмету")
             QMessageBox.warning(self, "Попередження", "Будь ласка, виберіть предмет для редагування")
             return
 
-        item_id = int(self.inventory_table.item(selected_row, 0).text())
-        item_name = self.inventory_table.item(selected_row, 2).text()
+        item_id = int(self.inventory_model.value(selected_row, "ID предмету"))
+        item_name = self.inventory_model.value(selected_row, "Назва предмету")
 
         logger.info(f"Відкриття діалогу редагування предмету: ID={item_id}, назва='{item_name}'")
 
         dialog = InventoryItemForm(self.db, item_id)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            try:
-                item_data = dialog.get_data()
-                logger.debug(f"Оновлені дані предмету {item_id}: {item_data}")
+            item_data = dialog.get_data()
+            logger.debug(f"Оновлені дані предмету {item_id}: {item_data}")
 
-                if self.db.update_inventory_item(item_id, item_data):
-                    self.load_inventory_data()
+            def on_updated(result):
+                if result:
+                    self.refresh_rows(item_ids=[item_id])
                     self.status_bar.showMessage("Предмет успішно оновлено", 3000)
                     logger.info(f"Предмет {item_id} оновлено")
-            except Exception as e:
-                logger.error(f"Помилка оновлення предмету {item_id}: {e}")
-                logger.error(f"Деталі:\n{traceback.format_exc()}")
-                QMessageBox.critical(self, "Помилка", str(e))
+
+            self.run_db_action(
+                "edit_item", self.db.update_inventory_item, item_id, item_data,
+                on_done=on_updated, error_message=f"Помилка оновлення предмету {item_id}"
+            )
 
     def delete_inventory_item(self):
         """
         Метод для видалення предмета з інвентарю.
         Для підтвердження/скасування дії використовується діалогове вікно.
         """
-        selected_row = self.inventory_table.currentRow()
+        selected_row = current_row(self.inventory_table)
         if selected_row == -1:
             logger.warning("Спроба видалення без вибору предмету")
             QMessageBox.warning(self, "Попередження", "Будь ласка, виберіть предмет для видалення")
             return
 
-        item_id = int(self.inventory_table.item(selected_row, 0).text())
-        item_name = self.inventory_table.item(selected_row, 2).text()
+        item_id = int(self.inventory_model.value(selected_row, "ID предмету"))
+        item_name = self.inventory_model.value(selected_row, "Назва предмету")
 
         logger.warning(f"Спроба видалення предмету: ID={item_id}, назва='{item_name}'")
 
@@ -715,30 +1410,40 @@ class InventoryApp(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                if self.db.delete_inventory_item(item_id):
-                    self.load_inventory_data()
+            def on_deleted(result):
+                if result:
+                    self.inventory_model.remove_rows("ID предмету", [item_id])
+                    # Записи оренди посилаються на видалений предмет, тому ці вкладки завантажуються повністю
+                    self.reload_if_loaded("rentals")
+                    self.reload_if_loaded("history")
                     self.status_bar.showMessage("Предмет успішно видалено", 3000)
                     logger.info(f"Предмет {item_id} видалено")
-            except Exception as e:
-                logger.error(f"Помилка видалення предмету {item_id}: {e}")
-                logger.error(f"Деталі:\n{traceback.format_exc()}")
-                QMessageBox.critical(self, "Помилка", str(e))
+
+            self.run_db_action(
+                "delete_item", self.db.delete_inventory_item, item_id,
+                on_done=on_deleted, error_message=f"Помилка видалення предмету {item_id}"
+            )
 
     def rent_item(self):
         """
         Відкриває форму оренди для вибраного предмета.
         Перед відкриттям форми здійснюється перевірка на доступність.
+        Якщо вибрано кілька предметів, оформлюється групова оренда.
         """
-        selected_row = self.inventory_table.currentRow()
+        rows = selected_rows(self.inventory_table)
+        if len(rows) > 1:
+            self.rent_items(rows)
+            return
+
+        selected_row = current_row(self.inventory_table)
         if selected_row == -1:
             logger.warning("Спроба оренди без вибору предмету")
             QMessageBox.warning(self, "Попередження", "Будь ласка, виберіть предмет для оренди")
             return
 
-        item_id = int(self.inventory_table.item(selected_row, 0).text())
-        current_status = self.inventory_table.item(selected_row, 4).text()
-        item_name = self.inventory_table.item(selected_row, 2).text()
+        item_id = int(self.inventory_model.value(selected_row, "ID предмету"))
+        current_status = self.inventory_model.value(selected_row, "Статус доступності")
+        item_name = self.inventory_model.value(selected_row, "Назва предмету")
 
         logger.info(f"Спроба оренди предмету: ID={item_id}, назва='{item_name}', статус='{current_status}'")
 
@@ -750,33 +1455,80 @@ class InventoryApp(QMainWindow):
 
         dialog = RentalForm(self.db, item_id)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            try:
-                rental_data = dialog.get_data()
-                logger.debug(f"Дані оренди предмету {item_id}: {rental_data}")
+            rental_data = dialog.get_data()
+            logger.debug(f"Дані оренди предмету {item_id}: {rental_data}")
 
-                if self.db.rent_item(item_id, **rental_data):
-                    self.load_inventory_data()
-                    self.load_rental_data()
+            def on_rented(history_id):
+                if history_id:
+                    self.refresh_rows(item_ids=[item_id], history_ids=[history_id])
                     self.status_bar.showMessage("Оренду успішно оформлено", 3000)
                     logger.info(f"Оренду предмету {item_id} оформлено")
-            except Exception as e:
-                logger.error(f"Помилка оформлення оренди предмету {item_id}: {e}")
-                logger.error(f"Деталі:\n{traceback.format_exc()}")
-                QMessageBox.critical(self, "Помилка", str(e))
+
+            self.run_db_action(
+                "rent_item", lambda: self.db.rent_item(item_id, **rental_data),
+                on_done=on_rented, error_message=f"Помилка оформлення оренди предмету {item_id}"
+            )
+
+    def rent_items(self, rows):
+        """
+        Відкриває форму групової оренди для кількох вибраних предметів.
+        Усі оренди оформлюються однією транзакцією, після чого таблиці оновлюються один раз.
+
+        :param rows: Номери вибраних рядків таблиці інвентарю.
+        :type rows: list[int]
+        """
+        model = self.inventory_model
+        unavailable = [
+            model.value(row, "Назва предмету") for row in rows
+            if model.value(row, "Статус доступності") != "Доступний"
+        ]
+        if unavailable:
+            logger.warning(f"Групова оренда неможлива, недоступні предмети: {unavailable}")
+            QMessageBox.warning(
+                self, "Попередження",
+                "Ці предмети не доступні для оренди:\n" + "\n".join(map(str, unavailable))
+            )
+            return
+
+        item_ids = [int(model.value(row, "ID предмету")) for row in rows]
+        items = [(model.value(row, "Предметний номер"), model.value(row, "Назва предмету")) for row in rows]
+        logger.info(f"Спроба групової оренди {len(item_ids)} предметів: {item_ids}")
+
+        dialog = RentalForm(self.db, items=items)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            rental_data = dialog.get_data()
+            logger.debug(f"Дані групової оренди: {rental_data}")
+
+            def on_rented(rentals):
+                self.refresh_rows(item_ids=list(rentals), history_ids=list(rentals.values()))
+                self.status_bar.showMessage(f"Оформлено оренд: {len(rentals)}", 3000)
+                logger.info(f"Групову оренду {len(rentals)} предметів оформлено")
+
+            self.run_db_action(
+                "rent_items", lambda: self.db.rent_items(item_ids, **rental_data),
+                on_done=on_rented, error_message="Помилка оформлення групової оренди"
+            )
 
     def return_item(self):
         """
         Відкриває форму повернення з оренди для вибраного предмета.
+        Поточна цілісність предмета завантажується у фоновому потоці перед відкриттям форми.
+        Якщо вибрано кілька записів оренди, фіксується групове повернення.
         """
-        selected_row = self.rental_table.currentRow()
+        rows = selected_rows(self.rental_table)
+        if len(rows) > 1:
+            self.return_items(rows)
+            return
+
+        selected_row = current_row(self.rental_table)
         if selected_row == -1:
             logger.warning("Спроба повернення без вибору запису оренди")
             QMessageBox.warning(self, "Попередження", "Будь ласка, виберіть запис оренди")
             return
 
-        rental_id = int(self.rental_table.item(selected_row, 0).text())
-        status = self.rental_table.item(selected_row, 7).text()
-        item_name = self.rental_table.item(selected_row, 2).text()
+        rental_id = int(self.rental_model.value(selected_row, "ID оренди"))
+        status = self.rental_model.value(selected_row, "Статус оренди")
+        item_name = self.rental_model.value(selected_row, "Назва предмету")
 
         logger.info(f"Спроба повернення предмету з оренди: rental_id={rental_id}, назва='{item_name}', статус='{status}'")
 
@@ -785,43 +1537,146 @@ class InventoryApp(QMainWindow):
             QMessageBox.warning(self, "Попередження", "Цей предмет вже повернено")
             return
 
-        # Отримуємо поточну цілісність предмета
-        try:
-            item_id = self.db.execute_query(
-                "SELECT item_id FROM usage_history WHERE history_id = %s",
-                (rental_id,), fetch=True)[0][0]
-            logger.debug(f"Знайдено item_id={item_id} для rental_id={rental_id}")
-
+        # Отримуємо поточну цілісність предмета одним запитом
+        def fetch_integrity():
             current_integrity = self.db.execute_query(
-                "SELECT integrity_percentage FROM inventory WHERE item_id = %s",
-                (item_id,), fetch=True)[0][0]
-            logger.debug(f"Поточна цілісність предмета {item_id}: {current_integrity}%")
-        except Exception as e:
-            logger.error(f"Помилка отримання даних для rental_id={rental_id}: {e}")
-            logger.error(f"Деталі:\n{traceback.format_exc()}")
-            QMessageBox.critical(self, "Помилка", f"Не вдалося отримати дані: {str(e)}")
-            return
+                """
+                SELECT i.integrity_percentage
+                FROM usage_history uh
+                JOIN inventory i ON i.item_id = uh.item_id
+                WHERE uh.history_id = %s
+                """,
+                (rental_id,), fetch=True, prepared=True)[0][0]
+            logger.debug(f"Поточна цілісність предмета для rental_id={rental_id}: {current_integrity}%")
+            return current_integrity
+
+        self.executor.submit(
+            "return_lookup", fetch_integrity,
+            on_result=lambda current_integrity: self.open_return_form(rental_id, current_integrity),
+            on_error=self.show_load_error("Не вдалося отримати дані")
+        )
+
+    def open_return_form(self, rental_id, current_integrity):
+        """
+        Метод для відкриття форми повернення та фіксації повернення предмета з оренди.
 
+        :param rental_id: ID запису оренди.
+        :type rental_id: int
+
+        :param current_integrity: Поточна цілісність предмета.
+        :type current_integrity: int
+        """
         dialog = ReturnForm(self.db, rental_id, current_integrity)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            try:
-                return_data = dialog.get_data()
-                logger.debug(f"Дані повернення rental_id={rental_id}: {return_data}")
-
-                if self.db.return_item(
-                        rental_id,
-                        return_data["returned_date"],
-                        return_data["integrity_percentage"],
-                        return_data["notes"]
-                ):
-                    self.load_inventory_data()
-                    self.load_rental_data()
+            return_data = dialog.get_data()
+            logger.debug(f"Дані повернення rental_id={rental_id}: {return_data}")
+
+            def on_returned(item_id):
+                if item_id:
+                    self.refresh_rows(item_ids=[item_id], history_ids=[rental_id])
                     self.status_bar.showMessage("Повернення успішно зафіксовано", 3000)
                     logger.info(f"Повернення rental_id={rental_id} зафіксовано, нова цілісність: {return_data['integrity_percentage']}%")
-            except Exception as e:
-                logger.error(f"Помилка фіксації повернення rental_id={rental_id}: {e}")
-                logger.error(f"Деталі:\n{traceback.format_exc()}")
-                QMessageBox.critical(self, "Помилка", str(e))
+
+            self.run_db_action(
+                "return_item", self.db.return_item,
+                rental_id,
+                return_data["returned_date"],
+                return_data["integrity_percentage"],
+                return_data["notes"],
+                on_done=on_returned, error_message=f"Помилка фіксації повернення rental_id={rental_id}"
+            )
+
+    def return_items(self, rows):
+        """
+        Метод для групового повернення кількох вибраних предметів з оренди.
+        Поточна цілісність усіх предметів завантажується одним запитом у фоновому потоці.
+
+        :param rows: Номери вибраних рядків таблиці оренд.
+        :type rows: list[int]
+        """
+        model = self.rental_model
+        rentals = [
+            {
+                "history_id": int(model.value(row, "ID оренди")),
+                "inventory_number": model.value(row, "Номер предмету"),
+                "item_name": model.value(row, "Назва предмету"),
+                "user_name": model.value(row, "Орендар"),
+            }
+            for row in rows
+            if "Повернено" not in model.value(row, "Статус оренди")
+        ]
+        if not rentals:
+            logger.warning("Спроба групового повернення вже повернених предметів")
+            QMessageBox.warning(self, "Попередження", "Вибрані предмети вже повернено")
+            return
+
+        history_ids = [rental["history_id"] for rental in rentals]
+        logger.info(f"Спроба групового повернення {len(history_ids)} предметів: {history_ids}")
+
+        def fetch_integrity():
+            return dict(self.db.execute_query(
+                """
+                SELECT uh.history_id, i.integrity_percentage
+                FROM usage_history uh
+                JOIN inventory i ON i.item_id = uh.item_id
+                WHERE uh.history_id = ANY(%s)
+                """,
+                (history_ids,), fetch=True))
+
+        def on_integrity(integrity):
+            for rental in rentals:
+                rental["integrity_percentage"] = integrity.get(rental["history_id"], 100)
+            self.open_batch_return_form(rentals)
+
+        self.executor.submit(
+            "return_lookup", fetch_integrity,
+            on_result=on_integrity,
+            on_error=self.show_load_error("Не вдалося отримати дані")
+        )
+
+    def open_batch_return_form(self, rentals):
+        """
+        Метод для відкриття форми групового повернення та фіксації повернення предметів однією транзакцією.
+
+        :param rentals: Записи оренди з поточною цілісністю предметів.
+        :type rentals: list[dict]
+        """
+        dialog = BatchReturnForm(rentals)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            return_data = dialog.get_data()
+            logger.debug(f"Дані групового повернення: {return_data}")
+
+            def on_returned(items):
+                self.refresh_rows(item_ids=list(items.values()), history_ids=list(items))
+                self.status_bar.showMessage(f"Зафіксовано повернень: {len(items)}", 3000)
+                logger.info(f"Групове повернення {len(items)} предметів зафіксовано")
+
+            self.run_db_action(
+                "return_items", self.db.return_items,
+                return_data["returns"],
+                return_data["returned_date"],
+                return_data["notes"],
+                on_done=on_returned, error_message="Помилка фіксації групового повернення"
+            )
+
+    def show_query_stats(self):
+        """
+        Відкриває вікно зі статистикою часу та кількості рядків запитів до бази даних.
+        """
+        QueryStatsDialog(self.db.stats, self).exec()
+
+    def closeEvent(self, event):
+        """
+        Обробник закриття вікна. Зупиняє слухача змін та зберігає статистику запитів.
+        """
+        self.change_feed.stop()
+        if len(self.db.stats):
+            try:
+                self.db.stats.dump(QUERY_STATS_PATH)
+                logger.info(self.db.stats.format_report(limit=5))
+            except OSError as e:
+                logger.warning(f"Не вдалося зберегти статистику запитів: {e}")
+        super().closeEvent(event)
 
     def apply_styles(self):
         """
@@ -853,7 +1708,7 @@ class InventoryApp(QMainWindow):
                 border-bottom-color: white;
                 font-weight: bold;
             }
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 alternate-background-color: #f9f9f9;
                 gridline-color: #e0e0e0;
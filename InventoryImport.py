@@ -0,0 +1,196 @@
+import csv
+import logging
+from datetime import date, datetime
+
+logger = logging.getLogger(__name__)
+
+# Відповідність заголовків CSV полям предмета. Підтримуються як службові назви,
+# так і заголовки, з якими інвентар відображається в застосунку.
+CSV_COLUMNS = {
+    "item_name": ("item_name", "назва предмету", "назва"),
+    "category_name": ("category", "category_name", "категорія"),
+    "status_name": ("status", "status_name", "статус доступності", "статус"),
+    "integrity_percentage": ("integrity_percentage", "integrity", "цілісність (%)", "цілісність"),
+    "purchase_date": ("purchase_date", "дата придбання"),
+    "item_notes": ("item_notes", "notes", "примітки"),
+}
+
+REQUIRED_COLUMNS = ("item_name", "category_name")
+
+DEFAULT_STATUS = "Доступний"
+
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y")
+
+
+class ImportRowError:
+    """
+    Клас, що відповідає за помилку в одному рядку файлу імпорту.
+
+    Attributes:
+        line: Номер рядка у файлі (заголовок — рядок 1)
+        message: Опис помилки
+    """
+    def __init__(self, line, message):
+        self.line = line
+        self.message = message
+
+    def __str__(self):
+        return f"Рядок {self.line}: {self.message}"
+
+    def __repr__(self):
+        return f"ImportRowError({self.line}, {self.message!r})"
+
+
+def map_columns(header):
+    """
+    Функція для визначення, в якій колонці CSV знаходиться кожне поле предмета.
+
+    :param header: Заголовки колонок файлу.
+    :type header: list[str]
+
+    :return: Словник {поле: номер колонки}.
+    :rtype: dict
+
+    :raise: ValueError, якщо у файлі немає обов'язкових колонок.
+    """
+    normalized = [name.strip().lower().lstrip("﻿") for name in header]
+    positions = {}
+    for field, aliases in CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in normalized:
+                positions[field] = normalized.index(alias)
+                break
+
+    missing = [field for field in REQUIRED_COLUMNS if field not in positions]
+    if missing:
+        raise ValueError(f"У файлі немає обов'язкових колонок: {', '.join(missing)}")
+    return positions
+
+
+def parse_date(text):
+    """
+    Функція для розбору дати у форматі РРРР-ММ-ДД або ДД.ММ.РРРР.
+
+    :param text: Текст дати.
+    :type text: str
+
+    :rtype: datetime.date
+
+    :raise: ValueError, якщо формат дати не підтримується.
+    """
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"некоректна дата '{text}' (очікується РРРР-ММ-ДД або ДД.ММ.РРРР)")
+
+
+def validate_row(values, positions, statuses):
+    """
+    Функція для перевірки та перетворення одного рядка CSV.
+
+    :param values: Значення колонок рядка.
+    :type values: list[str]
+
+    :param positions: Номери колонок полів (результат map_columns).
+    :type positions: dict
+
+    :param statuses: Назви допустимих статусів доступності.
+    :type statuses: set[str]
+
+    :return: Словник з полями предмета.
+    :rtype: dict
+
+    :raise: ValueError, якщо рядок не пройшов перевірку.
+    """
+    def field(name):
+        position = positions.get(name)
+        if position is None or position >= len(values):
+            return ""
+        return values[position].strip()
+
+    item_name = field("item_name")
+    if not item_name:
+        raise ValueError("не вказано назву предмета")
+
+    category_name = field("category_name")
+    if not category_name:
+        raise ValueError("не вказано категорію")
+
+    status_name = field("status_name") or DEFAULT_STATUS
+    if status_name not in statuses:
+        raise ValueError(f"невідомий статус '{status_name}'")
+
+    integrity_text = field("integrity_percentage").rstrip("%").strip()
+    if integrity_text:
+        try:
+            integrity = int(integrity_text)
+        except ValueError:
+            raise ValueError(f"цілісність '{integrity_text}' не є цілим числом")
+        if not 0 <= integrity <= 100:
+            raise ValueError(f"цілісність {integrity} поза межами 0-100")
+    else:
+        integrity = 100
+
+    date_text = field("purchase_date")
+    purchase_date = parse_date(date_text) if date_text else date.today()
+
+    return {
+        "item_name": item_name,
+        "category_name": category_name,
+        "status_name": status_name,
+        "integrity_percentage": integrity,
+        "purchase_date": purchase_date,
+        "item_notes": field("item_notes") or None,
+    }
+
+
+def read_inventory_csv(path, statuses):
+    """
+    Функція для читання та перевірки файлу CSV з предметами інвентарю.
+
+    Рядки з помилками не зупиняють читання: вони повертаються окремим списком,
+    а коректні рядки можна імпортувати.
+
+    :param path: Шлях до файлу CSV (UTF-8, роздільник — кома або крапка з комою).
+    :type path: str
+
+    :param statuses: Назви допустимих статусів доступності.
+    :type statuses: set[str]
+
+    :return: Пара (коректні рядки з номером рядка файлу в полі line, список помилок).
+    :rtype: tuple[list[dict], list[ImportRowError]]
+
+    :raise: ValueError, якщо файл порожній або не має обов'язкових колонок.
+    """
+    logger.info(f"Читання файлу імпорту: {path}")
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        # Роздільник визначається за рядком заголовків: таблиці з локаллю uk_UA зберігають CSV з ";"
+        first_line = file.readline()
+        file.seek(0)
+        delimiter = ";" if first_line.count(";") > first_line.count(",") else ","
+        reader = csv.reader(file, delimiter=delimiter)
+
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("Файл порожній")
+        positions = map_columns(header)
+
+        rows = []
+        errors = []
+        for values in reader:
+            # Номер фізичного рядка файлу (значення в лапках можуть займати кілька рядків)
+            line = reader.line_num
+            if not any(value.strip() for value in values):
+                continue
+            try:
+                row = validate_row(values, positions, statuses)
+            except ValueError as e:
+                errors.append(ImportRowError(line, str(e)))
+                continue
+            row["line"] = line
+            rows.append(row)
+
+    logger.info(f"Прочитано {len(rows)} коректних рядків, помилок: {len(errors)}")
+    return rows, errors
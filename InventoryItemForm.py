@@ -1,5 +1,3 @@
-import traceback
-
 from PyQt6.QtCore import QDate
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout,
@@ -8,6 +6,7 @@ from PyQt6.QtWidgets import (
 )
 import logging
 from DBConnection import DBConnection
+from QueryExecutor import QueryExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +27,8 @@ class InventoryItemForm(QDialog):
         super().__init__()
         self.db = db
         self.item_id = item_id
+        self.category_id = None
+        self.executor = QueryExecutor(self)
 
         mode = "редагування" if item_id else "додавання"
         logger.info(f"Ініціалізація форми {mode} предмету")
@@ -62,34 +63,10 @@ class InventoryItemForm(QDialog):
         self.category_combo.setEditable(True)
         self.category_combo.lineEdit().setPlaceholderText("Введіть або виберіть категорію")
         logger.debug("Поле 'Категорія' створено")
-
-        # Додаємо існуючі категорії
-        try:
-            logger.info("Завантаження списку категорій")
-            categories = self.db.get_categories()
-            self.category_combo.addItem("")  # Порожній елемент
-            for _, row in categories.iterrows():
-                self.category_combo.addItem(row['category_name'])
-            logger.debug(f"Завантажено {len(categories)} категорій")
-        except Exception as e:
-            logger.error(f"Помилка завантаження категорій: {e}")
-            logger.error(f"Деталі:\n{traceback.format_exc()}")
-            QMessageBox.critical(self, "Помилка", str(e))
-
         form_layout.addRow("Категорія:", self.category_combo)
 
-        # Статус
+        # Статус (списки категорій та статусів заповнюються у load_data)
         self.status_combo = QComboBox()
-        try:
-            logger.info("Завантаження списку статусів")
-            statuses = self.db.get_statuses()
-            for _, row in statuses.iterrows():
-                self.status_combo.addItem(row['status_name'], row['status_id'])
-            logger.debug(f"Завантажено {len(statuses)} статусів")
-        except Exception as e:
-            logger.error(f"Помилка завантаження статусів: {e}")
-            logger.error(f"Деталі:\n{traceback.format_exc()}")
-            QMessageBox.critical(self, "Помилка", str(e))
         form_layout.addRow("Статус:", self.status_combo)
 
         # Цілісність
@@ -119,67 +96,120 @@ class InventoryItemForm(QDialog):
         button_box.accepted.connect(self.validate_and_accept)
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
+        self.ok_button = button_box.button(QDialogButtonBox.StandardButton.Ok)
         logger.debug("Кнопки OK та Cancel створено")
 
     def load_data(self):
         """
-        Метод для завантаження даних (у випадку редагування).
-        Наявні поля заповнюються даними з бази.
+        Метод для завантаження списків категорій і статусів та даних предмета (у випадку редагування)
+        у фоновому потоці.
         """
+        logger.info("Завантаження списків категорій та статусів")
         if self.item_id is not None:
             logger.info(f"Завантаження даних для редагування предмету з ID={self.item_id}")
 
-            try:
-                query = """
-                    SELECT i.item_name, i.category_id, i.status_id,
-                           i.integrity_percentage, i.purchase_date, i.item_notes
-                    FROM inventory i
-                    WHERE i.item_id = %s
-                """
-                result = self.db.execute_query(query, (self.item_id,), fetch=True)
-
-                if result:
-                    item_data = result[0]
-                    logger.debug(f"Отримано дані предмету: назва='{item_data[0]}', цілісність={item_data[3]}%")
-                    self.item_name_edit.setText(item_data[0])
-                    logger.debug(f"Встановлено назву: {item_data[0]}")
-
-                    # Встановлення категорії
-                    index = self.category_combo.findData(item_data[1])
-                    if index >= 0:
-                        self.category_combo.setCurrentIndex(index)
-                        logger.debug(f"Встановлено категорію з ID={item_data[1]}")
-                    else:
-                        logger.warning(f"Категорію з ID={item_data[1]} не знайдено в списку")
-
-                    # Встановлення статусу
-                    index = self.status_combo.findData(item_data[2])
-                    if index >= 0:
-                        self.status_combo.setCurrentIndex(index)
-                        logger.debug(f"Встановлено статус з ID={item_data[2]}")
-                    else:
-                        logger.warning(f"Статус з ID={item_data[2]} не знайдено в списку")
-
-                    self.integrity_spin.setValue(item_data[3])
-                    logger.debug(f"Встановлено цілісність: {item_data[3]}%")
-
-                    # Встановлення дати
-                    if item_data[4]:
-                        self.purchase_date_edit.setDate(item_data[4])
-                        logger.debug(f"Встановлено дату надходження: {item_data[4]}")
-
-                    notes = item_data[5] if item_data[5] else ""
-                    self.notes_edit.setText(notes)
-                    logger.debug(f"Встановлено примітки: {notes if notes else 'порожньо'}")
-
-                    logger.info(f"Дані для редагування предмету {self.item_id} завантажено")
-                else:
-                    logger.warning(f"Предмет з ID={self.item_id} не знайдено в базі даних")
-
-            except Exception as e:
-                logger.error(f"Помилка завантаження даних предмету {self.item_id}: {e}")
-                logger.error(f"Деталі:\n{traceback.format_exc()}")
-                QMessageBox.critical(self, "Помилка", f"Не вдалося завантажити дані: {str(e)}")
+        self.ok_button.setEnabled(False)
+        self.executor.submit(
+            "form_data", self.fetch_form_data,
+            on_result=self.show_data, on_error=self.show_load_error
+        )
+
+    def fetch_form_data(self):
+        """
+        Метод для отримання даних форми з бази даних. Виконується у фоновому потоці.
+
+        :return: Кортеж (категорії, статуси, дані предмета або None).
+        :rtype: tuple
+        """
+        categories = self.db.get_categories()
+        statuses = self.db.get_statuses()
+
+        item_data = None
+        if self.item_id is not None:
+            query = """
+                SELECT i.item_name, i.category_id, i.status_id,
+                       i.integrity_percentage, i.purchase_date, i.item_notes
+                FROM inventory i
+                WHERE i.item_id = %s
+            """
+            result = self.db.execute_query(query, (self.item_id,), fetch=True)
+            item_data = result[0] if result else None
+
+        return categories, statuses, item_data
+
+    def show_data(self, result):
+        """
+        Метод для заповнення форми завантаженими даними.
+        Наявні поля заповнюються даними з бази.
+
+        :param result: Кортеж (категорії, статуси, дані предмета або None).
+        :type result: tuple
+        """
+        categories, statuses, item_data = result
+
+        # Додаємо існуючі категорії
+        self.category_combo.addItem("")  # Порожній елемент
+        for _, row in categories.iterrows():
+            self.category_combo.addItem(row['category_name'], int(row['category_id']))
+        logger.debug(f"Завантажено {len(categories)} категорій")
+
+        for _, row in statuses.iterrows():
+            self.status_combo.addItem(row['status_name'], int(row['status_id']))
+        logger.debug(f"Завантажено {len(statuses)} статусів")
+
+        self.ok_button.setEnabled(True)
+
+        if self.item_id is None:
+            return
+
+        if item_data is None:
+            logger.warning(f"Предмет з ID={self.item_id} не знайдено в базі даних")
+            return
+
+        logger.debug(f"Отримано дані предмету: назва='{item_data[0]}', цілісність={item_data[3]}%")
+        self.item_name_edit.setText(item_data[0])
+        logger.debug(f"Встановлено назву: {item_data[0]}")
+
+        # Встановлення категорії
+        index = self.category_combo.findData(item_data[1])
+        if index >= 0:
+            self.category_combo.setCurrentIndex(index)
+            logger.debug(f"Встановлено категорію з ID={item_data[1]}")
+        else:
+            logger.warning(f"Категорію з ID={item_data[1]} не знайдено в списку")
+
+        # Встановлення статусу
+        index = self.status_combo.findData(item_data[2])
+        if index >= 0:
+            self.status_combo.setCurrentIndex(index)
+            logger.debug(f"Встановлено статус з ID={item_data[2]}")
+        else:
+            logger.warning(f"Статус з ID={item_data[2]} не знайдено в списку")
+
+        self.integrity_spin.setValue(item_data[3])
+        logger.debug(f"Встановлено цілісність: {item_data[3]}%")
+
+        # Встановлення дати
+        if item_data[4]:
+            self.purchase_date_edit.setDate(item_data[4])
+            logger.debug(f"Встановлено дату надходження: {item_data[4]}")
+
+        notes = item_data[5] if item_data[5] else ""
+        self.notes_edit.setText(notes)
+        logger.debug(f"Встановлено примітки: {notes if notes else 'порожньо'}")
+
+        logger.info(f"Дані для редагування предмету {self.item_id} завантажено")
+
+    def show_load_error(self, error):
+        """
+        Обробник помилки завантаження даних форми.
+
+        :param error: Виняток, що виник під час завантаження.
+        :type error: Exception
+        """
+        logger.error(f"Помилка завантаження даних форми: {error}")
+        self.ok_button.setEnabled(True)
+        QMessageBox.critical(self, "Помилка", f"Не вдалося завантажити дані: {str(error)}")
 
     def validate_and_accept(self):
         """
@@ -202,84 +232,66 @@ class InventoryItemForm(QDialog):
                 raise ValueError("Введіть назву категорії")
             logger.debug(f"Категорія: '{category_name}'")
 
-            # Перевіряємо чи категорія вже існує
-            logger.debug(f"Пошук/створення категорії '{category_name}'")
-            category_id = self.get_or_create_category(category_name)
-            if not category_id:
-                logger.error(f"Не вдалося отримати ID для категорії '{category_name}'")
-                raise ValueError("Не вдалося визначити категорію")
-            logger.debug(f"Отримано category_id={category_id}")
-
             integrity_value = self.integrity_spin.value()
             logger.debug(f"Цілісність: {integrity_value}%")
 
             if integrity_value < 20:
                 logger.warning(f"Предмет має критичний рівень цілісності: {integrity_value}%")
 
-            # Якщо все добре - приймаємо діалог
-            logger.info("Валідація пройшла успішно, форму прийнято")
-            self.accept()
-
         except ValueError as e:
             logger.warning(f"Валідацію не пройдено: {e}")
             QMessageBox.warning(self, "Попередження", str(e))
+            return
 
-    def get_or_create_category(self, category_name):
+        # Перевіряємо чи категорія вже існує (у фоновому потоці)
+        logger.debug(f"Пошук/створення категорії '{category_name}'")
+        self.ok_button.setEnabled(False)
+        self.executor.submit(
+            "category", self.db.get_or_create_category, category_name,
+            on_result=self.on_category_resolved, on_error=self.on_category_error, drop_stale=False
+        )
+
+    def on_category_resolved(self, category_id):
+        """
+        Обробник отримання ID категорії. Приймає діалог, якщо категорію визначено.
+
+        :param category_id: ID категорії або None.
+        :type category_id: int
         """
-        Метод для отримання або створення категорії.
+        self.ok_button.setEnabled(True)
+        if not category_id:
+            logger.error("Не вдалося отримати ID для категорії")
+            QMessageBox.warning(self, "Попередження", "Не вдалося визначити категорію")
+            return
+
+        logger.debug(f"Отримано category_id={category_id}")
+        self.category_id = category_id
 
-        :param category_name: Назва категорії.
-        :type category_name: str
+        # Якщо все добре - приймаємо діалог
+        logger.info("Валідація пройшла успішно, форму прийнято")
+        self.accept()
 
-        :return: ID категорії.
+    def on_category_error(self, error):
         """
-        logger.debug(f"Обробка категорії: '{category_name}'")
+        Обробник помилки роботи з категоріями.
 
-        try:
-            # Спочатку пробуємо знайти існуючу категорію
-            logger.debug(f"Пошук існуючої категорії '{category_name}'")
-            result = self.db.execute_query(
-                "SELECT category_id FROM categories WHERE category_name = %s",
-                (category_name,), fetch=True)
-
-            if result: # Категорія існує
-                category_id = result[0][0]
-                logger.debug(f"Знайдено існуючу категорію '{category_name}' з ID={category_id}")
-                return category_id
-
-            # Якщо категорії немає - створюємо нову
-            logger.info(f"Створення нової категорії: '{category_name}'")
-            result = self.db.execute_query(
-                "INSERT INTO categories (category_name) VALUES (%s) RETURNING category_id",
-                (category_name,), fetch=True)
-
-            if result:
-                category_id = result[0][0]
-                logger.info(f"Створено нову категорію '{category_name}' з ID={category_id}")
-                return category_id
-
-            logger.error(f"Не вдалося створити категорію '{category_name}' - немає результату")
-            return None
-
-        except Exception as e:
-            logger.error(f"Помилка роботи з категоріями для '{category_name}': {e}")
-            QMessageBox.critical(self, "Помилка", f"Помилка роботи з категоріями: {str(e)}")
-        return None
+        :param error: Виняток, що виник під час пошуку/створення категорії.
+        :type error: Exception
+        """
+        self.ok_button.setEnabled(True)
+        QMessageBox.critical(self, "Помилка", f"Помилка роботи з категоріями: {str(error)}")
 
     def get_data(self):
         """
         Метод для отримання даних у вигляді словника.
+        ID категорії визначається під час валідації форми.
 
         :return: Словник з даними предмету.
         :rtype: dict
         """
-        category_name = self.category_combo.currentText().strip()
-        logger.debug(f"Отримання даних з форми для категорії '{category_name}'")
-
-        category_id = self.get_or_create_category(category_name)
         data = {
             "item_name": self.item_name_edit.text().strip(),
-            "category_id": category_id,
+            "category_id": self.category_id,
             "status_id": self.status_combo.currentData(),
             "integrity_percentage": self.integrity_spin.value(),
             "purchase_date": self.purchase_date_edit.date().toPyDate(),
@@ -0,0 +1,59 @@
+import importlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LazyModule:
+    """
+    Клас, що відповідає за відкладений імпорт модуля.
+
+    Модуль імпортується під час першого звернення до його атрибута, а не під час
+    завантаження модуля, що його використовує. Так важкі бібліотеки (pandas) не
+    сповільнюють відкриття головного вікна і зазвичай вперше імпортуються у фоновому
+    потоці разом із першим запитом до бази даних.
+
+    Attributes:
+        name: Повна назва модуля
+    """
+    def __init__(self, name):
+        """
+        Метод для ініціалізації відкладеного модуля.
+
+        :param name: Повна назва модуля (наприклад, "pandas").
+        :type name: str
+        """
+        self.name = name
+        self._module = None
+
+    def load(self):
+        """
+        Метод для імпорту модуля (якщо він ще не імпортований).
+
+        importlib.import_module безпечний для виклику з кількох потоків одночасно.
+
+        :return: Імпортований модуль.
+        """
+        if self._module is None:
+            logger.debug(f"Відкладений імпорт модуля {self.name}")
+            self._module = importlib.import_module(self.name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+    def __repr__(self):
+        state = "імпортовано" if self._module is not None else "не імпортовано"
+        return f"<LazyModule {self.name} ({state})>"
+
+
+def lazy_import(name):
+    """
+    Функція для отримання модуля з відкладеним імпортом.
+
+    :param name: Повна назва модуля.
+    :type name: str
+
+    :return: Відкладений модуль.
+    :rtype: LazyModule
+    """
+    return LazyModule(name)
@@ -0,0 +1,193 @@
+"""
+Вимірювання накладних витрат журналу на гарячих шляхах.
+
+Порівнює виклики logger.debug з f-рядком, з відкладеним форматуванням (%-аргументи)
+та з перевіркою isEnabledFor за вимкненого рівня DEBUG, а також час, який запис
+повідомлення забирає в потоку, що його створив: синхронний FileHandler проти черги
+setup_logging. Окремо вимірюється форматування записів у текст та у рядки JSON
+(структурований журнал), яке виконується у фоновому потоці слухача.
+
+Кожне вимірювання — CALLS викликів; база даних не потрібна, файли журналу записуються
+в тимчасовий каталог. Результати зберігаються у JSON разом з результатами Benchmark.py.
+
+Приклад використання:
+    python LoggingBenchmark.py --repeat 10
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+from Benchmark import RESULTS_DIR, BenchmarkCase, git_commit, run_cases
+
+# Кількість викликів журналу в одному вимірюванні
+CALLS = 100_000
+
+# Типові аргументи повідомлень execute_query
+SAMPLE_QUERY = "SELECT * FROM inventory_details WHERE \"ID предмету\" > %s ORDER BY \"ID предмету\" LIMIT %s"
+SAMPLE_PARAMS = (123456, 500, "намет", None, datetime(2025, 6, 1))
+
+
+def disabled_cases(logger):
+    """
+    Функція для створення вимірювань викликів logger.debug за вимкненого рівня DEBUG.
+
+    :param logger: Логер з рівнем INFO.
+    :type logger: logging.Logger
+
+    :rtype: list[BenchmarkCase]
+    """
+    def fstring():
+        for _ in range(CALLS):
+            logger.debug(f"Параметри запиту: {SAMPLE_PARAMS}")
+
+    def lazy():
+        for _ in range(CALLS):
+            logger.debug("Параметри запиту: %s", SAMPLE_PARAMS)
+
+    def guarded():
+        for _ in range(CALLS):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Параметри запиту: %s", SAMPLE_PARAMS)
+
+    return [
+        BenchmarkCase("logging.debug_disabled.fstring", fstring),
+        BenchmarkCase("logging.debug_disabled.lazy", lazy),
+        BenchmarkCase("logging.debug_disabled.guarded", guarded),
+    ]
+
+
+def emit_cases(sync_logger, queued_logger):
+    """
+    Функція для створення вимірювань часу запису повідомлення в потоці, що його створив.
+
+    :param sync_logger: Логер із синхронним FileHandler.
+    :type sync_logger: logging.Logger
+
+    :param queued_logger: Логер, налаштований setup_logging (запис через чергу).
+    :type queued_logger: logging.Logger
+
+    :rtype: list[BenchmarkCase]
+    """
+    def emit(logger):
+        def run():
+            for _ in range(CALLS):
+                logger.info("SQL Query: %s", SAMPLE_QUERY, extra={"query_id": "0badf00d"})
+        return run
+
+    return [
+        BenchmarkCase("logging.info.sync_file", emit(sync_logger)),
+        BenchmarkCase("logging.info.queue", emit(queued_logger)),
+    ]
+
+
+def format_cases():
+    """
+    Функція для створення вимірювань форматування записів у текст та JSON.
+
+    :rtype: list[BenchmarkCase]
+    """
+    from logger_config import LOGGING_CONFIG, JsonFormatter
+
+    detailed = LOGGING_CONFIG['formatters']['detailed']
+    text_formatter = logging.Formatter(detailed['format'], detailed['datefmt'])
+    json_formatter = JsonFormatter()
+    record = logging.LogRecord("DBConnection", logging.INFO, __file__, 0, "Отримано %d рядків даних", (500,), None)
+    record.query_id = "0badf00d"
+    record.rows = 500
+    record.duration_ms = 12.5
+
+    def run(formatter):
+        def format_records():
+            for _ in range(CALLS):
+                formatter.format(record)
+        return format_records
+
+    return [
+        BenchmarkCase("logging.format.text", run(text_formatter)),
+        BenchmarkCase("logging.format.json", run(json_formatter)),
+    ]
+
+
+def main(argv=None):
+    """
+    Функція для запуску вимірювань журналу з командного рядка.
+
+    :param argv: Аргументи командного рядка.
+    :type argv: list[str], optional
+
+    :return: Код завершення: 0 — усі вимірювання виконано, 1 — були помилки.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description="Вимірювання накладних витрат журналу")
+    parser.add_argument("--repeat", type=int, default=5, help="Кількість запусків кожного вимірювання")
+    parser.add_argument("--warmup", type=int, default=1, help="Кількість розігрівальних запусків")
+    parser.add_argument("--only", help="Регулярний вираз для вибору вимірювань за назвою")
+    parser.add_argument("--output", help="Файл JSON для результатів (за замовчуванням — у каталозі benchmark_results)")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-logging-{git_commit() or 'nogit'}.json")
+    output = os.path.abspath(output)
+    results = {}
+
+    print(f"Вимірювання журналу: {CALLS} викликів, {args.repeat} запусків\n")
+    with tempfile.TemporaryDirectory() as log_root:
+        # logger_config створює каталог logs у поточному каталозі під час імпорту
+        cwd = os.getcwd()
+        os.chdir(log_root)
+        try:
+            from logger_config import setup_logging, shutdown_logging
+
+            setup_logging(structured=False)
+            # Логер InventoryApp пише лише у файли підсистеми, без консолі
+            queued_logger = logging.getLogger("InventoryApp")
+
+            disabled_logger = logging.getLogger("LoggingBenchmark.disabled")
+            disabled_logger.setLevel(logging.INFO)
+
+            sync_logger = logging.getLogger("LoggingBenchmark.sync")
+            sync_logger.propagate = False
+            sync_logger.setLevel(logging.INFO)
+            sync_handler = logging.FileHandler(os.path.join(log_root, "sync.log"), encoding="utf-8")
+            sync_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+            sync_logger.addHandler(sync_handler)
+
+            cases = disabled_cases(disabled_logger) + emit_cases(sync_logger, queued_logger) + format_cases()
+            try:
+                run_cases(cases, results, args.repeat, args.warmup, args.only)
+            finally:
+                sync_logger.removeHandler(sync_handler)
+                sync_handler.close()
+                shutdown_logging()
+                logging.shutdown()
+        finally:
+            os.chdir(cwd)
+
+    for name, result in results.items():
+        if "error" not in result:
+            result["per_call_ns"] = round(result["p50_ms"] * 1_000_000 / CALLS, 1)
+
+    report = {
+        "commit": git_commit(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "calls": CALLS,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"\nРезультати збережено у {output}")
+
+    return 1 if any("error" in result for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
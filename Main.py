@@ -5,9 +5,16 @@
     - 2. Ініціалізує головне вікно додатка.
     - 3. Відображає головне вікно додатка.
     - 4. Запускає головний цикл обробки подій.
+    - 5. Записує в журнал час від запуску до першого відображення вікна.
 """
 
+import time
+
+# Відлік часу запуску починається до імпорту модулів застосунку
+START_TIME = time.perf_counter()
+
 import sys
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 from InventoryApp import InventoryApp
 import logging
@@ -16,10 +23,21 @@ from logger_config import setup_logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
+
+def report_startup_time():
+    """
+    Функція для запису в журнал часу від запуску до першого відображення головного вікна.
+    Викликається з першої ітерації циклу подій, коли вікно вже показано.
+    """
+    elapsed_ms = (time.perf_counter() - START_TIME) * 1000
+    logger.info(f"Час до першого вікна: {elapsed_ms:.0f} мс")
+
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = InventoryApp()
     window.show()
+    QTimer.singleShot(0, report_startup_time)
 
     exit_code = app.exec()
 
@@ -0,0 +1,650 @@
+"""
+Версійні міграції схеми бази даних.
+
+Кожна міграція — пара (номер версії, опис) та текст SQL. Застосовані версії записуються
+в таблицю schema_migrations, тому кожна міграція виконується один раз. Міграції
+застосовуються по черзі, кожна в окремій транзакції; одночасний запуск кількох клієнтів
+серіалізується рекомендаційним блокуванням (advisory lock). Міграція, SQL якої задано
+кортежем операторів, виконується поза транзакцією по одному оператору — так створюються
+індекси (CREATE INDEX CONCURRENTLY), щоб не блокувати запис у таблиці.
+
+Усі зміни схеми, зокрема тригери зведених таблиць статистики та сповіщень про зміни,
+вносяться лише міграціями. Базова міграція створює таблиці та представлення лише
+за їх відсутності, тому її можна застосовувати і до бази даних, створеної скриптом
+GradeSystem.sql: наявні тригери та дані довідників не змінюються.
+
+Приклад використання:
+    python Migrations.py
+"""
+
+import re
+import sys
+import time
+import traceback
+import logging
+
+import psycopg2
+
+from DBConnection import CHANGE_FEED_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+# Ключ рекомендаційного блокування, що не дає двом клієнтам застосовувати міграції одночасно
+MIGRATION_LOCK_KEY = 7_310_018
+
+# Пауза (у секундах) між спробами отримати блокування міграцій
+MIGRATION_LOCK_POLL = 0.5
+
+# Найдовше очікування (у секундах) блокування міграцій, яке тримає інший клієнт
+MIGRATION_LOCK_TIMEOUT = 120
+
+SCHEMA_MIGRATIONS_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+"""
+
+# Таблиці, довідники та представлення, з якими працює застосунок.
+# Довідники заповнюються, а тригер стану предмета створюється лише в новій базі даних:
+# у базі, створеній скриптом GradeSystem.sql, вони вже є і не змінюються
+BASELINE_SQL = """
+    -- Чи створюється база даних з нуля (перевіряється до створення таблиць)
+    CREATE TEMP TABLE baseline_state ON COMMIT DROP AS
+    SELECT to_regclass('inventory') IS NULL AS fresh;
+
+    CREATE TABLE IF NOT EXISTS categories (
+        category_id SERIAL PRIMARY KEY,
+        category_name VARCHAR(100) NOT NULL UNIQUE
+    );
+
+    CREATE TABLE IF NOT EXISTS availability_statues (
+        status_id SERIAL PRIMARY KEY,
+        status_name VARCHAR(50) NOT NULL UNIQUE
+    );
+
+    CREATE TABLE IF NOT EXISTS conditions (
+        condition_id SERIAL PRIMARY KEY,
+        condition_name VARCHAR(50) NOT NULL UNIQUE
+    );
+
+    CREATE SEQUENCE IF NOT EXISTS inventory_number_seq;
+
+    CREATE TABLE IF NOT EXISTS inventory (
+        item_id SERIAL PRIMARY KEY,
+        inventory_number VARCHAR(20) NOT NULL UNIQUE
+            DEFAULT 'INV-' || lpad(nextval('inventory_number_seq')::TEXT, 6, '0'),
+        item_name VARCHAR(200) NOT NULL,
+        category_id INTEGER REFERENCES categories(category_id),
+        status_id INTEGER REFERENCES availability_statues(status_id),
+        condition_id INTEGER REFERENCES conditions(condition_id),
+        integrity_percentage INTEGER NOT NULL DEFAULT 100 CHECK (integrity_percentage BETWEEN 0 AND 100),
+        purchase_date DATE,
+        item_notes TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS usage_history (
+        history_id SERIAL PRIMARY KEY,
+        item_id INTEGER REFERENCES inventory(item_id) ON DELETE CASCADE,
+        user_name VARCHAR(100),
+        start_date DATE NOT NULL,
+        end_date DATE,
+        returned_date DATE,
+        usage_notes TEXT,
+        is_rental BOOLEAN NOT NULL DEFAULT false
+    );
+
+    DO $$
+    BEGIN
+        IF (SELECT fresh FROM baseline_state) THEN
+            INSERT INTO availability_statues (status_name)
+            VALUES ('Доступний'), ('В оренді'), ('На ремонті'), ('Списаний');
+
+            INSERT INTO conditions (condition_name)
+            VALUES ('Новий'), ('Добрий'), ('Задовільний'), ('Поганий');
+
+            -- Стан предмета визначається за цілісністю
+            CREATE FUNCTION set_inventory_condition() RETURNS trigger AS $fn$
+            BEGIN
+                NEW.condition_id := COALESCE((
+                    SELECT condition_id FROM conditions WHERE condition_name = CASE
+                        WHEN NEW.integrity_percentage >= 90 THEN 'Новий'
+                        WHEN NEW.integrity_percentage >= 60 THEN 'Добрий'
+                        WHEN NEW.integrity_percentage >= 30 THEN 'Задовільний'
+                        ELSE 'Поганий'
+                    END
+                ), NEW.condition_id);
+                RETURN NEW;
+            END;
+            $fn$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER inventory_condition
+                BEFORE INSERT OR UPDATE OF integrity_percentage ON inventory
+                FOR EACH ROW EXECUTE FUNCTION set_inventory_condition();
+        END IF;
+
+        IF to_regclass('inventory_details') IS NULL THEN
+            CREATE VIEW inventory_details AS
+            SELECT
+                i.item_id AS "ID предмету",
+                i.inventory_number AS "Предметний номер",
+                i.item_name AS "Назва предмету",
+                c.category_name AS "Категорія",
+                s.status_name AS "Статус доступності",
+                cnd.condition_name AS "Стан предмету",
+                i.integrity_percentage AS "Цілісність (%)",
+                i.item_notes AS "Примітки"
+            FROM inventory i
+            LEFT JOIN categories c ON c.category_id = i.category_id
+            LEFT JOIN availability_statues s ON s.status_id = i.status_id
+            LEFT JOIN conditions cnd ON cnd.condition_id = i.condition_id;
+        END IF;
+
+        IF to_regclass('rental_items') IS NULL THEN
+            CREATE VIEW rental_items AS
+            SELECT
+                uh.history_id AS "ID оренди",
+                i.inventory_number AS "Номер предмету",
+                i.item_name AS "Назва предмету",
+                uh.user_name AS "Орендар",
+                uh.start_date AS "Початок оренди",
+                uh.end_date AS "Кінець оренди",
+                uh.returned_date AS "Дата повернення",
+                CASE
+                    WHEN uh.returned_date IS NULL AND uh.end_date < CURRENT_DATE THEN 'Протерміновано'
+                    WHEN uh.returned_date IS NULL THEN 'В оренді'
+                    WHEN uh.returned_date > uh.end_date THEN 'Повернено з запізненням'
+                    ELSE 'Повернено'
+                END AS "Статус оренди",
+                uh.usage_notes AS "Примітки"
+            FROM usage_history uh
+            LEFT JOIN inventory i ON i.item_id = uh.item_id
+            WHERE uh.is_rental = true;
+        END IF;
+    END;
+    $$;
+"""
+
+# Індекси для запитів, які виконує застосунок. Створюються без блокування запису (CONCURRENTLY),
+# тому задані кортежем операторів і виконуються поза транзакцією
+HOT_PATH_INDEXES_SQL = (
+    # Історія та вкладка оренд: WHERE is_rental = true ORDER BY start_date
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS usage_history_rental_start_idx ON usage_history (is_rental, start_date DESC)",
+
+    # Перевірка відкритої оренди під час оформлення оренди та пошук протермінованих оренд
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS usage_history_open_item_idx ON usage_history (item_id) "
+    "WHERE is_rental = true AND returned_date IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS usage_history_open_end_date_idx ON usage_history (end_date) "
+    "WHERE is_rental = true AND returned_date IS NULL",
+
+    # З'єднання історії з предметами та каскадне видалення предмета
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS usage_history_item_idx ON usage_history (item_id)",
+
+    # Статистика зносу (ORDER BY integrity_percentage) та фільтри вкладки інвентарю
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS inventory_integrity_idx ON inventory (integrity_percentage)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS inventory_category_idx ON inventory (category_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS inventory_status_idx ON inventory (status_id)",
+
+    "ANALYZE inventory",
+    "ANALYZE usage_history",
+)
+
+# Триграмні індекси для пошуку ILIKE '%текст%' за назвою та інвентарним номером
+TRIGRAM_INDEXES_SQL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS inventory_item_name_trgm_idx ON inventory USING gin (item_name gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS inventory_number_trgm_idx ON inventory USING gin (inventory_number gin_trgm_ops)",
+)
+
+# Найбільша кількість змінених рядків, ID яких передаються в одному сповіщенні.
+# Вміст NOTIFY обмежений 8000 байтами, тому про більші зміни надсилається лише назва таблиці.
+CHANGE_FEED_MAX_ROWS = 250
+
+# Тригери рівня оператора, що надсилають один NOTIFY з ID усіх змінених записів.
+# Замінюють тригери рівня рядка inventory_change_feed та usage_history_change_feed.
+# Вміст сповіщення: {"table": ..., "op": INSERT/UPDATE/DELETE, "item_ids": [...], "history_ids": [...]}
+# або {"table": ..., "op": ..., "truncated": true}, якщо змінено більше CHANGE_FEED_MAX_ROWS рядків.
+# Таблиці переходу не можна задати для тригера з кількома подіями, тому на кожну подію — окремий тригер.
+CHANGE_FEED_SQL = f"""
+    CREATE OR REPLACE FUNCTION notify_inventory_change() RETURNS trigger AS $$
+    DECLARE
+        changed_count BIGINT;
+        item_ids INTEGER[];
+        history_ids INTEGER[];
+        payload JSON;
+    BEGIN
+        IF TG_TABLE_NAME = 'usage_history' THEN
+            SELECT count(*), array_agg(DISTINCT item_id) FILTER (WHERE item_id IS NOT NULL), array_agg(history_id)
+            INTO changed_count, item_ids, history_ids
+            FROM changed_rows;
+        ELSE
+            SELECT count(*), array_agg(item_id)
+            INTO changed_count, item_ids
+            FROM changed_rows;
+        END IF;
+
+        IF changed_count = 0 THEN
+            RETURN NULL;
+        END IF;
+
+        IF changed_count > {CHANGE_FEED_MAX_ROWS} THEN
+            payload := json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'truncated', true);
+        ELSE
+            payload := json_build_object(
+                'table', TG_TABLE_NAME, 'op', TG_OP,
+                'item_ids', COALESCE(item_ids, '{{}}'), 'history_ids', COALESCE(history_ids, '{{}}')
+            );
+        END IF;
+
+        PERFORM pg_notify('{CHANGE_FEED_CHANNEL}', payload::text);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS inventory_change_feed ON inventory;
+    DROP TRIGGER IF EXISTS usage_history_change_feed ON usage_history;
+
+    DROP TRIGGER IF EXISTS inventory_change_feed_insert ON inventory;
+    CREATE TRIGGER inventory_change_feed_insert
+        AFTER INSERT ON inventory REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_inventory_change();
+
+    DROP TRIGGER IF EXISTS inventory_change_feed_update ON inventory;
+    CREATE TRIGGER inventory_change_feed_update
+        AFTER UPDATE ON inventory REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_inventory_change();
+
+    DROP TRIGGER IF EXISTS inventory_change_feed_delete ON inventory;
+    CREATE TRIGGER inventory_change_feed_delete
+        AFTER DELETE ON inventory REFERENCING OLD TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_inventory_change();
+
+    DROP TRIGGER IF EXISTS usage_history_change_feed_insert ON usage_history;
+    CREATE TRIGGER usage_history_change_feed_insert
+        AFTER INSERT ON usage_history REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_inventory_change();
+
+    DROP TRIGGER IF EXISTS usage_history_change_feed_update ON usage_history;
+    CREATE TRIGGER usage_history_change_feed_update
+        AFTER UPDATE ON usage_history REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_inventory_change();
+
+    DROP TRIGGER IF EXISTS usage_history_change_feed_delete ON usage_history;
+    CREATE TRIGGER usage_history_change_feed_delete
+        AFTER DELETE ON usage_history REFERENCING OLD TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_inventory_change();
+"""
+
+# Зведені таблиці для статистики оренд: кількість оренд та запізнень для кожного предмета
+# та для кожного місяця. Тригер на usage_history оновлює їх при кожній зміні запису оренди,
+# а функція refresh_usage_rollups() повністю перераховує їх (початкове заповнення, відновлення).
+ROLLUP_SQL = """
+    CREATE TABLE IF NOT EXISTS usage_item_stats (
+        item_id INTEGER PRIMARY KEY REFERENCES inventory(item_id) ON DELETE CASCADE,
+        rental_count INTEGER NOT NULL DEFAULT 0,
+        late_count INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS usage_item_stats_rental_count_idx ON usage_item_stats (rental_count DESC);
+
+    CREATE TABLE IF NOT EXISTS usage_month_stats (
+        month_start DATE PRIMARY KEY,
+        rental_count INTEGER NOT NULL DEFAULT 0,
+        late_count INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE OR REPLACE FUNCTION maintain_usage_rollups() RETURNS trigger AS $$
+    DECLARE
+        old_late INTEGER;
+        new_late INTEGER;
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            old_late := COALESCE(OLD.returned_date > OLD.end_date, false)::INTEGER;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            new_late := COALESCE(NEW.returned_date > NEW.end_date, false)::INTEGER;
+        END IF;
+
+        -- Зміна приміток та інших полів не впливає на статистику
+        IF TG_OP = 'UPDATE'
+            AND OLD.is_rental = NEW.is_rental
+            AND OLD.item_id IS NOT DISTINCT FROM NEW.item_id
+            AND OLD.start_date = NEW.start_date
+            AND old_late = new_late THEN
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP <> 'INSERT' AND OLD.is_rental THEN
+            UPDATE usage_item_stats
+            SET rental_count = rental_count - 1, late_count = late_count - old_late
+            WHERE item_id = OLD.item_id;
+
+            UPDATE usage_month_stats
+            SET rental_count = rental_count - 1, late_count = late_count - old_late
+            WHERE month_start = date_trunc('month', OLD.start_date)::DATE;
+        END IF;
+
+        IF TG_OP <> 'DELETE' AND NEW.is_rental THEN
+            IF NEW.item_id IS NOT NULL THEN
+                INSERT INTO usage_item_stats (item_id, rental_count, late_count)
+                VALUES (NEW.item_id, 1, new_late)
+                ON CONFLICT (item_id) DO UPDATE
+                SET rental_count = usage_item_stats.rental_count + 1,
+                    late_count = usage_item_stats.late_count + EXCLUDED.late_count;
+            END IF;
+
+            INSERT INTO usage_month_stats (month_start, rental_count, late_count)
+            VALUES (date_trunc('month', NEW.start_date)::DATE, 1, new_late)
+            ON CONFLICT (month_start) DO UPDATE
+            SET rental_count = usage_month_stats.rental_count + 1,
+                late_count = usage_month_stats.late_count + EXCLUDED.late_count;
+        END IF;
+
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION refresh_usage_rollups() RETURNS void AS $$
+    BEGIN
+        -- Блокування змін історії, щоб тригер не оновлював таблиці під час перерахунку
+        LOCK TABLE usage_history IN SHARE MODE;
+
+        DELETE FROM usage_item_stats;
+        INSERT INTO usage_item_stats (item_id, rental_count, late_count)
+        SELECT item_id, COUNT(*), COUNT(*) FILTER (WHERE returned_date > end_date)
+        FROM usage_history
+        WHERE is_rental = true AND item_id IS NOT NULL
+        GROUP BY item_id;
+
+        DELETE FROM usage_month_stats;
+        INSERT INTO usage_month_stats (month_start, rental_count, late_count)
+        SELECT date_trunc('month', start_date)::DATE, COUNT(*), COUNT(*) FILTER (WHERE returned_date > end_date)
+        FROM usage_history
+        WHERE is_rental = true
+        GROUP BY 1;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS usage_history_rollups ON usage_history;
+    CREATE TRIGGER usage_history_rollups
+        AFTER INSERT OR UPDATE OR DELETE ON usage_history
+        FOR EACH ROW EXECUTE FUNCTION maintain_usage_rollups();
+
+    SELECT refresh_usage_rollups();
+"""
+
+# Міграції у порядку застосування: (версія, опис, SQL). Нові міграції додаються лише в кінець списку
+MIGRATIONS = [
+    (1, "Базова схема: таблиці, довідники та представлення", BASELINE_SQL),
+    (2, "Індекси для історії оренд та статистики", HOT_PATH_INDEXES_SQL),
+    (3, "Триграмні індекси для пошуку інвентарю", TRIGRAM_INDEXES_SQL),
+    (4, "Зведені таблиці статистики оренд", ROLLUP_SQL),
+    (5, "Тригери сповіщень про зміни інвентарю та оренд", CHANGE_FEED_SQL),
+]
+
+# Необов'язкові міграції та розширення, яких вони потребують: версія -> назва розширення.
+# Без розширення (або права його створити) міграція пропускається, а наступні застосовуються;
+# пропущена міграція повторюється під час наступного запуску
+OPTIONAL_MIGRATIONS = {3: "pg_trgm"}
+
+# Назва індексу в операторі CREATE INDEX
+INDEX_NAME = re.compile(r"CREATE INDEX CONCURRENTLY IF NOT EXISTS (\w+)", re.IGNORECASE)
+
+
+def applied_versions(cursor):
+    """
+    Функція для отримання номерів уже застосованих міграцій.
+
+    :param cursor: Курсор з'єднання з базою даних.
+
+    :return: Множина номерів версій (порожня, якщо таблиці schema_migrations ще немає).
+    :rtype: set[int]
+    """
+    cursor.execute("SELECT to_regclass('schema_migrations') IS NOT NULL")
+    if not cursor.fetchone()[0]:
+        return set()
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def acquire_migration_lock(cursor, transactional):
+    """
+    Функція для очікування рекомендаційного блокування міграцій.
+
+    Блокування запитується повторно з паузою, а не очікується на сервері: запит, що чекає
+    на блокування, тримав би знімок даних, на завершення якого чекає CREATE INDEX CONCURRENTLY
+    іншого клієнта.
+
+    :param cursor: Курсор з'єднання з базою даних.
+
+    :param transactional: Чи брати блокування до кінця транзакції (інакше — до кінця сесії).
+    :type transactional: bool
+
+    :raise: Exception, якщо блокування не звільнилося за MIGRATION_LOCK_TIMEOUT секунд.
+    """
+    function = "pg_try_advisory_xact_lock" if transactional else "pg_try_advisory_lock"
+    deadline = time.monotonic() + MIGRATION_LOCK_TIMEOUT
+    while True:
+        cursor.execute(f"SELECT {function}(%s)", (MIGRATION_LOCK_KEY,))
+        if cursor.fetchone()[0]:
+            return
+        if time.monotonic() >= deadline:
+            raise Exception(
+                f"Не вдалося отримати блокування міграцій за {MIGRATION_LOCK_TIMEOUT} с: "
+                f"його тримає інший клієнт"
+            )
+        time.sleep(MIGRATION_LOCK_POLL)
+
+
+def extension_available(connection, name):
+    """
+    Функція для перевірки, чи встановлено на сервері розширення PostgreSQL.
+
+    :param connection: З'єднання з базою даних.
+
+    :param name: Назва розширення.
+    :type name: str
+
+    :rtype: bool
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = %s)", (name,))
+        available = cursor.fetchone()[0]
+    if not connection.autocommit:
+        connection.rollback()
+    return available
+
+
+def drop_invalid_index(cursor, statement):
+    """
+    Функція для видалення недобудованого індексу, що лишився після перерваного CREATE INDEX CONCURRENTLY.
+
+    Такий індекс існує, але не використовується, і IF NOT EXISTS пропустив би його створення.
+
+    :param cursor: Курсор з'єднання в режимі autocommit.
+
+    :param statement: Оператор міграції.
+    :type statement: str
+    """
+    match = INDEX_NAME.match(statement)
+    if match is None:
+        return
+    cursor.execute("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", (match.group(1),))
+    row = cursor.fetchone()
+    if row and row[0]:
+        logger.warning(f"Видалення недобудованого індексу {match.group(1)}")
+        cursor.execute(f"DROP INDEX CONCURRENTLY {match.group(1)}")
+
+
+def run_in_transaction(connection, version, description, sql):
+    """
+    Функція для застосування міграції в одній транзакції разом із записом її версії.
+
+    :param connection: З'єднання з базою даних.
+
+    :param version: Номер версії.
+    :type version: int
+
+    :param description: Опис міграції.
+    :type description: str
+
+    :param sql: Текст SQL міграції.
+    :type sql: str
+
+    :return: False, якщо міграцію вже застосував інший клієнт.
+    :rtype: bool
+    """
+    with connection.cursor() as cursor:
+        acquire_migration_lock(cursor, transactional=True)
+        cursor.execute(SCHEMA_MIGRATIONS_SQL)
+        # Інший клієнт міг застосувати міграцію, поки очікували на блокування
+        if version in applied_versions(cursor):
+            connection.rollback()
+            return False
+        cursor.execute(sql)
+        cursor.execute(
+            "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+            (version, description)
+        )
+    connection.commit()
+    return True
+
+
+def run_outside_transaction(connection, version, description, statements):
+    """
+    Функція для застосування міграції поза транзакцією, по одному оператору.
+
+    Потрібна для CREATE INDEX CONCURRENTLY, який не можна виконати в транзакції. Якщо міграцію
+    перервано, вже виконані оператори не відкочуються, тому вони мають бути ідемпотентними
+    (IF NOT EXISTS): під час наступного запуску міграція виконується повторно.
+
+    :param connection: З'єднання з базою даних.
+
+    :param version: Номер версії.
+    :type version: int
+
+    :param description: Опис міграції.
+    :type description: str
+
+    :param statements: Оператори SQL міграції.
+    :type statements: tuple[str]
+
+    :return: False, якщо міграцію вже застосував інший клієнт.
+    :rtype: bool
+    """
+    connection.autocommit = True
+    try:
+        with connection.cursor() as cursor:
+            acquire_migration_lock(cursor, transactional=False)
+            try:
+                cursor.execute(SCHEMA_MIGRATIONS_SQL)
+                if version in applied_versions(cursor):
+                    return False
+                for statement in statements:
+                    drop_invalid_index(cursor, statement)
+                    cursor.execute(statement)
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                    (version, description)
+                )
+                return True
+            finally:
+                if not connection.closed:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+    finally:
+        if not connection.closed:
+            connection.autocommit = False
+
+
+def apply_migrations(db, migrations=MIGRATIONS):
+    """
+    Функція для застосування всіх ще не застосованих міграцій.
+
+    Якщо схема актуальна, виконується лише один запит. Кожна міграція виконується в окремій
+    транзакції разом із записом її версії (міграції з кортежем операторів — поза транзакцією,
+    див. run_outside_transaction); після першої невдалої міграції наступні не застосовуються,
+    бо можуть від неї залежати. Невдала необов'язкова міграція (OPTIONAL_MIGRATIONS) лише
+    записується в журнал.
+
+    :param db: Підключення до бази даних.
+    :type db: DBConnection
+
+    :param migrations: Міграції (версія, опис, SQL) у порядку застосування.
+    :type migrations: list[tuple]
+
+    :return: Номери застосованих під час виклику версій.
+    :rtype: list[int]
+
+    :raise: Exception, якщо міграцію не вдалося застосувати.
+    """
+    applied = []
+    with db.borrow_connection() as connection:
+        with connection.cursor() as cursor:
+            done = applied_versions(cursor)
+        connection.rollback()
+
+        for version, description, sql in migrations:
+            if version in done:
+                continue
+            extension = OPTIONAL_MIGRATIONS.get(version)
+            if extension is not None and not extension_available(connection, extension):
+                logger.warning(f"Міграцію {version} пропущено: розширення {extension} не встановлено на сервері")
+                continue
+            logger.info(f"Застосування міграції {version}: {description}")
+            start = time.perf_counter()
+            try:
+                if isinstance(sql, tuple):
+                    ran = run_outside_transaction(connection, version, description, sql)
+                else:
+                    ran = run_in_transaction(connection, version, description, sql)
+            except Exception as e:
+                if not connection.closed and not connection.autocommit:
+                    connection.rollback()
+                # Помилку сервера (немає права створити розширення) пропускаємо, а вичерпаний час
+                # очікування блокування — ні: тоді не застосувалися б і наступні міграції
+                if extension is not None and isinstance(e, psycopg2.Error):
+                    logger.warning(f"Необов'язкову міграцію {version} пропущено: {e}")
+                    continue
+                logger.error(f"Помилка застосування міграції {version}: {e}")
+                logger.error(f"Деталі:\n{traceback.format_exc()}")
+                raise Exception(f"Не вдалося застосувати міграцію {version} ({description}): {str(e)}")
+
+            if not ran:
+                continue
+            applied.append(version)
+            logger.info(f"Міграцію {version} застосовано за {time.perf_counter() - start:.2f} с")
+
+    if applied:
+        db.invalidate_cache("categories", "availability_statues", "conditions", "inventory", "usage_history")
+    else:
+        logger.debug("Схема бази даних актуальна")
+    return applied
+
+
+def main():
+    """
+    Функція для застосування міграцій з командного рядка.
+
+    :return: Код завершення: 0 — міграції застосовано, 1 — помилка.
+    :rtype: int
+    """
+    from DBConnection import DBConnection
+
+    db = DBConnection(min_connections=1, max_connections=1)
+    try:
+        applied = apply_migrations(db)
+    except Exception as e:
+        print(f"ПОМИЛКА: {e}")
+        return 1
+    finally:
+        db.disconnect()
+
+    if applied:
+        print(f"Застосовано міграції: {', '.join(map(str, applied))}")
+    else:
+        print("Схема бази даних актуальна")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class QueryCache:
+    """
+    Клас, що відповідає за кеш результатів запитів до бази даних.
+
+    Результати зберігаються за ключем (текст запиту, параметри) протягом заданого часу (TTL).
+    Коли кількість записів перевищує max_entries, видаляються записи, які найдовше
+    не використовувались (LRU). Для кожного запису зберігаються таблиці, з яких він
+    прочитаний: зміна таблиці видаляє всі залежні записи. Кеш можна використовувати
+    з кількох потоків одночасно.
+
+    Attributes:
+        max_entries: Максимальна кількість записів у кеші
+        default_ttl: Час життя запису за замовчуванням (у секундах)
+        hits: Кількість запитів, результат яких знайдено в кеші
+        misses: Кількість запитів, результату яких не було в кеші
+    """
+    def __init__(self, max_entries=256, default_ttl=60):
+        """
+        Метод для ініціалізації порожнього кешу.
+
+        :param max_entries: Максимальна кількість записів.
+        :type max_entries: int
+
+        :param default_ttl: Час життя запису за замовчуванням (у секундах).
+        :type default_ttl: float
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query, params=None):
+        """
+        Метод для побудови ключа кешу з тексту запиту та параметрів.
+
+        :param query: Текст запиту.
+        :type query: str
+
+        :param params: Параметри запиту (можуть містити списки).
+        :type params: tuple, optional
+
+        :rtype: tuple
+        """
+        return query, repr(params)
+
+    def get(self, key):
+        """
+        Метод для отримання результату з кешу.
+
+        :param key: Ключ, побудований методом make_key.
+        :type key: tuple
+
+        :return: Пара (чи знайдено запис, копія результату).
+        :rtype: tuple
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[2]
+        # Викликаючий код може змінювати результат, тому повертається копія
+        return True, value.copy() if hasattr(value, "copy") else value
+
+    def put(self, key, value, tables, ttl=None):
+        """
+        Метод для збереження результату запиту.
+
+        :param key: Ключ, побудований методом make_key.
+        :type key: tuple
+
+        :param value: Результат запиту.
+
+        :param tables: Таблиці, з яких прочитано результат.
+        :type tables: tuple[str]
+
+        :param ttl: Час життя запису (у секундах), за замовчуванням default_ttl.
+        :type ttl: float, optional
+        """
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        stored = value.copy() if hasattr(value, "copy") else value
+        with self._lock:
+            self._entries[key] = (expires_at, frozenset(tables), stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *tables):
+        """
+        Метод для видалення записів, прочитаних з указаних таблиць.
+
+        :param tables: Назви змінених таблиць.
+        :type tables: str
+
+        :return: Кількість видалених записів.
+        :rtype: int
+        """
+        changed = set(tables)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[1] & changed]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logger.debug(f"Кеш запитів: видалено {len(stale)} записів для таблиць {sorted(changed)}")
+        return len(stale)
+
+    def clear(self):
+        """
+        Метод для видалення всіх записів кешу.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
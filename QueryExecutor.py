@@ -0,0 +1,239 @@
+import logging
+import traceback
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from QueryStats import query_source
+
+logger = logging.getLogger(__name__)
+
+class QuerySignals(QObject):
+    """
+    Клас із сигналами, через які фонове завдання повертає результат у потік інтерфейсу.
+
+    Attributes:
+        finished: Сигнал (ключ, номер завдання, результат) при успішному виконанні
+        failed: Сигнал (ключ, номер завдання, виняток) при помилці
+        progress: Сигнал (ключ, номер завдання, проміжний результат) під час виконання
+    """
+    finished = pyqtSignal(str, int, object)
+    failed = pyqtSignal(str, int, object)
+    progress = pyqtSignal(str, int, object)
+
+
+class QueryTask(QRunnable):
+    """
+    Клас, що відповідає за виконання однієї функції (запиту до бази даних) у пулі потоків.
+    """
+    def __init__(self, signals, key, token, fn, args, kwargs, with_progress=False, source=None):
+        """
+        Метод для ініціалізації фонового завдання.
+
+        :param signals: Об'єкт сигналів виконавця.
+        :type signals: QuerySignals
+
+        :param key: Ключ завантаження (наприклад, назва вкладки).
+        :type key: str
+
+        :param token: Номер завдання в межах ключа.
+        :type token: int
+
+        :param fn: Функція, що виконується у фоновому потоці.
+        :type fn: callable
+
+        :param args: Позиційні аргументи функції.
+        :type args: tuple
+
+        :param kwargs: Іменовані аргументи функції.
+        :type kwargs: dict
+
+        :param with_progress: Чи передавати функції аргумент progress для проміжних результатів.
+        :type with_progress: bool
+
+        :param source: Назва джерела, якою позначаються запити завдання в статистиці запитів.
+        :type source: str, optional
+        """
+        super().__init__()
+        self.signals = signals
+        self.key = key
+        self.token = token
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.with_progress = with_progress
+        self.source = source or key
+
+    def run(self):
+        """
+        Метод, що виконує функцію та надсилає результат або виняток сигналом.
+        """
+        kwargs = self.kwargs
+        if self.with_progress:
+            # Функція надсилає проміжні результати (наприклад, частини великої вибірки)
+            kwargs = dict(kwargs, progress=lambda value: self._emit(self.signals.progress, value))
+        try:
+            with query_source(self.source):
+                result = self.fn(*self.args, **kwargs)
+        except Exception as e:
+            logger.error(f"Помилка фонового завантаження '{self.key}': {e}")
+            logger.debug(traceback.format_exc())
+            self._emit(self.signals.failed, e)
+            return
+        self._emit(self.signals.finished, result)
+
+    def _emit(self, signal, value):
+        """
+        Метод для надсилання сигналу, якщо виконавця ще не знищено.
+        """
+        try:
+            signal.emit(self.key, self.token, value)
+        except RuntimeError:
+            # Вікно, що запустило завантаження, вже закрито
+            logger.debug(f"Результат завантаження '{self.key}' відкинуто: отримувача знищено")
+
+
+class QueryExecutor(QObject):
+    """
+    Клас, що відповідає за виконання запитів до бази даних поза потоком інтерфейсу.
+
+    Результати повертаються у потік інтерфейсу через сигнали. Для кожного ключа
+    зберігається номер останнього завдання: якщо користувач запустив нове завантаження,
+    результати попередніх відкидаються. Зміни даних запускаються з drop_stale=False:
+    кожна з них змінює базу даних, тому обробники викликаються для всіх завдань.
+
+    Attributes:
+        started: Сигнал з ключем, коли для нього розпочато завантаження
+        idle: Сигнал з ключем, коли останнє завантаження для нього завершено
+    """
+    started = pyqtSignal(str)
+    idle = pyqtSignal(str)
+
+    def __init__(self, parent=None, thread_pool=None):
+        """
+        Метод для ініціалізації виконавця.
+
+        :param parent: Батьківський об'єкт.
+
+        :param thread_pool: Пул потоків (за замовчуванням — глобальний пул Qt).
+        :type thread_pool: QThreadPool, optional
+        """
+        super().__init__(parent)
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+
+        self._signals = QuerySignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._signals.progress.connect(self._on_progress)
+
+        self._tokens = {}
+        self._callbacks = {}
+        # Обробники завдань, результати яких не відкидаються: (ключ, номер) -> обробники
+        self._pending = {}
+        # Запити позначаються в статистиці назвою вікна та ключем завантаження
+        self._owner = type(parent).__name__ if parent is not None else None
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, on_progress=None, drop_stale=True, **kwargs):
+        """
+        Метод для запуску функції у фоновому потоці.
+
+        :param key: Ключ завантаження; новіше завдання з тим самим ключем робить попередні застарілими.
+        :type key: str
+
+        :param fn: Функція, що виконується у фоновому потоці.
+        :type fn: callable
+
+        :param on_result: Функція, що викликається у потоці інтерфейсу з результатом.
+        :type on_result: callable, optional
+
+        :param on_error: Функція, що викликається у потоці інтерфейсу з винятком.
+        :type on_error: callable, optional
+
+        :param on_progress: Функція, що викликається у потоці інтерфейсу з кожним проміжним результатом.
+            Якщо її задано, fn отримує іменований аргумент progress — функцію для надсилання цих результатів.
+        :type on_progress: callable, optional
+
+        :param drop_stale: Чи відкидати результат, якщо з тим самим ключем запущено новіше завдання.
+            Для змін даних передається False: обробники викликаються для кожного завдання.
+        :type drop_stale: bool
+
+        :return: Номер завдання.
+        :rtype: int
+        """
+        token = self._tokens.get(key, 0) + 1
+        self._tokens[key] = token
+        if drop_stale:
+            self._callbacks[key] = (token, on_result, on_error, on_progress)
+        else:
+            self._pending[(key, token)] = (token, on_result, on_error, on_progress)
+
+        logger.debug(f"Фонове завантаження '{key}' #{token}")
+        self.started.emit(key)
+        source = f"{self._owner}.{key}" if self._owner else key
+        self.thread_pool.start(QueryTask(self._signals, key, token, fn, args, kwargs, on_progress is not None, source))
+        return token
+
+    def is_busy(self, key):
+        """
+        Метод для перевірки, чи виконується завантаження для ключа.
+
+        :param key: Ключ завантаження.
+        :type key: str
+
+        :rtype: bool
+        """
+        return key in self._callbacks or any(pending_key == key for pending_key, _ in self._pending)
+
+    def _entry(self, key, token):
+        """
+        Метод для пошуку обробників завдання, якщо його результат не застарів.
+
+        :return: Кортеж (номер, on_result, on_error, on_progress) або None.
+        """
+        entry = self._pending.get((key, token))
+        if entry is None:
+            entry = self._callbacks.get(key)
+        if entry is None or entry[0] != token:
+            return None
+        return entry
+
+    def _take_callbacks(self, key, token):
+        """
+        Метод для отримання обробників результату, якщо завдання не застаріло.
+
+        :return: Пара (on_result, on_error) або None для застарілого результату.
+        """
+        entry = self._entry(key, token)
+        if entry is None:
+            logger.debug(f"Застарілий результат '{key}' #{token} відкинуто")
+            return None
+        if self._pending.pop((key, token), None) is None:
+            del self._callbacks[key]
+        if not self.is_busy(key):
+            self.idle.emit(key)
+        return entry[1], entry[2]
+
+    def _on_progress(self, key, token, value):
+        """
+        Обробник проміжного результату фонового завдання.
+        """
+        entry = self._entry(key, token)
+        if entry is None:
+            return
+        if entry[3] is not None:
+            entry[3](value)
+
+    def _on_finished(self, key, token, result):
+        """
+        Обробник успішного завершення фонового завдання.
+        """
+        callbacks = self._take_callbacks(key, token)
+        if callbacks and callbacks[0] is not None:
+            callbacks[0](result)
+
+    def _on_failed(self, key, token, error):
+        """
+        Обробник помилки фонового завдання.
+        """
+        callbacks = self._take_callbacks(key, token)
+        if callbacks and callbacks[1] is not None:
+            callbacks[1](error)
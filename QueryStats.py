@@ -0,0 +1,296 @@
+import json
+import logging
+import re
+import threading
+import zlib
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Кількість останніх вимірювань кожного запиту, за якими рахується p95
+RECENT_SAMPLES = 200
+
+# Допустимі ключі сортування звіту
+SORT_KEYS = ("total_ms", "count", "max_ms", "p95_ms", "rows")
+
+_context = threading.local()
+
+
+@contextmanager
+def query_source(name):
+    """
+    Контекстний менеджер, що позначає запити поточного потоку джерелом (вкладкою, формою).
+
+    QueryExecutor позначає так кожне фонове завантаження його ключем.
+
+    :param name: Назва джерела запитів.
+    :type name: str
+    """
+    previous = getattr(_context, "source", None)
+    _context.source = name
+    try:
+        yield
+    finally:
+        _context.source = previous
+
+
+def current_source():
+    """
+    Функція для отримання джерела запитів поточного потоку.
+
+    :return: Назва джерела або None.
+    :rtype: str, optional
+    """
+    return getattr(_context, "source", None)
+
+
+@lru_cache(maxsize=1024)
+def normalize_query(query):
+    """
+    Функція для зведення тексту запиту до загального вигляду.
+
+    Коментарі видаляються, пробіли стискаються, а рядкові та числові літерали
+    замінюються на ?, тому запити, що відрізняються лише значеннями, об'єднуються.
+
+    :param query: Текст запиту.
+    :type query: str
+
+    :rtype: str
+    """
+    text = re.sub(r"--[^\n]*", " ", query)
+    text = re.sub(r"'(?:[^']|'')*'", "?", text)
+    text = re.sub(r"(?<![\w$])\d+(?:\.\d+)?\b", "?", text)
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=1024)
+def query_id(query):
+    """
+    Функція для отримання короткого ідентифікатора запиту.
+
+    Ідентифікатор обчислюється з нормалізованого тексту, тому однаковий для запитів,
+    що відрізняються лише значеннями. Ним позначаються записи журналу про запит
+    та рядки звіту QueryStats.
+
+    :param query: Текст запиту.
+    :type query: str
+
+    :return: Вісім шістнадцяткових цифр.
+    :rtype: str
+    """
+    return f"{zlib.crc32(normalize_query(query).encode('utf-8')):08x}"
+
+
+class StatementStats:
+    """
+    Клас, що відповідає за накопичену статистику одного нормалізованого запиту.
+
+    Attributes:
+        count: Кількість виконань (без результатів з кешу)
+        errors: Кількість виконань, що завершилися помилкою
+        cache_hits: Кількість результатів, отриманих з кешу
+        execute_s: Сумарний час виконання на сервері (у секундах)
+        fetch_s: Сумарний час отримання рядків
+        build_s: Сумарний час побудови DataFrame
+        max_s: Найдовше виконання
+        rows: Сумарна кількість рядків
+        max_rows: Найбільша кількість рядків за одне виконання
+        recent: Час останніх виконань для обчислення p95
+        sources: Кількість виконань за джерелами (вкладками, формами)
+    """
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.execute_s = 0.0
+        self.fetch_s = 0.0
+        self.build_s = 0.0
+        self.max_s = 0.0
+        self.rows = 0
+        self.max_rows = 0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+        self.sources = Counter()
+
+    def as_dict(self, query):
+        """
+        Метод для перетворення статистики на словник для звіту.
+
+        :param query: Нормалізований текст запиту.
+        :type query: str
+
+        :rtype: dict
+        """
+        total_s = self.execute_s + self.fetch_s + self.build_s
+        recent = sorted(self.recent)
+        p95_s = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "query_id": query_id(query),
+            "query": query,
+            "count": self.count,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "total_ms": round(total_s * 1000, 3),
+            "avg_ms": round(total_s * 1000 / self.count, 3) if self.count else 0.0,
+            "p95_ms": round(p95_s * 1000, 3),
+            "max_ms": round(self.max_s * 1000, 3),
+            "execute_ms": round(self.execute_s * 1000, 3),
+            "fetch_ms": round(self.fetch_s * 1000, 3),
+            "build_ms": round(self.build_s * 1000, 3),
+            "rows": self.rows,
+            "max_rows": self.max_rows,
+            "sources": dict(self.sources.most_common()),
+        }
+
+
+class QueryStats:
+    """
+    Клас, що відповідає за вимірювання часу та кількості рядків кожного запиту до бази даних.
+
+    Статистика накопичується в пам'яті окремо для кожного нормалізованого запиту
+    (див. normalize_query) і показує, які запити найповільніші або найчастіші та
+    з яких вкладок і форм вони виконуються. Використовується з кількох потоків одночасно.
+
+    Attributes:
+        slow_query_ms: Поріг (у мілісекундах), після якого запит записується в журнал як повільний
+        started_at: Час початку збору статистики
+    """
+    def __init__(self, slow_query_ms=500):
+        """
+        Метод для ініціалізації порожньої статистики.
+
+        :param slow_query_ms: Поріг повільного запиту (None — не записувати повільні запити).
+        :type slow_query_ms: float, optional
+        """
+        self.slow_query_ms = slow_query_ms
+        self.started_at = datetime.now()
+
+        self._statements = {}
+        self._lock = threading.Lock()
+
+    def record(self, query, execute_s=0.0, fetch_s=0.0, build_s=0.0, rows=0, cached=False, failed=False):
+        """
+        Метод для запису одного виконання запиту.
+
+        :param query: Текст запиту.
+        :type query: str
+
+        :param execute_s: Час виконання запиту на сервері (у секундах).
+        :type execute_s: float
+
+        :param fetch_s: Час отримання рядків.
+        :type fetch_s: float
+
+        :param build_s: Час побудови DataFrame.
+        :type build_s: float
+
+        :param rows: Кількість отриманих або змінених рядків.
+        :type rows: int
+
+        :param cached: Чи отримано результат з кешу (час не враховується).
+        :type cached: bool
+
+        :param failed: Чи завершилося виконання помилкою.
+        :type failed: bool
+        """
+        key = normalize_query(query)
+        source = current_source() or "—"
+        total_s = execute_s + fetch_s + build_s
+
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                stats = self._statements[key] = StatementStats()
+            stats.sources[source] += 1
+            if cached:
+                stats.cache_hits += 1
+                return
+            stats.count += 1
+            stats.errors += failed
+            stats.execute_s += execute_s
+            stats.fetch_s += fetch_s
+            stats.build_s += build_s
+            stats.max_s = max(stats.max_s, total_s)
+            stats.rows += rows
+            stats.max_rows = max(stats.max_rows, rows)
+            stats.recent.append(total_s)
+
+        if self.slow_query_ms is not None and total_s * 1000 >= self.slow_query_ms:
+            logger.warning(
+                "Повільний запит (%s): %.0f мс (виконання %.0f, отримання %.0f, DataFrame %.0f), рядків %d: %s",
+                source, total_s * 1000, execute_s * 1000, fetch_s * 1000, build_s * 1000, rows, key[:200],
+                extra={"query_id": query_id(key), "duration_ms": round(total_s * 1000, 3), "rows": rows,
+                       "source": source}
+            )
+
+    def snapshot(self, sort_by="total_ms", limit=None):
+        """
+        Метод для отримання статистики всіх запитів.
+
+        :param sort_by: Ключ сортування за спаданням (один з SORT_KEYS).
+        :type sort_by: str
+
+        :param limit: Максимальна кількість запитів (None — усі).
+        :type limit: int, optional
+
+        :return: Словники статистики (див. StatementStats.as_dict).
+        :rtype: list[dict]
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Невідомий ключ сортування '{sort_by}', очікується один з {SORT_KEYS}")
+        with self._lock:
+            rows = [stats.as_dict(query) for query, stats in self._statements.items()]
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows[:limit] if limit is not None else rows
+
+    def format_report(self, limit=10):
+        """
+        Метод для побудови текстового звіту з найповільнішими та найчастішими запитами.
+
+        :param limit: Кількість запитів у кожному розділі.
+        :type limit: int
+
+        :rtype: str
+        """
+        lines = [f"Статистика запитів з {self.started_at:%Y-%m-%d %H:%M:%S}"]
+        for title, sort_by in (("Найбільший сумарний час", "total_ms"),
+                               ("Найповільніші (p95)", "p95_ms"),
+                               ("Найчастіші", "count")):
+            lines.append(f"\n{title}:")
+            for row in self.snapshot(sort_by, limit):
+                sources = ", ".join(f"{name}×{count}" for name, count in row["sources"].items())
+                lines.append(
+                    f"  {row['count']:>6}× сум. {row['total_ms']:>10.1f} мс  p95 {row['p95_ms']:>8.1f} мс  "
+                    f"макс. {row['max_ms']:>8.1f} мс  рядків {row['rows']:>9}  [{sources}]  {row['query'][:120]}"
+                )
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """
+        Метод для збереження статистики у файл JSON.
+
+        :param path: Шлях до файлу.
+        :type path: str
+        """
+        report = {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "dumped_at": datetime.now().isoformat(timespec="seconds"),
+            "statements": self.snapshot(),
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        logger.info(f"Статистику {len(report['statements'])} запитів збережено у {path}")
+
+    def reset(self):
+        """
+        Метод для очищення накопиченої статистики.
+        """
+        with self._lock:
+            self._statements.clear()
+        self.started_at = datetime.now()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._statements)
@@ -0,0 +1,161 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QLabel,
+    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox
+)
+from PyQt6.QtCore import Qt
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Колонки таблиці: (заголовок, ключ статистики запиту)
+COLUMNS = [
+    ("Джерела", "sources"),
+    ("Кількість", "count"),
+    ("Сум. час, мс", "total_ms"),
+    ("Сер., мс", "avg_ms"),
+    ("p95, мс", "p95_ms"),
+    ("Макс., мс", "max_ms"),
+    ("Виконання, мс", "execute_ms"),
+    ("Отримання, мс", "fetch_ms"),
+    ("DataFrame, мс", "build_ms"),
+    ("Рядків", "rows"),
+    ("З кешу", "cache_hits"),
+    ("Помилок", "errors"),
+    ("Запит", "query"),
+]
+
+SORT_OPTIONS = [
+    ("Сумарний час", "total_ms"),
+    ("Найповільніші (p95)", "p95_ms"),
+    ("Найдовше виконання", "max_ms"),
+    ("Найчастіші", "count"),
+    ("Найбільше рядків", "rows"),
+]
+
+
+class QueryStatsDialog(QDialog):
+    """
+    Клас, що відповідає за вікно діагностики запитів до бази даних.
+
+    Показує накопичену статистику QueryStats: для кожного запиту — кількість виконань,
+    час виконання, отримання рядків і побудови DataFrame, а також вкладки й форми,
+    з яких його виконано.
+    """
+    def __init__(self, stats, parent=None):
+        """
+        Метод для ініціалізації вікна діагностики.
+
+        :param stats: Статистика запитів.
+        :type stats: QueryStats
+
+        :param parent: Батьківське вікно.
+        """
+        super().__init__(parent)
+        self.stats = stats
+
+        logger.info("Відкриття вікна статистики запитів")
+
+        self.setWindowTitle("Статистика запитів")
+        self.resize(1100, 600)
+
+        self.init_ui()
+        self.refresh()
+
+    def init_ui(self):
+        """
+        Метод для ініціалізації UI вікна.
+        Створює вибір сортування, таблицю запитів та кнопки.
+        """
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        top_layout = QHBoxLayout()
+        self.summary_label = QLabel()
+        top_layout.addWidget(self.summary_label)
+        top_layout.addStretch()
+
+        top_layout.addWidget(QLabel("Сортування:"))
+        self.sort_combo = QComboBox()
+        for title, key in SORT_OPTIONS:
+            self.sort_combo.addItem(title, key)
+        self.sort_combo.currentIndexChanged.connect(self.refresh)
+        top_layout.addWidget(self.sort_combo)
+        layout.addLayout(top_layout)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+
+        refresh_button = QPushButton("Оновити")
+        refresh_button.clicked.connect(self.refresh)
+        button_layout.addWidget(refresh_button)
+
+        reset_button = QPushButton("Скинути")
+        reset_button.setAccessibleName("Очистити накопичену статистику запитів")
+        reset_button.clicked.connect(self.reset_stats)
+        button_layout.addWidget(reset_button)
+
+        save_button = QPushButton("Зберегти у файл")
+        save_button.setAccessibleName("Зберегти статистику запитів у файл JSON")
+        save_button.clicked.connect(self.save_stats)
+        button_layout.addWidget(save_button)
+
+        button_layout.addStretch()
+
+        close_button = QPushButton("Закрити")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(close_button)
+
+        layout.addLayout(button_layout)
+
+    def refresh(self):
+        """
+        Метод для заповнення таблиці поточною статистикою.
+        """
+        rows = self.stats.snapshot(self.sort_combo.currentData())
+        self.summary_label.setText(
+            f"Запитів: {len(rows)}, виконань: {sum(row['count'] for row in rows)} "
+            f"(з {self.stats.started_at:%d.%m.%Y %H:%M:%S})"
+        )
+
+        self.table.setRowCount(len(rows))
+        for row_number, row in enumerate(rows):
+            for col, (_, key) in enumerate(COLUMNS):
+                value = row[key]
+                if key == "sources":
+                    value = ", ".join(f"{name} ×{count}" for name, count in value.items())
+                item = QTableWidgetItem(str(value))
+                if key != "sources" and key != "query":
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                if key == "query":
+                    item.setToolTip(value)
+                self.table.setItem(row_number, col, item)
+        logger.debug(f"Показано статистику {len(rows)} запитів")
+
+    def reset_stats(self):
+        """
+        Метод для очищення накопиченої статистики.
+        """
+        logger.info("Статистику запитів скинуто")
+        self.stats.reset()
+        self.refresh()
+
+    def save_stats(self):
+        """
+        Метод для збереження статистики у файл JSON, вибраний користувачем.
+        """
+        path, _ = QFileDialog.getSaveFileName(self, "Зберегти статистику запитів", "query_stats.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.stats.dump(path)
+        except OSError as e:
+            logger.error(f"Помилка збереження статистики запитів: {e}")
+            QMessageBox.critical(self, "Помилка", f"Не вдалося зберегти файл: {str(e)}")
@@ -1,5 +1,3 @@
-import traceback
-
 from PyQt6.QtCore import QDate
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout,
@@ -9,6 +7,7 @@ from PyQt6.QtWidgets import (
 
 import logging
 from DBConnection import DBConnection
+from QueryExecutor import QueryExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +15,7 @@ class RentalForm(QDialog):
     """
     Клас, що відповідає за форму оренди предмета інвентарю.
     """
-    def __init__(self, db: DBConnection, item_id=None):
+    def __init__(self, db: DBConnection, item_id=None, items=None):
         """
         Метод для ініціалізації вікна оренди.
 
@@ -25,17 +24,23 @@ class RentalForm(QDialog):
 
         :param item_id: ID предмета для оренди.
         :type item_id: int, optional
+
+        :param items: Пари (інвентарний номер, назва) предметів для групової оренди.
+            Дані цих предметів вже відомі, тому форма не запитує їх з бази даних.
+        :type items: list[tuple], optional
         """
         super().__init__()
         self.db = db
         self.item_id = item_id
+        self.items = items
+        self.executor = QueryExecutor(self)
 
-        mode = "оренди" if item_id else "повернення"
+        mode = "оренди" if item_id or items else "повернення"
         logger.info(f"Ініціалізація форми {mode}")
         self.setWindowTitle("Оренда предмету" if item_id else "Повернення предмету")
         self.setMinimumWidth(400)
 
-        logger.debug(f"Параметри: item_id={item_id}, режим={mode}")
+        logger.debug("Параметри: item_id=%s, режим=%s", item_id, mode)
 
         self.init_ui()
         self.load_item_data()
@@ -47,7 +52,7 @@ class RentalForm(QDialog):
         Метод для ініціалізації UI форми.
         Створює поля для введення імені орендаря, дати початку/кінця оренди, приміток.
         """
-        logger.debug(f"Створення UI форми оренди/повернення")
+        logger.debug("Створення UI форми оренди/повернення")
 
         layout = QVBoxLayout()
         self.setLayout(layout)
@@ -70,7 +75,7 @@ class RentalForm(QDialog):
         self.start_date_edit.setDate(QDate.currentDate())
         self.start_date_edit.setCalendarPopup(True)
         form_layout.addRow("Початок оренди:", self.start_date_edit)
-        logger.debug(f"Поле 'Початок оренди' створено")
+        logger.debug("Поле 'Початок оренди' створено")
 
         # Дата кінця оренди
         self.end_date_edit = QDateEdit()
@@ -97,45 +102,66 @@ class RentalForm(QDialog):
 
     def load_item_data(self):
         """
-        Метод для завантаження та відображення інформації про предмет для оренди.
-        Показує номер, назву та статус предмета.
-
-        :raise: Exception, якщо виникла помилка завантаження даних.
+        Метод для завантаження інформації про предмет для оренди у фоновому потоці.
         """
-        if self.item_id is not None:
+        if self.items:
+            logger.info(f"Групова оренда {len(self.items)} предметів")
+            self.setWindowTitle("Оренда предметів")
+            names = [f"{name} ({number})" for number, name in self.items]
+            shown = "\n".join(names[:10])
+            if len(names) > 10:
+                shown += f"\n… та ще {len(names) - 10}"
+            self.item_info_label.setText(f"Предметів: {len(names)}\n{shown}")
+        elif self.item_id is not None:
             logger.info(f"Завантаження даних предмету з ID={self.item_id} для оренди")
+            self.item_info_label.setText("Завантаження даних предмету…")
+
+            query = """
+                SELECT i.inventory_number, i.item_name, s.status_name
+                FROM inventory i
+                JOIN availability_statues s ON i.status_id = s.status_id
+                WHERE i.item_id = %s
+            """
+            self.executor.submit(
+                "item", self.db.execute_query, query, (self.item_id,), fetch=True, prepared=True,
+                on_result=self.show_item_data, on_error=self.show_load_error
+            )
+
+    def show_item_data(self, result):
+        """
+        Метод для відображення інформації про предмет для оренди.
+        Показує номер, назву та статус предмета.
 
-            try:
-                query = """
-                    SELECT i.inventory_number, i.item_name, s.status_name
-                    FROM inventory i
-                    JOIN availability_statues s ON i.status_id = s.status_id
-                    WHERE i.item_id = %s
-                """
-                result = self.db.execute_query(query, (self.item_id,), fetch=True)
+        :param result: Результат запиту даних предмета.
+        :type result: list[tuple]
+        """
+        if result:
+            item_data = result[0]
+            logger.debug("Отримано дані предмету: номер='%s', назва='%s', статус='%s'", item_data[0], item_data[1], item_data[2])
 
-                if result:
-                    item_data = result[0]
-                    logger.debug(f"Отримано дані предмету: номер='{item_data[0]}', назва='{item_data[1]}', статус='{item_data[2]}'")
 
+            self.item_info_label.setText(
+                f"Предмет: {item_data[1]} ({item_data[0]})\n"
+                f"Статус: {item_data[2]}"
+            )
+            if item_data[2] != "Доступний":
+                logger.warning(f"Предмет {self.item_id} має статус '{item_data[2]}', а не 'Доступний'")
 
-                    self.item_info_label.setText(
-                        f"Предмет: {item_data[1]} ({item_data[0]})\n"
-                        f"Статус: {item_data[2]}"
-                    )
-                    if item_data[2] != "Доступний":
-                        logger.warning(f"Предмет {self.item_id} має статус '{item_data[2]}', а не 'Доступний'")
+            logger.info(f"Дані предмету {self.item_id} завантажено")
 
-                    logger.info(f"Дані предмету {self.item_id} завантажено")
+        else:
+            logger.warning(f"Предмет з ID={self.item_id} не знайдено в базі даних")
+            self.item_info_label.setText(f"Предмет з ID={self.item_id} не знайдено")
 
-                else:
-                    logger.warning(f"Предмет з ID={self.item_id} не знайдено в базі даних")
-                    self.item_info_label.setText(f"Предмет з ID={self.item_id} не знайдено")
+    def show_load_error(self, error):
+        """
+        Обробник помилки завантаження даних предмета.
 
-            except Exception as e:
-                logger.error(f"Помилка завантаження даних предмету з ID= {self.item_id}: {e}")
-                logger.error(f"Деталі:\n{traceback.format_exc()}")
-                QMessageBox.critical(self, "Помилка", f"Не вдалося завантажити дані: {str(e)}")
+        :param error: Виняток, що виник під час завантаження.
+        :type error: Exception
+        """
+        logger.error(f"Помилка завантаження даних предмету з ID= {self.item_id}: {error}")
+        QMessageBox.critical(self, "Помилка", f"Не вдалося завантажити дані: {str(error)}")
 
     def validate_and_accept(self):
         """
@@ -151,13 +177,14 @@ class RentalForm(QDialog):
             if not user_name:
                 logger.warning("Валідацію не пройдено: порожнє ім'я орендаря")
                 raise ValueError("Введіть ім'я орендаря")
-            logger.debug(f"Ім'я орендаря: '{user_name}'")
+            logger.debug("Ім'я орендаря: '%s'", user_name)
 
             start_date = self.start_date_edit.date()
             end_date = self.end_date_edit.date()
 
-            logger.debug(f"Дата початку: {start_date.toString('dd.MM.yyyy')}")
-            logger.debug(f"Дата кінця: {end_date.toString('dd.MM.yyyy')}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Дата початку: %s", start_date.toString('dd.MM.yyyy'))
+                logger.debug("Дата кінця: %s", end_date.toString('dd.MM.yyyy'))
 
             if start_date > end_date:
                 logger.warning(f"Валідацію не пройдено: дата початку {start_date.toString('dd.MM.yyyy')} пізніше дати кінця {end_date.toString('dd.MM.yyyy')}")
@@ -188,10 +215,9 @@ class RentalForm(QDialog):
             "notes": self.notes_edit.text().strip()
         }
 
-        logger.debug(f"Зібрані дані оренди: орендар='{data['user_name']}', "
-                     f"початок={data['start_date']}, "
-                     f"кінець={data['end_date']}, "
-                     f"примітки='{data['notes'] if data['notes'] else 'порожньо'}'")
+        logger.debug("Зібрані дані оренди: орендар='%s', початок=%s, кінець=%s, примітки='%s'",
+                     data['user_name'], data['start_date'], data['end_date'], data['notes'] or 'порожньо',
+                     extra={"item_id": self.item_id})
 
         return data
 
@@ -207,5 +233,5 @@ class RentalForm(QDialog):
 
     def closeEvent(self, event):
         """Обробник закриття вікна"""
-        logger.debug(f"Форма оренди предмету з ID= {self.item_id} закривається")
+        logger.debug("Форма оренди предмету з ID= %s закривається", self.item_id)
         super().closeEvent(event)
\ No newline at end of file
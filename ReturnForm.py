@@ -4,9 +4,10 @@ from PyQt6.QtWidgets import (
     QLabel, QLineEdit, QSpinBox
 )
 from PyQt6.QtCore import QDate
-import traceback
 import logging
 
+from QueryExecutor import QueryExecutor
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +31,7 @@ class ReturnForm(QDialog):
         super().__init__()
         self.db = db
         self.rental_id = rental_id
+        self.executor = QueryExecutor(self)
 
         logger.info(f"Ініціалізація форми повернення для оренди з rental_id={rental_id}")
 
@@ -97,43 +99,57 @@ class ReturnForm(QDialog):
 
     def load_rental_data(self):
         """
-        Метод для завантаження та відображення інформації про оренду.
+        Метод для завантаження інформації про оренду у фоновому потоці.
+        """
+        logger.info(f"Завантаження даних оренди для rental_id={self.rental_id}")
+        self.rental_info_label.setText("Завантаження даних оренди…")
+
+        query = """
+            SELECT r.history_id, i.item_name, i.inventory_number,
+                   r.user_name, r.start_date, r.end_date
+            FROM usage_history r
+            JOIN inventory i ON r.item_id = i.item_id
+            WHERE r.history_id = %s AND r.is_rental = true
+        """
+        self.executor.submit(
+            "rental", self.db.execute_query, query, (self.rental_id,), fetch=True, prepared=True,
+            on_result=self.show_rental_data, on_error=self.show_load_error
+        )
+
+    def show_rental_data(self, result):
+        """
+        Метод для відображення інформації про оренду.
         Показує інформацію про предмет, орендаря та період оренди.
 
-        :raise: Exception, якщо відбулася помилка завантаження.
+        :param result: Результат запиту даних оренди.
+        :type result: list[tuple]
         """
-        logger.info(f"Завантаження даних оренди для rental_id={self.rental_id}")
+        if result:
+            rental_data = result[0]
+            logger.debug(f"Отримано дані оренди: предмет='{rental_data[1]}', номер='{rental_data[2]}', орендар='{rental_data[3]}'")
+            logger.debug(f"Період оренди: {rental_data[4]} - {rental_data[5]}")
 
-        try:
-            query = """
-                SELECT r.history_id, i.item_name, i.inventory_number,
-                       r.user_name, r.start_date, r.end_date
-                FROM usage_history r
-                JOIN inventory i ON r.item_id = i.item_id
-                WHERE r.history_id = %s AND r.is_rental = true
-            """
-            result = self.db.execute_query(query, (self.rental_id,), fetch=True)
-
-            if result:
-                rental_data = result[0]
-                logger.debug(f"Отримано дані оренди: предмет='{rental_data[1]}', номер='{rental_data[2]}', орендар='{rental_data[3]}'")
-                logger.debug(f"Період оренди: {rental_data[4]} - {rental_data[5]}")
-
-                self.rental_info_label.setText(
-                    f"Предмет: {rental_data[1]} ({rental_data[2]})\n"
-                    f"Орендар: {rental_data[3]}\n"
-                    f"Період оренди: {rental_data[4].strftime('%d.%m.%Y')} - {rental_data[5].strftime('%d.%m.%Y')}"
-                )
-
-                logger.info(f"Дані оренди {self.rental_id} завантажено")
-
-            else:
-                logger.warning(f"Оренду з ID={self.rental_id} не знайдено")
-                self.rental_info_label.setText(f"Оренду з ID={self.rental_id} не знайдено")
-        except Exception as e:
-            logger.error(f"Помилка завантаження даних оренди {self.rental_id}: {e}")
-            logger.error(f"Деталі:\n{traceback.format_exc()}")
-            QMessageBox.critical(self, "Помилка", f"Не вдалося завантажити дані: {str(e)}")
+            self.rental_info_label.setText(
+                f"Предмет: {rental_data[1]} ({rental_data[2]})\n"
+                f"Орендар: {rental_data[3]}\n"
+                f"Період оренди: {rental_data[4].strftime('%d.%m.%Y')} - {rental_data[5].strftime('%d.%m.%Y')}"
+            )
+
+            logger.info(f"Дані оренди {self.rental_id} завантажено")
+
+        else:
+            logger.warning(f"Оренду з ID={self.rental_id} не знайдено")
+            self.rental_info_label.setText(f"Оренду з ID={self.rental_id} не знайдено")
+
+    def show_load_error(self, error):
+        """
+        Обробник помилки завантаження даних оренди.
+
+        :param error: Виняток, що виник під час завантаження.
+        :type error: Exception
+        """
+        logger.error(f"Помилка завантаження даних оренди {self.rental_id}: {error}")
+        QMessageBox.critical(self, "Помилка", f"Не вдалося завантажити дані: {str(error)}")
 
     def validate_and_accept(self):
         """
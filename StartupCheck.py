@@ -0,0 +1,100 @@
+"""
+Перевірка часу запуску застосунку.
+
+Імпортує модуль головного вікна в окремому процесі кілька разів та завершується
+з кодом 1, якщо медіанний час імпорту перевищує бюджет або якщо під час імпорту
+завантажилися бібліотеки, імпорт яких має бути відкладеним (pandas, matplotlib).
+Ту саму перевірку виконує тест tests/test_startup.py.
+
+Приклад використання:
+    python StartupCheck.py --budget-ms 500 --runs 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Бюджет часу імпорту головного вікна (у мілісекундах)
+IMPORT_BUDGET_MS = 500
+
+# Бібліотеки, що не повинні імпортуватися до відкриття головного вікна
+DEFERRED_MODULES = ("pandas", "matplotlib")
+
+MEASURE_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{
+    "elapsed_ms": elapsed_ms,
+    "loaded": [name for name in {deferred!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure_import(module="InventoryApp", runs=5):
+    """
+    Функція для вимірювання часу імпорту модуля в окремих процесах.
+
+    :param module: Назва модуля, що імпортується.
+    :type module: str
+
+    :param runs: Кількість вимірювань.
+    :type runs: int
+
+    :return: Пара (час кожного імпорту в мілісекундах, бібліотеки з DEFERRED_MODULES, що завантажилися).
+    :rtype: tuple
+
+    :raise: subprocess.CalledProcessError, якщо імпорт модуля завершився помилкою.
+    """
+    code = MEASURE_CODE.format(module=module, deferred=DEFERRED_MODULES)
+    timings = []
+    loaded = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True
+        )
+        measurement = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(measurement["elapsed_ms"])
+        loaded.update(measurement["loaded"])
+    return timings, sorted(loaded)
+
+
+def main(argv=None):
+    """
+    Функція для запуску перевірки з командного рядка.
+
+    :param argv: Аргументи командного рядка.
+    :type argv: list[str], optional
+
+    :return: Код завершення: 0 — перевірку пройдено, 1 — бюджет перевищено.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description="Перевірка часу імпорту головного вікна")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS, help="Бюджет часу імпорту, мс")
+    parser.add_argument("--runs", type=int, default=5, help="Кількість вимірювань")
+    parser.add_argument("--module", default="InventoryApp", help="Модуль, що імпортується")
+    args = parser.parse_args(argv)
+
+    timings, loaded = measure_import(args.module, args.runs)
+    median_ms = statistics.median(timings)
+    print(f"Імпорт {args.module}: медіана {median_ms:.0f} мс, "
+          f"мін. {min(timings):.0f} мс, макс. {max(timings):.0f} мс (бюджет {args.budget_ms:.0f} мс)")
+
+    failed = False
+    if median_ms > args.budget_ms:
+        print(f"ПОМИЛКА: час імпорту перевищує бюджет на {median_ms - args.budget_ms:.0f} мс")
+        failed = True
+    if loaded:
+        print(f"ПОМИЛКА: під час запуску імпортовано бібліотеки з відкладеним імпортом: {', '.join(loaded)}")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
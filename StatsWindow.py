@@ -1,12 +1,43 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTabWidget
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QLabel, QSizePolicy, QComboBox, QDateEdit, QPushButton
+)
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtCore import Qt, QTimer, QDate, QEvent
+from datetime import date, timedelta
+from ChartRenderer import render_chart
 from DBConnection import DBConnection
+from QueryExecutor import QueryExecutor
 import logging
-import traceback
 
 logger = logging.getLogger(__name__)
 
+# Затримка перемальовування графіка після зміни розміру вікна (у мілісекундах)
+RESIZE_RENDER_DELAY_MS = 250
+
+# Найменший розмір зображення графіка (у логічних пікселях)
+MIN_CHART_WIDTH = 300
+MIN_CHART_HEIGHT = 200
+
+# Затримка оновлення графіка після зміни фільтрів (у мілісекундах)
+FILTER_DELAY_MS = 300
+
+# Кроки групування статистики оренд: (назва, аргумент DBConnection.get_rental_series)
+GRANULARITY_OPTIONS = [
+    ("День", "day"),
+    ("Тиждень", "week"),
+    ("Місяць", "month"),
+    ("Рік", "year"),
+]
+
+# Крок, з яким показується період після подвійного клацання на його стовпчику
+FINER_GRANULARITY = {"year": "month", "month": "day", "week": "day"}
+
+# Найменша дата полів періоду; вона означає, що межу періоду не задано
+NO_DATE = QDate(2000, 1, 1)
+
+# Текст, що показується замість графіка, якщо за фільтрами немає даних
+NO_DATA_TEXT = "Немає даних за вибраний період або категорію"
+
 class StatsWindow(QWidget):
     """
     Клас, що відповідає за вкладку статистики використання інвентарю.
@@ -15,6 +46,11 @@ class StatsWindow(QWidget):
         - Вкладка "Популярність"
         - Вкладка "Знос"
         - Вкладка "Статистика оренд"
+
+    Дані графіків завантажуються, а самі графіки малюються у фоновому потоці
+    (модуль ChartRenderer.py); у потоці інтерфейсу готове зображення лише показується.
+    Панель фільтрів над вкладками обмежує статистику періодом та категорією, а подвійне
+    клацання на стовпчику графіка оренд показує цей період з меншим кроком.
     """
     def __init__(self, db: DBConnection, parent=None):
         """
@@ -27,12 +63,20 @@ class StatsWindow(QWidget):
         """
         super().__init__(parent)
         self.db = db
+        self.executor = QueryExecutor(self)
+        self.executor.started.connect(self.on_load_started)
+        self.executor.idle.connect(self.on_load_finished)
 
         logger.info("Ініціалізація вкладки статистики")
 
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
 
+        # Попередні фільтри для повернення після деталізації періоду
+        self.drill_stack = []
+        self.categories_loaded = False
+        self.init_filter_bar()
+
         self.tabs = QTabWidget()
         self.tabs.setAccessibleName("Вкладки статистики")
         self.tabs.setAccessibleDescription("Вкладки з різними видами статистичних графіків")
@@ -57,15 +101,94 @@ class StatsWindow(QWidget):
         self.rental_tab = QWidget()
         self.rental_tab.setAccessibleName("Графік статистики оренди")
         self.tabs.addTab(self.rental_tab, "Статистика оренди")
-        self.tabs.setTabToolTip(2, "Статистика оренди по місяцях")
+        self.tabs.setTabToolTip(2, "Статистика оренди за періодами; подвійне клацання на стовпчику показує період детальніше")
         self.init_rental_tab()
         logger.debug("Вкладку 'Статистика оренди' створено")
 
-        logger.info("Завантаження даних для статистики")
-        self.load_data()
+        # Вкладки, заголовок яких показує стан фонового завантаження
+        self.loading_tabs = {
+            "popularity": self.popularity_tab,
+            "wear": self.wear_tab,
+            "rental_stats": self.rental_tab,
+        }
+        self.tab_titles = {key: self.tabs.tabText(self.tabs.indexOf(tab)) for key, tab in self.loading_tabs.items()}
+
+        # Дані графіка завантажуються під час кожного показу його вкладки;
+        # якщо вони не змінилися, показується вже намальоване зображення з кешу
+        self.chart_loaders = {
+            "popularity": self.load_popularity_data,
+            "wear": self.load_wear_data,
+            "rental_stats": self.load_rental_stats,
+        }
+        self.chart_views = {
+            "popularity": self.popularity_view,
+            "wear": self.wear_view,
+            "rental_stats": self.rental_view,
+        }
+        # Останні дані та показане зображення кожного графіка
+        self.chart_data = {}
+        self.shown_images = {}
+        self.tabs.currentChanged.connect(self.on_chart_tab_changed)
+
+        # Після зміни розміру вікна графік перемальовується один раз, коли розмір перестане змінюватися
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_RENDER_DELAY_MS)
+        self.resize_timer.timeout.connect(self.rerender_current_chart)
+
+        # Після зміни фільтрів графік оновлюється один раз, коли користувач закінчить їх змінювати
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.apply_filters)
 
         logger.info("Вікно статистики успішно ініціалізовано")
 
+    def showEvent(self, event):
+        """
+        Обробник показу вікна статистики. Завантажує графік поточної вкладки.
+        """
+        super().showEvent(event)
+        if not self.categories_loaded:
+            self.load_categories()
+        self.on_chart_tab_changed(self.tabs.currentIndex())
+
+    def resizeEvent(self, event):
+        """
+        Обробник зміни розміру вікна статистики. Відкладає перемальовування графіка.
+        """
+        super().resizeEvent(event)
+        if self.shown_images:
+            self.resize_timer.start()
+
+    def current_chart_key(self):
+        """
+        Метод для отримання ключа графіка активної вкладки.
+
+        :return: Ключ графіка або None.
+        :rtype: str, optional
+        """
+        tab = self.tabs.currentWidget()
+        for key, chart_tab in self.loading_tabs.items():
+            if chart_tab is tab:
+                return key
+        return None
+
+    def on_chart_tab_changed(self, index):
+        """
+        Обробник перемикання вкладок статистики. Оновлює дані графіка активної вкладки.
+
+        :param index: Індекс активної вкладки.
+        :type index: int
+        """
+        if not self.isVisible():
+            return
+
+        key = self.current_chart_key()
+        if key is not None and not self.executor.is_busy(key):
+            logger.debug(f"Показ графіка '{self.tab_titles[key]}'")
+            self.chart_loaders[key]()
+
     def init_popularity_tab(self):
         """
         Метод для ініціалізації вкладки популярності використання предметів.
@@ -73,15 +196,10 @@ class StatsWindow(QWidget):
         """
         logger.debug("Ініціалізація вкладки популярності предметів")
 
-        layout = QVBoxLayout()
-        self.popularity_tab.setLayout(layout)
-
-        self.popularity_figure = Figure()
-        self.popularity_canvas = FigureCanvas(self.popularity_figure)
-        self.popularity_canvas.setAccessibleName("Графік популярності")
-        self.popularity_canvas.setAccessibleDescription("Стовпчаста діаграма топ-10 найпопулярніших предметів")
-        layout.addWidget(self.popularity_canvas)
-        logger.debug("Створено графік популярності предметів")
+        self.popularity_tab.setLayout(QVBoxLayout())
+        self.popularity_view = self.create_chart_view(
+            self.popularity_tab, "Графік популярності", "Стовпчаста діаграма топ-10 найпопулярніших предметів"
+        )
 
     def init_wear_tab(self):
         """
@@ -90,15 +208,10 @@ class StatsWindow(QWidget):
         """
         logger.debug("Ініціалізація вкладки зносу")
 
-        layout = QVBoxLayout()
-        self.wear_tab.setLayout(layout)
-
-        self.wear_figure = Figure()
-        self.wear_canvas = FigureCanvas(self.wear_figure)
-        self.wear_canvas.setAccessibleName("Графік зносу")
-        self.wear_canvas.setAccessibleDescription("Горизонтальна діаграма топ-10 найбільш зношених предметів")
-        layout.addWidget(self.wear_canvas)
-        logger.debug("Створено графік зносу предметів")
+        self.wear_tab.setLayout(QVBoxLayout())
+        self.wear_view = self.create_chart_view(
+            self.wear_tab, "Графік зносу", "Горизонтальна діаграма топ-10 найбільш зношених предметів"
+        )
 
     def init_rental_tab(self):
         """
@@ -107,204 +220,574 @@ class StatsWindow(QWidget):
         """
         logger.debug("Ініціалізація вкладки статистики оренди предметів")
 
-        layout = QVBoxLayout()
-        self.rental_tab.setLayout(layout)
+        self.rental_tab.setLayout(QVBoxLayout())
+        self.rental_view = self.create_chart_view(
+            self.rental_tab, "Графік статистики оренди", "Стовпчаста діаграма оренд та запізнень за періодами"
+        )
+        self.rental_view.setToolTip("Подвійне клацання на стовпчику показує цей період з меншим кроком")
+        self.rental_view.installEventFilter(self)
+
+    def init_filter_bar(self):
+        """
+        Метод для створення панелі фільтрів статистики: період, категорія, крок групування.
+        """
+        filter_layout = QHBoxLayout()
+
+        filter_layout.addWidget(QLabel("Період з:"))
+        self.date_from_edit = self.create_date_edit("Початок періоду статистики")
+        filter_layout.addWidget(self.date_from_edit)
+
+        filter_layout.addWidget(QLabel("по:"))
+        self.date_to_edit = self.create_date_edit("Кінець періоду статистики")
+        filter_layout.addWidget(self.date_to_edit)
+
+        filter_layout.addWidget(QLabel("Категорія:"))
+        self.category_filter = QComboBox()
+        self.category_filter.setAccessibleName("Категорія предметів статистики")
+        self.category_filter.addItem("Усі категорії", None)
+        self.category_filter.currentIndexChanged.connect(self.on_filters_changed)
+        filter_layout.addWidget(self.category_filter)
+
+        filter_layout.addWidget(QLabel("Крок:"))
+        self.granularity_filter = QComboBox()
+        self.granularity_filter.setAccessibleName("Крок групування статистики оренди")
+        for title, granularity in GRANULARITY_OPTIONS:
+            self.granularity_filter.addItem(title, granularity)
+        self.granularity_filter.setCurrentIndex(self.granularity_filter.findData("month"))
+        self.granularity_filter.currentIndexChanged.connect(self.on_filters_changed)
+        filter_layout.addWidget(self.granularity_filter)
+
+        self.drill_up_button = QPushButton("Назад")
+        self.drill_up_button.setAccessibleName("Повернутися до попереднього періоду статистики")
+        self.drill_up_button.setEnabled(False)
+        self.drill_up_button.clicked.connect(self.drill_up)
+        filter_layout.addWidget(self.drill_up_button)
+
+        reset_button = QPushButton("Скинути")
+        reset_button.setAccessibleName("Скинути фільтри статистики")
+        reset_button.clicked.connect(self.reset_filters)
+        filter_layout.addWidget(reset_button)
+
+        filter_layout.addStretch()
+        self.layout.addLayout(filter_layout)
+        logger.debug("Панель фільтрів статистики створено")
+
+    def create_date_edit(self, name):
+        """
+        Метод для створення поля дати періоду. Найменша дата (NO_DATE) означає, що межу не задано.
+
+        :param name: Доступна назва поля.
+        :type name: str
+
+        :rtype: QDateEdit
+        """
+        date_edit = QDateEdit()
+        date_edit.setAccessibleName(name)
+        date_edit.setCalendarPopup(True)
+        date_edit.setDisplayFormat("dd.MM.yyyy")
+        date_edit.setMinimumDate(NO_DATE)
+        date_edit.setSpecialValueText("не обмежено")
+        date_edit.setDate(NO_DATE)
+        date_edit.dateChanged.connect(self.on_filters_changed)
+        return date_edit
+
+    @staticmethod
+    def date_value(date_edit):
+        """
+        Метод для отримання дати з поля періоду.
+
+        :rtype: date, optional
+        """
+        return None if date_edit.date() == date_edit.minimumDate() else date_edit.date().toPyDate()
+
+    def filters(self):
+        """
+        Метод для отримання вибраних фільтрів статистики.
+
+        :return: Словник з ключами date_from, date_to, category_id та granularity.
+        :rtype: dict
+        """
+        return {
+            "date_from": self.date_value(self.date_from_edit),
+            "date_to": self.date_value(self.date_to_edit),
+            "category_id": self.category_filter.currentData(),
+            "granularity": self.granularity_filter.currentData(),
+        }
+
+    def set_filters(self, filters):
+        """
+        Метод для встановлення фільтрів статистики та оновлення графіка.
+
+        :param filters: Фільтри (див. filters).
+        :type filters: dict
+        """
+        widgets = (self.date_from_edit, self.date_to_edit, self.category_filter, self.granularity_filter)
+        for widget in widgets:
+            widget.blockSignals(True)
+        for date_edit, value in ((self.date_from_edit, filters["date_from"]), (self.date_to_edit, filters["date_to"])):
+            date_edit.setDate(QDate(value.year, value.month, value.day) if value else NO_DATE)
+        index = self.category_filter.findData(filters["category_id"])
+        self.category_filter.setCurrentIndex(max(index, 0))
+        self.granularity_filter.setCurrentIndex(self.granularity_filter.findData(filters["granularity"]))
+        for widget in widgets:
+            widget.blockSignals(False)
+        self.apply_filters()
+
+    def filter_description(self, filters):
+        """
+        Метод для побудови опису фільтрів для заголовка графіка.
+
+        :param filters: Фільтри (див. filters).
+        :type filters: dict
+
+        :return: Опис періоду та категорії або None, якщо фільтри не задано.
+        :rtype: str, optional
+        """
+        parts = []
+        if filters["date_from"] or filters["date_to"]:
+            date_from = f"{filters['date_from']:%d.%m.%Y}" if filters["date_from"] else "…"
+            date_to = f"{filters['date_to']:%d.%m.%Y}" if filters["date_to"] else "…"
+            parts.append(f"{date_from} — {date_to}")
+        if filters["category_id"] is not None:
+            parts.append(self.category_filter.currentText())
+        return ", ".join(parts) or None
+
+    def on_filters_changed(self):
+        """
+        Обробник зміни фільтрів користувачем. Відкладає оновлення графіка.
+        """
+        self.drill_stack.clear()
+        self.drill_up_button.setEnabled(False)
+        self.filter_timer.start()
+
+    def apply_filters(self):
+        """
+        Метод для оновлення графіка активної вкладки з вибраними фільтрами.
+        Інші графіки оновлюються під час показу їх вкладок.
+        """
+        self.filter_timer.stop()
+        logger.info(f"Фільтри статистики: {self.filters()}")
+        key = self.current_chart_key()
+        if key is not None and self.isVisible():
+            self.chart_loaders[key]()
+
+    def reset_filters(self):
+        """
+        Метод для скидання фільтрів статистики: увесь період, усі категорії, крок — місяць.
+        """
+        self.drill_stack.clear()
+        self.drill_up_button.setEnabled(False)
+        self.set_filters({"date_from": None, "date_to": None, "category_id": None, "granularity": "month"})
+
+    @staticmethod
+    def period_end(period_start, granularity):
+        """
+        Метод для обчислення останнього дня періоду.
+
+        :param period_start: Перший день періоду.
+        :type period_start: date
+
+        :param granularity: Крок групування (day, week, month, year).
+        :type granularity: str
+
+        :rtype: date
+        """
+        if granularity == "day":
+            return period_start
+        if granularity == "week":
+            return period_start + timedelta(days=6)
+        if granularity == "month":
+            return (period_start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        return date(period_start.year, 12, 31)
+
+    def eventFilter(self, watched, event):
+        """
+        Обробник подвійного клацання на графіку оренд.
+        """
+        if watched is self.rental_view and event.type() == QEvent.Type.MouseButtonDblClick:
+            self.drill_down(event.position().x())
+            return True
+        return super().eventFilter(watched, event)
+
+    def drill_down(self, x):
+        """
+        Метод для показу періоду, на стовпчик якого клацнув користувач, з меншим кроком.
+
+        :param x: Горизонтальна координата клацання на графіку (у логічних пікселях).
+        :type x: float
+        """
+        image = self.shown_images.get("rental_stats")
+        if image is None or "rental_stats" not in self.chart_data:
+            return
+        granularity = self.chart_data["rental_stats"][1]["granularity"]
+        finer = FINER_GRANULARITY.get(granularity)
+        if finer is None:
+            return
+
+        # Зображення показується по центру області графіка
+        offset = (self.rental_view.width() - image.width / image.pixel_ratio) / 2
+        period_start = image.region_at((x - offset) * image.pixel_ratio)
+        if period_start is None:
+            return
+
+        current = self.filters()
+        self.drill_stack.append(current)
+        self.drill_up_button.setEnabled(True)
+        logger.info(f"Деталізація періоду {period_start} ({granularity} -> {finer})")
+        self.set_filters({
+            "date_from": period_start,
+            "date_to": self.period_end(period_start, granularity),
+            "category_id": current["category_id"],
+            "granularity": finer,
+        })
+
+    def drill_up(self):
+        """
+        Метод для повернення до фільтрів, що були до останньої деталізації періоду.
+        """
+        if not self.drill_stack:
+            return
+        filters = self.drill_stack.pop()
+        self.drill_up_button.setEnabled(bool(self.drill_stack))
+        self.set_filters(filters)
+
+    def load_categories(self):
+        """
+        Метод для завантаження категорій для фільтра статистики у фоновому потоці.
+        """
+        self.categories_loaded = True
+        self.executor.submit(
+            "categories", self.db.get_categories,
+            on_result=self.show_categories,
+            on_error=self.show_load_error("Помилка завантаження категорій")
+        )
+
+    def show_categories(self, categories):
+        """
+        Метод для заповнення фільтра категорій.
+
+        :param categories: Категорії (category_id, category_name).
+        :type categories: pandas.DataFrame
+        """
+        self.category_filter.blockSignals(True)
+        for category_id, category_name in zip(categories['category_id'], categories['category_name']):
+            self.category_filter.addItem(category_name, int(category_id))
+        self.category_filter.blockSignals(False)
+        logger.debug(f"Завантажено {len(categories)} категорій для фільтра статистики")
+
+    @staticmethod
+    def create_chart_view(tab, name, description):
+        """
+        Метод для створення області, в якій показується зображення графіка.
+
+        :param tab: Вкладка графіка.
+        :type tab: QWidget
+
+        :param name: Доступна назва графіка.
+        :type name: str
+
+        :param description: Доступний опис графіка.
+        :type description: str
+
+        :rtype: QLabel
+        """
+        view = QLabel()
+        view.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        view.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        # Без цього QLabel не дає вікну зменшитися до розміру, меншого за показане зображення
+        view.setMinimumSize(1, 1)
+        view.setAccessibleName(name)
+        view.setAccessibleDescription(description)
+        tab.layout().addWidget(view)
+        return view
+
+    def chart_size(self, key):
+        """
+        Метод для отримання розміру, в якому малюється графік.
+
+        :param key: Ключ графіка.
+        :type key: str
 
-        self.rental_figure = Figure()
-        self.rental_canvas = FigureCanvas(self.rental_figure)
-        self.rental_canvas.setAccessibleName("Графік статистики оренди")
-        self.rental_canvas.setAccessibleDescription("Стовпчаста діаграма оренди по місяцях")
-        layout.addWidget(self.rental_canvas)
-        logger.debug("Створено графік статистики оренди предметів")
+        :return: Ширина та висота в логічних пікселях і масштаб екрана.
+        :rtype: tuple[int, int, float]
+        """
+        view = self.chart_views[key]
+        return (max(view.width(), MIN_CHART_WIDTH), max(view.height(), MIN_CHART_HEIGHT),
+                view.devicePixelRatioF())
+
+    @staticmethod
+    def fetch_chart(kind, query, query_kwargs, options, width, height, pixel_ratio):
+        """
+        Метод для завантаження даних та малювання графіка. Виконується у фоновому потоці.
+
+        :param kind: Ключ графіка.
+        :type kind: str
+
+        :param query: Метод DBConnection, що повертає дані графіка.
+        :type query: callable
+
+        :param query_kwargs: Аргументи методу.
+        :type query_kwargs: dict
+
+        :param options: Параметри малювання графіка (див. ChartRenderer.render_chart).
+        :type options: dict
+
+        :return: Дані, зображення (None, якщо даних немає) та параметри малювання.
+        :rtype: tuple
+        """
+        data = query(**query_kwargs)
+        image = render_chart(kind, data, width, height, pixel_ratio, **options) if not data.empty else None
+        return data, image, options
+
+    def submit_chart(self, key, on_result, error_message, query, options, **query_kwargs):
+        """
+        Метод для запуску завантаження даних та малювання графіка у фоновому потоці.
+
+        :param key: Ключ графіка.
+        :type key: str
+
+        :param on_result: Обробник результату fetch_chart у потоці інтерфейсу.
+        :type on_result: callable
+
+        :param error_message: Текст повідомлення про помилку для журналу.
+        :type error_message: str
+
+        :param query: Метод DBConnection, що повертає дані графіка.
+        :type query: callable
+
+        :param options: Параметри малювання графіка.
+        :type options: dict
+        """
+        self.executor.submit(
+            key, self.fetch_chart, key, query, query_kwargs, options, *self.chart_size(key),
+            on_result=on_result, on_error=self.show_load_error(error_message)
+        )
+
+    def show_chart(self, key, image, data, options):
+        """
+        Метод для показу намальованого графіка.
+        Якщо показано те саме зображення (дані та розмір не змінилися), зображення не оновлюється.
+
+        :param key: Ключ графіка.
+        :type key: str
+
+        :param image: Намальований графік.
+        :type image: ChartImage
+
+        :param data: Дані графіка (для перемальовування після зміни розміру).
+        :type data: pandas.DataFrame
+
+        :param options: Параметри малювання графіка.
+        :type options: dict
+        """
+        self.chart_data[key] = (data, options)
+        if self.shown_images.get(key) is image:
+            logger.debug("Графік '%s' не змінився", key)
+            return
+
+        qimage = QImage(image.pixels, image.width, image.height, image.width * 4, QImage.Format.Format_RGBA8888)
+        pixmap = QPixmap.fromImage(qimage)
+        pixmap.setDevicePixelRatio(image.pixel_ratio)
+        self.chart_views[key].setPixmap(pixmap)
+        self.shown_images[key] = image
+
+    def show_no_data(self, key):
+        """
+        Метод для показу повідомлення про відсутність даних замість графіка.
+        Попереднє зображення та його дані відкидаються, щоб зміна розміру вікна або
+        подвійне клацання не показали застарілий графік.
+
+        :param key: Ключ графіка.
+        :type key: str
+        """
+        self.chart_data.pop(key, None)
+        self.shown_images.pop(key, None)
+        # setText прибирає показане зображення разом із підзаголовком фільтрів
+        self.chart_views[key].setText(NO_DATA_TEXT)
+
+    def rerender_current_chart(self):
+        """
+        Метод для перемальовування графіка активної вкладки під новий розмір вікна.
+        Використовує останні завантажені дані, без запиту до бази даних.
+        """
+        key = self.current_chart_key()
+        chart_data = self.chart_data.get(key)
+        if chart_data is None or self.executor.is_busy(key):
+            return
+
+        width, height, pixel_ratio = self.chart_size(key)
+        image = self.shown_images.get(key)
+        if (image is not None and abs(image.width / image.pixel_ratio - width) < 1
+                and abs(image.height / image.pixel_ratio - height) < 1):
+            return
+
+        data, options = chart_data
+
+        def show_resized(image):
+            # Поки графік малювався, могли надійти новіші дані
+            if self.chart_data.get(key) is chart_data:
+                self.show_chart(key, image, data, options)
+
+        self.executor.submit(
+            f"{key}_resize", render_chart, key, data, width, height, pixel_ratio, **options,
+            on_result=show_resized,
+            on_error=self.show_load_error("Помилка малювання графіка")
+        )
 
     def load_data(self):
         """
-        Метод для завантаження всіх статистичних даних.
+        Метод для оновлення всіх статистичних даних у фонових потоках.
         """
         logger.info("Завантаження статистичних даних")
 
-        self.load_popularity_data()
-        self.load_wear_data()
-        self.load_rental_stats()
+        for loader in self.chart_loaders.values():
+            loader()
 
-        logger.info("Успішне завантаження всіх статистичних даних")
+        logger.info("Завантаження всіх статистичних даних розпочато")
 
-    def load_popularity_data(self):
+    def on_load_started(self, key):
+        """
+        Обробник початку фонового завантаження. Позначає вкладку графіка як таку, що завантажується.
+
+        :param key: Ключ завантаження.
+        :type key: str
+        """
+        tab = self.loading_tabs.get(key)
+        if tab is not None:
+            self.tabs.setTabText(self.tabs.indexOf(tab), f"{self.tab_titles[key]} (завантаження…)")
+
+    def on_load_finished(self, key):
+        """
+        Обробник завершення фонового завантаження. Повертає вкладці звичайний заголовок.
+
+        :param key: Ключ завантаження.
+        :type key: str
         """
-        Метод для завантаження та відображення даних про популярні предмети.
-        Також будує стовпчасту діаграму для відображення даних.
+        tab = self.loading_tabs.get(key)
+        if tab is not None:
+            self.tabs.setTabText(self.tabs.indexOf(tab), self.tab_titles[key])
 
-        :raise: Exception, якщо відбулася помилка завантаження даних.
+    def show_load_error(self, message):
+        """
+        Метод для створення обробника помилки фонового завантаження.
+
+        :param message: Текст повідомлення для журналу.
+        :type message: str
+
+        :return: Функція, що журналює помилку.
+        :rtype: callable
+        """
+        def handler(error):
+            logger.error(f"{message}: {error}")
+            print(f"{message}: {error}")
+        return handler
+
+    def load_popularity_data(self):
+        """
+        Метод для завантаження даних про популярні предмети та малювання графіка у фоновому потоці.
         """
         logger.info("Завантаження даних популярності предметів")
+        filters = self.filters()
+        # Без обмеження періоду кількість оренд береться зі зведеної таблиці, а не рахується по всій історії
+        self.submit_chart(
+            "popularity", self.show_popularity_data, "Помилка завантаження даних популярності",
+            self.db.get_popular_items, {"subtitle": self.filter_description(filters)},
+            limit=10, date_from=filters["date_from"], date_to=filters["date_to"], category_id=filters["category_id"]
+        )
+
+    def show_popularity_data(self, result):
+        """
+        Метод для відображення графіка популярних предметів (стовпчаста діаграма).
 
-        try:
-            logger.debug("Виконання SQL запиту для вкладки 'Популярність'")
-            data = self.db.execute_query("""
-                SELECT inv.item_name, COUNT(uh.history_id) as usage_count
-                FROM inventory inv
-                LEFT JOIN usage_history uh on inv.item_id = uh.item_id
-                WHERE uh.is_rental = true
-                GROUP BY inv.item_id
-                ORDER BY usage_count DESC
-                LIMIT 10
-            """, fetch=True, return_df=True)
-
-            if not data.empty:
-                logger.info(f"Отримано дані про {len(data)} найпопулярніших предметів")
-                logger.debug(f"Топ-5 предметів: {data['item_name'].head(5).tolist()}")
-
-                total_rentals = data['usage_count'].sum()
-                logger.debug(f"Загальна кількість оренд топ-10 предметів: {total_rentals}")
-
-                self.popularity_figure.clear()
-                ax = self.popularity_figure.add_subplot(111)
-
-                bars = ax.bar(data['item_name'], data['usage_count'])
-                ax.set_title('Топ 10 найпопулярніших предметів для оренди')
-                ax.set_ylabel('Кількість оренд')
-                ax.tick_params(axis='x', rotation=45)
-
-                # Додаємо значення над стовпчиками
-                for bar in bars:
-                    height = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width() / 2., height,
-                            f'{int(height)}', ha='center', va='bottom')
-
-                self.popularity_figure.tight_layout()
-                self.popularity_canvas.draw()
-
-                logger.info("Графік популярності успішно оновлено")
-            else:
-                logger.warning("Немає даних для відображення графіка популярності")
-
-        except Exception as e:
-            logger.error(f"Помилка завантаження даних популярності: {e}")
-            logger.debug(traceback.format_exc())
-            print(f"Помилка завантаження даних популярності: {e}")
+        :param result: Топ-10 предметів за кількістю оренд, намальований графік та параметри малювання.
+        :type result: tuple
+        """
+        data, image, options = result
+        if data.empty:
+            logger.warning("Немає даних для відображення графіка популярності")
+            self.show_no_data("popularity")
+            return
+
+        logger.info(f"Отримано дані про {len(data)} найпопулярніших предметів")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Топ-5 предметів: %s", data['item_name'].head(5).tolist())
+            logger.debug("Загальна кількість оренд топ-10 предметів: %s", data['usage_count'].sum())
+
+        self.show_chart("popularity", image, data, options)
+
+        logger.info("Графік популярності успішно оновлено")
 
     def load_wear_data(self):
         """
-        Метод для завантаження та відображення даних про найбільш зношені предмети.
-        Також будує лінійну діаграму для відображення даних.
-
-        :raise: Exception, якщо відбулася помилка завантаження даних.
+        Метод для завантаження даних про найбільш зношені предмети та малювання графіка у фоновому потоці.
+        Період не впливає на знос, тому враховується лише категорія.
         """
         logger.info("Завантаження даних про знос інвентарю")
+        filters = dict(self.filters(), date_from=None, date_to=None)
+        self.submit_chart(
+            "wear", self.show_wear_data, "Помилка завантаження даних зносу",
+            self.db.get_most_worn_items, {"subtitle": self.filter_description(filters)},
+            limit=10, category_id=filters["category_id"]
+        )
+
+    def show_wear_data(self, result):
+        """
+        Метод для відображення графіка найбільш зношених предметів (горизонтальна діаграма).
+
+        :param result: Топ-10 предметів з найменшою цілісністю, намальований графік та параметри малювання.
+        :type result: tuple
+        """
+        data, image, options = result
+        if data.empty:
+            logger.warning("Немає даних для відображення графіка зносу")
+            self.show_no_data("wear")
+            return
+
+        logger.info(f"Отримано дані про {len(data)} найбільш зношених предметів")
 
-        try:
-            logger.debug("Виконання SQL запиту для вкладки зносу")
-            data = self.db.execute_query("""
-                SELECT inv.item_name, inv.integrity_percentage, cnd.condition_name
-                FROM inventory inv
-                JOIN conditions cnd ON inv.condition_id = cnd.condition_id
-                ORDER BY inv.integrity_percentage ASC
-                LIMIT 10
-            """, fetch=True, return_df=True)
-
-            if not data.empty:
-                logger.info(f"Отримано дані про {len(data)} найбільш зношених предметів")
-
-                self.wear_figure.clear()
-                ax = self.wear_figure.add_subplot(111)
-
-                bars = ax.barh(data['item_name'], data['integrity_percentage'])
-                ax.set_title('Топ 10 найбільш зношених речей')
-                ax.set_xlabel('Цілісність (у %)')
-                ax.set_xlim(0, 100)
-
-                for i, (bar, condition) in enumerate(zip(bars, data['condition_name'])):
-                    width = bar.get_width()
-                    ax.text(width + 2, bar.get_y() + bar.get_height() / 2,
-                            condition, ha='left', va='center')
-
-                self.wear_figure.tight_layout()
-                self.wear_canvas.draw()
-            else:
-                logger.warning("Немає даних для відображення графіка зносу")
-        except Exception as e:
-            logger.error(f"Помилка завантаження даних зносу: {e}")
-            logger.debug(traceback.format_exc())
-            print(f"Помилка завантаження даних зносу: {e}")
+        self.show_chart("wear", image, data, options)
 
     def load_rental_stats(self):
         """
-        Метод для завантаження та відображення даних про найбільш популярні предмети для оренди.
-        Також будує стовпчасту діаграму для відображення даних.
-
-        :raise: Exception, якщо відбулася помилка завантаження даних.
+        Метод для завантаження статистики оренди за періодами та малювання графіка у фоновому потоці.
+        Оренди групуються за періодами в базі даних, тож завантажується лише по рядку на період.
         """
         logger.info("Завантаження даних про статистику оренди")
+        filters = self.filters()
+        self.submit_chart(
+            "rental_stats", self.show_rental_stats, "Помилка завантаження статистики оренди",
+            self.db.get_rental_series,
+            {"granularity": filters["granularity"], "subtitle": self.filter_description(filters)},
+            **filters
+        )
+
+    def show_rental_stats(self, result):
+        """
+        Метод для відображення графіка статистики оренди за періодами (стовпчаста діаграма).
+
+        :param result: Кількість оренд та запізнень за періодами, намальований графік та параметри малювання.
+        :type result: tuple
+        """
+        data, image, options = result
+        if data.empty:
+            logger.warning("Немає даних для відображення статистики оренди")
+            self.show_no_data("rental_stats")
+            return
+
+        logger.info(f"Отримано статистику за {len(data)} періодів")
+
+        total_rentals = data['rental_count'].sum()
+        total_late = data['late_count'].sum()
+        late_percentage = (total_late / total_rentals * 100) if total_rentals > 0 else 0
+
+        logger.info(
+            f"Загальна статистика: {total_rentals} оренд, {total_late} запізнень ({late_percentage:.1f}%)")
+
+        if logger.isEnabledFor(logging.DEBUG):
+            # Період з найбільшою кількістю оренд
+            peak = data.loc[data['rental_count'].idxmax()]
+            logger.debug("Піковий період: %s з %s орендами", peak['period_start'], peak['rental_count'])
+
+        self.show_chart("rental_stats", image, data, options)
 
-        try:
-            logger.debug("Виконання SQL запиту для вкладки 'Статистика оренди'")
-            data = self.db.execute_query("""
-                SELECT
-                    EXTRACT(MONTH FROM start_date) as month,
-                    COUNT(*) as rental_count,
-                    COUNT(CASE WHEN returned_date > end_date THEN 1 END) as late_count
-                FROM usage_history
-                WHERE is_rental = true
-                GROUP BY month
-                ORDER BY month
-            """, fetch=True, return_df=True)
-
-            if not data.empty:
-                logger.info(f"Отримано статистику за {len(data)} місяців")
-
-                logger.info(f"Отримано статистику за {len(data)} місяців")
-
-                total_rentals = data['rental_count'].sum()
-                total_late = data['late_count'].sum()
-                late_percentage = (total_late / total_rentals * 100) if total_rentals > 0 else 0
-
-                logger.info(
-                    f"Загальна статистика: {total_rentals} оренд, {total_late} запізнень ({late_percentage:.1f}%)")
-
-                # Знаходимо місяць з найбільшою кількістю оренд
-                max_rental_month = data.loc[data['rental_count'].idxmax()]
-                logger.debug(
-                    f"Піковий місяць: {int(max_rental_month['month'])} з {max_rental_month['rental_count']} орендами")
-
-                self.rental_figure.clear()
-                ax = self.rental_figure.add_subplot(111)
-
-                months = ['Січ', 'Лют', 'Бер', 'Кві', 'Тра', 'Чер',
-                          'Лип', 'Сер', 'Вер', 'Жов', 'Лис', 'Гру']
-
-                # Переконуємось що всі місяці присутні
-                month_data = {int(m): {'rental': 0, 'late': 0} for m in range(1, 13)}
-                for _, row in data.iterrows():
-                    month_data[int(row['month'])]['rental'] = row['rental_count']
-                    month_data[int(row['month'])]['late'] = row['late_count']
-
-                rental_values = [month_data[m]['rental'] for m in range(1, 13)]
-                late_values = [month_data[m]['late'] for m in range(1, 13)]
-
-                bars1 = ax.bar(range(12), rental_values, label='Всього оренд', alpha=0.7)
-                bars2 = ax.bar(range(12), late_values, label='Запізнілі повернення', alpha=0.7)
-
-                ax.set_title('Статистика оренди по місяцям')
-                ax.set_ylabel('Кількість')
-                ax.set_xticks(range(12))
-                ax.set_xticklabels(months)
-                ax.legend()
-
-                # Додаємо значення
-                for bars in [bars1, bars2]:
-                    for bar in bars:
-                        height = bar.get_height()
-                        if height > 0:
-                            ax.text(bar.get_x() + bar.get_width() / 2., height,
-                                    f'{int(height)}', ha='center', va='bottom', fontsize=8)
-
-                self.rental_figure.tight_layout()
-                self.rental_canvas.draw()
-
-                logger.info("Графік статистики оренди успішно оновлено")
-            else:
-                logger.warning("Немає даних для відображення статистики оренди")
-        except Exception as e:
-            logger.error(f"Помилка завантаження статистики оренди: {e}")
-            logger.debug(traceback.format_exc())
-            print(f"Помилка завантаження статистики оренди: {e}")
+        logger.info("Графік статистики оренди успішно оновлено")
@@ -0,0 +1,364 @@
+"""
+Генератор синтетичних даних для вимірювання продуктивності.
+
+Заповнює базу даних заданою кількістю предметів та записів історії оренд.
+Дані генеруються з фіксованим зерном, тому два запуски з однаковими параметрами
+створюють однакові таблиці. Рядки завантажуються командою COPY частинами,
+тож навіть мільйони записів історії не зберігаються в пам'яті цілком.
+
+Приклад використання:
+    python SyntheticData.py --dbname gradesystem_bench --items 100000 --history 5000000
+"""
+
+import argparse
+import io
+import random
+import sys
+import time
+import logging
+from datetime import date, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Кількість рядків в одній частині COPY
+COPY_CHUNK_SIZE = 100000
+
+# Частка предметів, що перебувають в оренді (мають незакриту оренду)
+OPEN_RENTAL_SHARE = 0.05
+
+# Період, за який генерується історія оренд (у днях до сьогодні)
+HISTORY_DAYS = 3 * 365
+
+CATEGORIES = {
+    "Намети": ("Намет", "Тент"),
+    "Рюкзаки": ("Рюкзак", "Гермомішок"),
+    "Спальне спорядження": ("Спальник", "Каремат", "Гамак"),
+    "Кухонне спорядження": ("Пальник", "Казанок", "Газовий балон"),
+    "Освітлення": ("Ліхтар", "Налобний ліхтар"),
+    "Альпінізм": ("Мотузка", "Карабін", "Трекінгові палиці", "Каска"),
+}
+
+MODELS = ("Tramp", "Fjord", "Pinguin", "Terra", "Kaiser", "Summit", "Nomad", "Vento")
+
+FIRST_NAMES = ("Олександр", "Марія", "Іван", "Олена", "Андрій", "Наталія", "Дмитро", "Ірина", "Сергій", "Юлія")
+LAST_NAMES = ("Шевченко", "Коваленко", "Бондаренко", "Ткаченко", "Кравченко", "Мельник", "Бойко", "Савченко")
+
+CONDITION_THRESHOLDS = ((90, "Новий"), (60, "Добрий"), (30, "Задовільний"), (0, "Поганий"))
+
+
+def copy_rows(cursor, table, columns, rows):
+    """
+    Функція для завантаження рядків у таблицю командою COPY частинами по COPY_CHUNK_SIZE.
+
+    :param cursor: Курсор з'єднання.
+
+    :param table: Назва таблиці.
+    :type table: str
+
+    :param columns: Назви колонок.
+    :type columns: tuple[str]
+
+    :param rows: Рядки (кортежі значень; None записується як NULL).
+    :type rows: Iterable[tuple]
+
+    :return: Кількість завантажених рядків.
+    :rtype: int
+    """
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    total = 0
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write("\t".join("\\N" if value is None else str(value) for value in row))
+        buffer.write("\n")
+        count += 1
+        if count == COPY_CHUNK_SIZE:
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            total += count
+            buffer = io.StringIO()
+            count = 0
+    if count:
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+        total += count
+    return total
+
+
+def lookup_ids(cursor, table, id_column, name_column):
+    """
+    Функція для отримання словника {назва: ID} довідника.
+
+    :rtype: dict
+    """
+    cursor.execute(f"SELECT {name_column}, MIN({id_column}) FROM {table} GROUP BY {name_column}")
+    return dict(cursor.fetchall())
+
+
+def generate_items(rng, count, category_ids, condition_ids, available_id):
+    """
+    Генератор рядків предметів інвентарю.
+
+    :param rng: Генератор випадкових чисел.
+    :type rng: random.Random
+
+    :param count: Кількість предметів.
+    :type count: int
+
+    :return: Кортежі (item_id, inventory_number, item_name, category_id, status_id,
+        condition_id, integrity_percentage, purchase_date, item_notes).
+    :rtype: Iterator[tuple]
+    """
+    categories = list(CATEGORIES.items())
+    today = date.today()
+    for item_id in range(1, count + 1):
+        category_name, kinds = rng.choice(categories)
+        integrity = rng.choices((rng.randint(90, 100), rng.randint(30, 89), rng.randint(0, 29)), (6, 3, 1))[0]
+        condition_name = next(name for threshold, name in CONDITION_THRESHOLDS if integrity >= threshold)
+        yield (
+            item_id,
+            f"BENCH-{item_id:07d}",
+            f"{rng.choice(kinds)} {rng.choice(MODELS)} {rng.randint(1, 60)}",
+            category_ids[category_name],
+            available_id,
+            condition_ids.get(condition_name),
+            integrity,
+            today - timedelta(days=rng.randint(0, 10 * 365)),
+            "",
+        )
+
+
+def generate_history(rng, count, item_count):
+    """
+    Генератор закритих записів історії оренд.
+
+    :param rng: Генератор випадкових чисел.
+    :type rng: random.Random
+
+    :param count: Кількість записів.
+    :type count: int
+
+    :param item_count: Кількість предметів (ID від 1 до item_count).
+    :type item_count: int
+
+    :return: Кортежі (item_id, user_name, start_date, end_date, returned_date, usage_notes, is_rental).
+    :rtype: Iterator[tuple]
+    """
+    today = date.today()
+    for _ in range(count):
+        start = today - timedelta(days=rng.randint(30, HISTORY_DAYS))
+        end = start + timedelta(days=rng.randint(1, 14))
+        # Приблизно кожне п'яте повернення — з запізненням
+        returned = end + timedelta(days=rng.randint(1, 7) if rng.random() < 0.2 else -rng.randint(0, 2))
+        yield (
+            rng.randint(1, item_count),
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            start, end, max(returned, start), "", "true",
+        )
+
+
+def generate_open_rentals(rng, item_ids):
+    """
+    Генератор незакритих оренд (частина з них протермінована).
+
+    :param rng: Генератор випадкових чисел.
+    :type rng: random.Random
+
+    :param item_ids: ID предметів, що перебувають в оренді.
+    :type item_ids: list[int]
+
+    :return: Кортежі у форматі generate_history.
+    :rtype: Iterator[tuple]
+    """
+    today = date.today()
+    for item_id in item_ids:
+        start = today - timedelta(days=rng.randint(0, 20))
+        yield (
+            item_id,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            start, start + timedelta(days=rng.randint(1, 14)), None, "", "true",
+        )
+
+
+def ensure_database(params, dbname):
+    """
+    Функція для створення бази даних для вимірювань, якщо її ще немає.
+
+    :param params: Параметри підключення (DB_PARAMS) до наявної бази даних.
+    :type params: dict
+
+    :param dbname: Назва бази даних для вимірювань.
+    :type dbname: str
+
+    :return: True, якщо базу даних створено.
+    :rtype: bool
+    """
+    import psycopg2
+    from psycopg2 import sql
+
+    connection = psycopg2.connect(**params)
+    connection.autocommit = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (dbname,))
+            if cursor.fetchone():
+                return False
+            logger.info(f"Створення бази даних {dbname}")
+            cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(dbname)))
+            return True
+    finally:
+        connection.close()
+
+
+def seeded_volumes(db):
+    """
+    Функція для отримання поточної кількості предметів та записів історії.
+
+    :param db: Підключення до бази даних.
+    :type db: DBConnection
+
+    :return: Пара (кількість предметів, кількість записів історії).
+    :rtype: tuple[int, int]
+    """
+    return tuple(db.execute_query(
+        "SELECT (SELECT count(*) FROM inventory), (SELECT count(*) FROM usage_history)", fetch=True
+    )[0])
+
+
+def seed(db, items=100000, history=5000000, random_seed=42, force=False):
+    """
+    Функція для заповнення бази даних синтетичними предметами та історією оренд.
+
+    Наявні дані інвентарю та історії видаляються. Якщо база вже містить рівно задану
+    кількість записів (наприклад, після попереднього запуску), заповнення пропускається.
+    На час завантаження тригери таблиць вимикаються, після чого зведені таблиці
+    статистики перераховуються, якщо вони існують.
+
+    :param db: Підключення до бази даних зі створеною схемою (див. Migrations.apply_migrations).
+    :type db: DBConnection
+
+    :param items: Кількість предметів.
+    :type items: int
+
+    :param history: Кількість закритих записів історії оренд.
+    :type history: int
+
+    :param random_seed: Зерно генератора випадкових чисел.
+    :type random_seed: int
+
+    :param force: Чи заповнювати базу повторно, навіть якщо обсяги вже збігаються.
+    :type force: bool
+
+    :return: True, якщо базу заповнено, False, якщо заповнення пропущено.
+    :rtype: bool
+    """
+    rng = random.Random(random_seed)
+    open_count = int(items * OPEN_RENTAL_SHARE)
+
+    if not force and seeded_volumes(db) == (items, history + open_count):
+        logger.info(f"База вже містить {items} предметів та {history + open_count} записів історії")
+        return False
+
+    logger.info(f"Заповнення бази: {items} предметів, {history} записів історії, {open_count} відкритих оренд")
+    start = time.perf_counter()
+
+    with db.borrow_connection() as connection:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("ALTER TABLE inventory DISABLE TRIGGER USER")
+                cursor.execute("ALTER TABLE usage_history DISABLE TRIGGER USER")
+                cursor.execute("TRUNCATE usage_history, inventory RESTART IDENTITY CASCADE")
+
+                cursor.execute("""
+                    INSERT INTO categories (category_name)
+                    SELECT name FROM unnest(%s::text[]) AS name
+                    WHERE NOT EXISTS (SELECT 1 FROM categories c WHERE c.category_name = name)
+                """, (list(CATEGORIES),))
+                category_ids = lookup_ids(cursor, "categories", "category_id", "category_name")
+                condition_ids = lookup_ids(cursor, "conditions", "condition_id", "condition_name")
+                status_ids = lookup_ids(cursor, "availability_statues", "status_id", "status_name")
+
+                copy_rows(cursor, "inventory", (
+                    "item_id", "inventory_number", "item_name", "category_id", "status_id",
+                    "condition_id", "integrity_percentage", "purchase_date", "item_notes"
+                ), generate_items(rng, items, category_ids, condition_ids, status_ids["Доступний"]))
+                cursor.execute("SELECT setval(pg_get_serial_sequence('inventory', 'item_id'), %s)", (max(items, 1),))
+                logger.info(f"Завантажено {items} предметів за {time.perf_counter() - start:.1f} с")
+
+                history_columns = (
+                    "item_id", "user_name", "start_date", "end_date", "returned_date", "usage_notes", "is_rental"
+                )
+                copy_rows(cursor, "usage_history", history_columns, generate_history(rng, history, items))
+                logger.info(f"Завантажено {history} записів історії за {time.perf_counter() - start:.1f} с")
+
+                rented = rng.sample(range(1, items + 1), open_count)
+                copy_rows(cursor, "usage_history", history_columns, generate_open_rentals(rng, rented))
+                cursor.execute(
+                    "UPDATE inventory SET status_id = %s WHERE item_id = ANY(%s)",
+                    (status_ids["В оренді"], rented)
+                )
+
+                cursor.execute("ALTER TABLE inventory ENABLE TRIGGER USER")
+                cursor.execute("ALTER TABLE usage_history ENABLE TRIGGER USER")
+                cursor.execute(
+                    "SELECT refresh_usage_rollups() WHERE to_regprocedure('refresh_usage_rollups()') IS NOT NULL"
+                )
+            connection.commit()
+        except Exception:
+            if not connection.closed:
+                connection.rollback()
+            raise
+
+        # ANALYZE поза транзакцією заповнення, щоб планувальник одразу мав статистику нових даних
+        connection.autocommit = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM ANALYZE inventory")
+                cursor.execute("VACUUM ANALYZE usage_history")
+        finally:
+            connection.autocommit = False
+
+    db.invalidate_cache("categories", "inventory", "usage_history")
+    logger.info(f"Базу заповнено за {time.perf_counter() - start:.1f} с")
+    return True
+
+
+def main(argv=None):
+    """
+    Функція для заповнення бази даних з командного рядка.
+
+    :param argv: Аргументи командного рядка.
+    :type argv: list[str], optional
+
+    :return: Код завершення.
+    :rtype: int
+    """
+    import DBConnection as db_module
+    from Migrations import apply_migrations
+
+    parser = argparse.ArgumentParser(description="Заповнення бази даних синтетичними даними")
+    parser.add_argument("--dbname", default="gradesystem_bench", help="База даних, яку буде перезаписано")
+    parser.add_argument("--items", type=int, default=100000, help="Кількість предметів")
+    parser.add_argument("--history", type=int, default=5000000, help="Кількість записів історії оренд")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора випадкових чисел")
+    parser.add_argument("--force", action="store_true", help="Заповнити базу, навіть якщо обсяги вже збігаються")
+    args = parser.parse_args(argv)
+
+    if args.dbname == db_module.DB_PARAMS["dbname"]:
+        print(f"ПОМИЛКА: база даних {args.dbname} використовується застосунком і не може бути перезаписана")
+        return 1
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ensure_database(db_module.DB_PARAMS, args.dbname)
+    db_module.DB_PARAMS["dbname"] = args.dbname
+    db = db_module.DBConnection(min_connections=1, max_connections=1)
+    try:
+        apply_migrations(db)
+        seed(db, args.items, args.history, args.seed, args.force)
+    finally:
+        db.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
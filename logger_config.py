@@ -1,11 +1,33 @@
+import os
+import copy
+import gzip
+import json
+import time
+import shutil
+import atexit
+import queue
 import logging
 import logging.config
+import logging.handlers
 from pathlib import Path
 
 # Створюємо директорію для логів
 log_dir = Path("logs")
 log_dir.mkdir(exist_ok=True)
 
+# Розмір файлу журналу, після якого він архівується
+LOG_MAX_BYTES = 10 * 1024 * 1024
+# Кількість архівів (.log.1.gz, .log.2.gz, ...) для кожного файлу
+LOG_BACKUP_COUNT = 10
+# Загальний обсяг усіх файлів журналу; якщо його перевищено, видаляються найстаріші архіви
+LOG_DISK_BUDGET = 200 * 1024 * 1024
+
+# Змінна оточення, що вмикає структурований журнал (значення json)
+LOG_FORMAT_ENV = "GRADESYSTEM_LOG_FORMAT"
+
+# Типізовані поля записів (передаються через extra=...), що потрапляють у структурований журнал
+STRUCTURED_FIELDS = ("query_id", "duration_ms", "rows", "item_id", "history_id", "source")
+
 LOGGING_CONFIG = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -42,6 +64,10 @@ LOGGING_CONFIG = {
         },
         'simple': {
             'format': '%(levelname)s - %(message)s'
+        },
+        # Рядки JSON для структурованого журналу (див. setup_logging)
+        'json': {
+            '()': 'logger_config.JsonFormatter'
         }
     },
 
@@ -57,81 +83,97 @@ LOGGING_CONFIG = {
 
         # Загальний файл для всіх логів
         'file_common': {
-            'class': 'logging.FileHandler',
+            'class': 'logger_config.CompressingRotatingFileHandler',
             'level': 'DEBUG',
             'formatter': 'detailed',
             'filename': 'logs/application.log',
             'mode': 'a',
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
             'encoding': 'utf-8'
         },
 
         # Файл для помилок
         'file_errors': {
-            'class': 'logging.FileHandler',
+            'class': 'logger_config.CompressingRotatingFileHandler',
             'level': 'ERROR',
             'formatter': 'detailed',
             'filename': 'logs/errors.log',
             'mode': 'a',
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
             'encoding': 'utf-8'
         },
 
         # Окремий файл для DBconnection
         'file_db': {
-            'class': 'logging.FileHandler',
+            'class': 'logger_config.CompressingRotatingFileHandler',
             'level': 'DEBUG',
             'formatter': 'db_format',
             'filename': 'logs/db_connection.log',
             'mode': 'a',
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
             'encoding': 'utf-8'
         },
 
         # Окремий файл для InventoryApp
         'file_inventory': {
-            'class': 'logging.FileHandler',
+            'class': 'logger_config.CompressingRotatingFileHandler',
             'level': 'DEBUG',
             'formatter': 'inventory_format',
             'filename': 'logs/inventory_app.log',
             'mode': 'a',
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
             'encoding': 'utf-8'
         },
 
         # Окремий файл для InventoryItemForm
         'file_inventory_form': {
-            'class': 'logging.FileHandler',
+            'class': 'logger_config.CompressingRotatingFileHandler',
             'level': 'DEBUG',
             'formatter': 'form_format',
             'filename': 'logs/inventory_item_form.log',
             'mode': 'a',
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
             'encoding': 'utf-8'
         },
 
         # Окремий файл для RentalForm
         'file_rental': {
-            'class': 'logging.FileHandler',
+            'class': 'logger_config.CompressingRotatingFileHandler',
             'level': 'DEBUG',
             'formatter': 'form_format',
             'filename': 'logs/rental_form.log',
             'mode': 'a',
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
             'encoding': 'utf-8'
         },
 
         # Окремий файл для ReturnForm
         'file_return': {
-            'class': 'logging.FileHandler',
+            'class': 'logger_config.CompressingRotatingFileHandler',
             'level': 'DEBUG',
             'formatter': 'form_format',
             'filename': 'logs/return_form.log',
             'mode': 'a',
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
             'encoding': 'utf-8'
         },
 
         # Окремий файл для StatsWindow
         'file_stats': {
-            'class': 'logging.FileHandler',
+            'class': 'logger_config.CompressingRotatingFileHandler',
             'level': 'DEBUG',
             'formatter': 'stats_format',
             'filename': 'logs/stats_window.log',
             'mode': 'a',
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
             'encoding': 'utf-8'
         }
     },
@@ -197,5 +239,332 @@ LOGGING_CONFIG = {
 }
 
 
-def setup_logging():
-    logging.config.dictConfig(LOGGING_CONFIG)
\ No newline at end of file
+def enforce_disk_budget(directory=log_dir, budget=LOG_DISK_BUDGET):
+    """
+    Функція для обмеження загального обсягу файлів журналу.
+
+    Якщо сумарний розмір файлів *.log та їх архівів у каталозі перевищує бюджет,
+    видаляються найстаріші архіви (за часом зміни). Поточні файли журналу не видаляються.
+
+    :param directory: Каталог файлів журналу.
+    :type directory: str або Path
+
+    :param budget: Допустимий обсяг у байтах (None — без обмеження).
+    :type budget: int, optional
+
+    :return: Шляхи видалених архівів.
+    :rtype: list[str]
+    """
+    if budget is None:
+        return []
+
+    files = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and (entry.name.endswith(".log") or ".log." in entry.name):
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in files)
+    removed = []
+    for _, size, path in sorted(files):
+        if total <= budget:
+            break
+        if not path.endswith(".gz"):
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed.append(path)
+    return removed
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Обробник файлу журналу, що архівує файл за розміром та щодня.
+
+    Файл перейменовується на <ім'я>.1.gz (попередні архіви зсуваються: .1.gz -> .2.gz і т. д.),
+    коли його розмір досягає maxBytes або коли перший запис нової доби потрапляє у файл,
+    створений раніше. Архів стискається gzip, після чого загальний обсяг журналу
+    обмежується функцією enforce_disk_budget.
+
+    Attributes:
+        daily: Чи починати новий файл щодоби
+        disk_budget: Загальний обсяг усіх файлів журналу в каталозі (у байтах)
+    """
+    def __init__(self, filename, mode='a', maxBytes=0, backupCount=0, encoding=None, delay=False,
+                 errors=None, daily=True, disk_budget=LOG_DISK_BUDGET):
+        """
+        Метод для ініціалізації обробника. Параметри, крім двох останніх, такі самі, як у RotatingFileHandler.
+
+        :param daily: Чи архівувати файл на початку нової доби.
+        :type daily: bool
+
+        :param disk_budget: Загальний обсяг файлів журналу (None — без обмеження).
+        :type disk_budget: int, optional
+        """
+        super().__init__(filename, mode, maxBytes, max(backupCount, 1), encoding, delay, errors)
+        self.daily = daily
+        self.disk_budget = disk_budget
+        try:
+            self.period_start = time.localtime(os.path.getmtime(self.baseFilename))[:3]
+        except OSError:
+            self.period_start = time.localtime()[:3]
+
+    def shouldRollover(self, record):
+        if self.daily and time.localtime(record.created)[:3] != self.period_start:
+            if os.path.isfile(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+                return True
+            self.period_start = time.localtime(record.created)[:3]
+        return super().shouldRollover(record)
+
+    def rotation_filename(self, default_name):
+        return default_name + ".gz"
+
+    def rotate(self, source, dest):
+        if not os.path.exists(source):
+            return
+        with open(source, "rb") as source_file, gzip.open(dest, "wb") as dest_file:
+            shutil.copyfileobj(source_file, dest_file)
+        os.remove(source)
+
+    def doRollover(self):
+        super().doRollover()
+        self.period_start = time.localtime()[:3]
+        enforce_disk_budget(os.path.dirname(self.baseFilename), self.disk_budget)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматер, що записує кожне повідомлення одним рядком JSON.
+
+    Крім часу, рівня, логера, місця виклику та тексту повідомлення, у рядок потрапляють
+    поля STRUCTURED_FIELDS, передані через extra (наприклад, query_id, duration_ms, rows,
+    item_id), зі збереженням їх типів, а також traceback винятку.
+    """
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Traceback, вже відформатований у LocalQueueHandler.prepare
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def structured_config(config):
+    """
+    Функція для перетворення конфігурації журналу на структуровану.
+
+    Усі файлові обробники отримують форматер 'json'; консоль лишається текстовою,
+    файли підсистем та їх розподіл за логерами не змінюються.
+
+    :param config: Конфігурація журналу (не змінюється).
+    :type config: dict
+
+    :return: Копія конфігурації зі структурованими файлами.
+    :rtype: dict
+    """
+    config = copy.deepcopy(config)
+    for handler in config['handlers'].values():
+        if 'filename' in handler:
+            handler['formatter'] = 'json'
+    return config
+
+
+# Фоновий слухач черги журналу та обробник, через який до неї надходять записи
+_listener = None
+_queue_handler = None
+
+
+class LogRoutes:
+    """
+    Клас, що відповідає за визначення обробників, у які має потрапити запис логера.
+
+    Маршрути беруться з розділу 'loggers' конфігурації: запис логера потрапляє в обробники
+    найближчого налаштованого логера (з урахуванням ієрархії імен через крапку) та, якщо
+    для нього 'propagate' не вимкнено, — в обробники батьківських логерів аж до кореневого.
+    """
+    def __init__(self, loggers_config):
+        """
+        Метод для ініціалізації маршрутів.
+
+        :param loggers_config: Розділ 'loggers' конфігурації журналу.
+        :type loggers_config: dict
+        """
+        self.loggers_config = loggers_config
+        self._cache = {}
+
+    def _configured_parent(self, name):
+        """
+        Метод для пошуку найближчого налаштованого логера.
+
+        :param name: Ім'я логера.
+        :type name: str
+
+        :return: Ім'я налаштованого логера ('' — кореневий).
+        :rtype: str
+        """
+        while name:
+            if name in self.loggers_config:
+                return name
+            name = name.rpartition(".")[0]
+        return ""
+
+    def handlers_for(self, name):
+        """
+        Метод для отримання імен обробників, у які записується повідомлення логера.
+
+        :param name: Ім'я логера, яким створено запис.
+        :type name: str
+
+        :rtype: frozenset[str]
+        """
+        handlers = self._cache.get(name)
+        if handlers is None:
+            collected = set()
+            current = self._configured_parent(name)
+            while True:
+                config = self.loggers_config.get(current, {})
+                collected.update(config.get("handlers", ()))
+                if not current or not config.get("propagate", True):
+                    break
+                current = self._configured_parent(current.rpartition(".")[0])
+            handlers = self._cache[name] = frozenset(collected)
+        return handlers
+
+
+class RouteFilter(logging.Filter):
+    """
+    Фільтр обробника, що пропускає лише записи логерів, які за конфігурацією пишуть у цей обробник.
+
+    Усі обробники належать одному слухачу черги й отримують кожен запис, тому розподіл
+    записів за файлами підсистем виконують ці фільтри.
+    """
+    def __init__(self, handler_name, routes):
+        """
+        :param handler_name: Ім'я обробника в конфігурації.
+        :type handler_name: str
+
+        :param routes: Маршрути логерів.
+        :type routes: LogRoutes
+        """
+        super().__init__()
+        self.handler_name = handler_name
+        self.routes = routes
+
+    def filter(self, record):
+        return self.handler_name in self.routes.handlers_for(record.name)
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    Обробник, що лише додає запис у чергу слухача того самого процесу.
+
+    Як і QueueHandler, підставляє аргументи в повідомлення та форматує traceback у потоці,
+    що створив запис: аргументи (списки, словники, DataFrame) можуть змінитися, поки запис
+    чекає в черзі, а traceback тримав би в черзі кадри стеку. На відміну від QueueHandler,
+    traceback зберігається в exc_text, а не додається до тексту повідомлення, тому
+    JsonFormatter записує його в окреме поле. Час, рівень та розподіл за файлами
+    форматують обробники слухача у фоновому потоці.
+    """
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(structured=None):
+    """
+    Функція для налаштування журналу застосунку.
+
+    Обробники з LOGGING_CONFIG належать одному фоновому слухачу (QueueListener), а всі логери
+    записують повідомлення лише в чергу через LocalQueueHandler кореневого логера, тому запис
+    у файли не блокує потік інтерфейсу. Рівні логерів та розподіл повідомлень за файлами
+    підсистем лишаються такими, як у конфігурації. Файли архівуються обробником
+    CompressingRotatingFileHandler, а перед налаштуванням обсяг журналу обмежується
+    бюджетом LOG_DISK_BUDGET. Слухач зупиняється під час завершення
+    програми (див. shutdown_logging). Повторний виклик нічого не змінює.
+
+    У структурованому режимі файли журналу містять рядки JSON (див. JsonFormatter).
+
+    :param structured: Чи записувати файли у форматі JSON (None — за змінною оточення LOG_FORMAT_ENV).
+    :type structured: bool, optional
+
+    :return: Запущений слухач черги журналу.
+    :rtype: logging.handlers.QueueListener
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+
+    if structured is None:
+        structured = os.environ.get(LOG_FORMAT_ENV, "").lower() == "json"
+    config = structured_config(LOGGING_CONFIG) if structured else LOGGING_CONFIG
+
+    enforce_disk_budget()
+    logging.config.dictConfig(config)
+    routes = LogRoutes(config['loggers'])
+
+    # Обробники знімаються з логерів і передаються слухачу; логери лише передають записи кореневому
+    handlers = {}
+    for name in config['loggers']:
+        configured = logging.getLogger(name or None)
+        for handler in list(configured.handlers):
+            handlers[handler.name] = handler
+            configured.removeHandler(handler)
+        if name:
+            configured.propagate = True
+
+    for name, handler in handlers.items():
+        handler.addFilter(RouteFilter(name, routes))
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = LocalQueueHandler(log_queue)
+    logging.getLogger().addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers.values(), respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """
+    Функція для зупинки фонового слухача журналу.
+
+    Записує всі повідомлення, що залишилися в черзі, після чого обробники підключаються
+    до кореневого логера напряму, тому повідомлення, записані під час завершення програми,
+    не втрачаються.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+
+    _listener.stop()
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener = None
+    _queue_handler = None
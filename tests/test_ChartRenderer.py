@@ -0,0 +1,26 @@
+from ChartRenderer import ChartCache, ChartImage
+
+
+def image(size):
+    return ChartImage(1, 1, 1.0, bytes(size), data_hash=0)
+
+
+def test_cache_evicts_least_recently_used_until_it_fits():
+    cache = ChartCache(max_bytes=100)
+    cache.put("a", image(40))
+    cache.put("b", image(40))
+    cache.get("a")
+    cache.put("c", image(40))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.size_bytes == 80
+
+
+def test_cache_skips_image_larger_than_budget():
+    cache = ChartCache(max_bytes=100)
+    cache.put("a", image(40))
+    cache.put("a", image(500))
+
+    assert cache.get("a") is None
+    assert cache.size_bytes == 0
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from QueryExecutor import QueryExecutor
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def executor(app):
+    thread_pool = QtCore.QThreadPool()
+    thread_pool.setMaxThreadCount(2)
+    executor = QueryExecutor(thread_pool=thread_pool)
+    yield executor
+    thread_pool.waitForDone(5000)
+
+
+def wait_until(app, condition, timeout=5.0):
+    """
+    Функція для обробки подій Qt, доки умова не виконається або не мине timeout секунд.
+    """
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()
+    return condition()
+
+
+def blocking_write(release):
+    def write(value):
+        release.wait(5)
+        if isinstance(value, Exception):
+            raise value
+        return value
+    return write
+
+
+def test_overlapping_writes_with_same_key_call_back_both(app, executor):
+    release = threading.Event()
+    write = blocking_write(release)
+    results, errors, idle = [], [], []
+    executor.idle.connect(idle.append)
+
+    executor.submit("add_item", write, 1, on_result=results.append, on_error=errors.append, drop_stale=False)
+    executor.submit("add_item", write, ValueError("дубль"), on_result=results.append, on_error=errors.append,
+                    drop_stale=False)
+    assert executor.is_busy("add_item")
+
+    release.set()
+    assert wait_until(app, lambda: results and errors)
+    assert results == [1]
+    assert [str(error) for error in errors] == ["дубль"]
+    assert not executor.is_busy("add_item")
+    assert idle == ["add_item"]
+
+
+def test_newer_load_with_same_key_drops_stale_result(app, executor):
+    first_release, second_release = threading.Event(), threading.Event()
+    results = []
+
+    executor.submit("inventory", blocking_write(first_release), "старий", on_result=results.append)
+    executor.submit("inventory", blocking_write(second_release), "новий", on_result=results.append)
+
+    second_release.set()
+    assert wait_until(app, lambda: results)
+    first_release.set()
+    executor.thread_pool.waitForDone(5000)
+    wait_until(app, lambda: False, timeout=0.1)
+
+    assert results == ["новий"]
+    assert not executor.is_busy("inventory")
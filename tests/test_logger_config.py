@@ -0,0 +1,36 @@
+import logging
+import queue
+
+from logger_config import JsonFormatter, LocalQueueHandler
+
+
+def queued_logger(log_queue):
+    logger = logging.getLogger("tests.queued")
+    logger.handlers = [LocalQueueHandler(log_queue)]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+def test_queued_record_keeps_argument_values_at_call_time():
+    log_queue = queue.Queue()
+    item_ids = [1, 2]
+    queued_logger(log_queue).debug("Предмети %s", item_ids)
+    item_ids.append(3)
+
+    record = log_queue.get_nowait()
+    assert record.getMessage() == "Предмети [1, 2]"
+    assert record.args is None
+
+
+def test_queued_record_carries_formatted_traceback_without_frames():
+    log_queue = queue.Queue()
+    try:
+        raise ValueError("помилка")
+    except ValueError:
+        queued_logger(log_queue).exception("Не вдалося")
+
+    record = log_queue.get_nowait()
+    assert record.exc_info is None
+    assert "ValueError: помилка" in record.exc_text
+    assert "ValueError: помилка" in JsonFormatter().format(record)
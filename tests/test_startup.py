@@ -0,0 +1,14 @@
+import statistics
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from StartupCheck import IMPORT_BUDGET_MS, measure_import
+
+
+def test_main_window_import_fits_budget_without_deferred_modules():
+    timings, loaded = measure_import("InventoryApp", runs=3)
+
+    assert loaded == [], f"Під час запуску імпортовано бібліотеки з відкладеним імпортом: {loaded}"
+    assert statistics.median(timings) <= IMPORT_BUDGET_MS